@@ -23,19 +23,16 @@ from ScrollBar import ScrollableFrame
 from WorkspaceCard import WorkspaceCard
 from responsive.Responsive import make_responsive
 from VoiceProcessor import VoiceProcessor
-from data_manager.DataManager import DataManager
+from audio_dsp.AudioPipeline import AudioPipeline
 from data_manager.MemoryManager import MemoryManager
 from fragments.UIFragments import center_window
 from language_manager.LangManager import LangManager
 from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
-from media_formats.AAC import AAC
-from media_formats.FLAC import FLAC
-from media_formats.MP3 import MP3
-from media_formats.WAV import WAV
-from media_formats.WEBM import WEBM
+from media_formats.Formats import FORMAT_MAP
 from tts.GTTS import GTTSService
 from tts.MicrosoftEdgeTTS import MicrosoftEdgeTTS
+from tts.utility.TTSEventLoop import TTSEventLoop
 from voicegui.VoiceGUI import VoiceSettings
 from zip.ZIPConvertor import ZIPConvertor
 from gui_listener.GUIListener import GUIListener
@@ -191,6 +188,7 @@ class TTSMenuApp(tk.Tk):
                     "workspace_id": workspace_id,
                     "action": "deactivated_and_unlocked"
                 })
+        TTSEventLoop.shutdown_instance()
         self.destroy()
 
 
@@ -640,13 +638,6 @@ class TTSMenuApp(tk.Tk):
 
     def _do_convert_thread(self):
         import time
-        FORMAT_MAP = {
-            "MP3": MP3,
-            "WAV": WAV,
-            "WEBM": WEBM,
-            "FLAC": FLAC,
-            "AAC": AAC
-        }
 
         text = self.text.get("1.0", "end-1c").strip()
         if not text:
@@ -739,18 +730,20 @@ class TTSMenuApp(tk.Tk):
                     and "<" in text and ">" in text
             )
 
-            if use_markup:
-                from markup.MarkupManager import MarkupManager
-                markup_manager = MarkupManager(tts)
-                raw_bytes = markup_manager.synthesize_with_markup(text, progress_cb=tts_progress)
-            else:
-                if not MemoryManager.get("markup_enabled", True):
-                    LogsHelperManager.log_debug(
-                        self.logger,
-                        "MARKUP_DISABLED_INFO",
-                        {"info": "Markup tags ignored — markup support disabled in Config Settings"}
-                    )
-                raw_bytes = tts.synthesize_to_bytes(text, progress_cb=tts_progress)
+            pipeline = AudioPipeline("convert")
+            with pipeline.stage("synthesize"):
+                if use_markup:
+                    from markup.MarkupManager import MarkupManager
+                    markup_manager = MarkupManager(tts)
+                    raw_bytes = markup_manager.synthesize_with_markup(text, progress_cb=tts_progress)
+                else:
+                    if not MemoryManager.get("markup_enabled", True):
+                        LogsHelperManager.log_debug(
+                            self.logger,
+                            "MARKUP_DISABLED_INFO",
+                            {"info": "Markup tags ignored — markup support disabled in Config Settings"}
+                        )
+                    raw_bytes = tts.synthesize_to_bytes(text, progress_cb=tts_progress)
 
             temp_dir = self.get_temp_dir()
             data_dir = self.get_data_dir()
@@ -773,24 +766,19 @@ class TTSMenuApp(tk.Tk):
                 "pitch": 0, "speed": 1.0, "volume": 1.0,
                 "echo": False, "reverb": False, "robot": False
             }.items()}
-            processed_bytes = VoiceProcessor.process_from_memory(raw_bytes, "mp3", settings)
-            LogsHelperManager.log_debug(self.logger, "EFFECTS_APPLIED_CONVERT", settings)
-
-            processed_audio_path = (temp_dir if temp_dir else data_dir) / f"processed_audio_{timestamp}.mp3"
-            try:
-                with processed_audio_path.open("wb") as f:
-                    f.write(processed_bytes)
-                LogsHelperManager.log_debug(self.logger, "PROCESSED_AUDIO_SAVED", {"path": str(processed_audio_path)})
-            except Exception as e:
-                LogsHelperManager.log_error(self.logger, "PROCESSED_AUDIO_SAVE_FAIL", str(e))
+            if AudioPipeline.should_stream(raw_bytes):
+                out_path = pipeline.stream(raw_bytes, "mp3", settings, fmt_class, self.get_exports_dir())
+                LogsHelperManager.log_debug(self.logger, "EFFECTS_APPLIED_CONVERT", settings)
+                self._set_progress(90, self.lang.get("progress_exporting"))
+            else:
+                pipeline.render(raw_bytes, "mp3", settings)
+                LogsHelperManager.log_debug(self.logger, "EFFECTS_APPLIED_CONVERT", settings)
 
-            self._set_progress(85, self.lang.get("progress_effects_done"))
+                self._set_progress(85, self.lang.get("progress_effects_done"))
 
-            fmt_class = FORMAT_MAP.get(fmt_key)
-            processed_audio = DataManager.from_bytes(processed_bytes, "mp3")
-            self._set_progress(90, self.lang.get("progress_exporting"))
-            formatter = fmt_class(processed_audio)
-            out_path = formatter.export(self.get_exports_dir())
+                self._set_progress(90, self.lang.get("progress_exporting"))
+                out_path = pipeline.encode(fmt_class, self.get_exports_dir())
+            pipeline.log_report({"service": svc_key, "format": fmt_key, "chars": len(text)})
 
             if MemoryManager.get("zip_export_enabled", False):
                 try:
@@ -818,6 +806,7 @@ class TTSMenuApp(tk.Tk):
                     "size": out_path.stat().st_size,
                     "duration_seconds": int(time.time() - t0),
                     "chars": len(text),
+                    "stage_timings": pipeline.timings,
                     "timestamp": time.time()
                 }
                 write_json_file(logs_dir / f"convert_success_{int(time.time())}.json", convert_success_log)
@@ -142,6 +142,7 @@ class STTMenuApp(tk.Tk):
         self.selected_audio_file = None
         self.selected_audio_data = None
         self.transcription_segments = None
+        self.transcription_text = None
         
         pygame.mixer.init()
         self.audio_playing = False
@@ -509,9 +510,8 @@ class STTMenuApp(tk.Tk):
 
         def timestamps_changed(*_):
             MemoryManager.set("show_timestamps", self.show_timestamps.get())
-            current_text = self.text.get("1.0", tk.END).strip()
-            if current_text and hasattr(self, 'transcription_segments'):
-                self._display_transcription_result_with_timestamps()
+            if self.transcription_text:
+                self._display_transcription_result(self.transcription_text)
 
         self.show_timestamps.trace_add("write", timestamps_changed)
 
@@ -777,12 +777,7 @@ class STTMenuApp(tk.Tk):
             if not self.audio_handler.validate_format(self.selected_audio_file):
                 raise ValueError(f"Unsupported audio format: {self.selected_audio_file}")
 
-            if engine_type == "vosk":
-                audio_data = self.audio_handler.ensure_vosk_compatible(
-                    self.selected_audio_file
-                )
-                self.selected_audio_data = audio_data
-            else:
+            if engine_type != "vosk":
                 props = self.audio_handler.get_audio_properties(self.selected_audio_file)
                 if props["duration_seconds"] <= 0.1:
                     raise ValueError(f"Audio file is too short: {self.selected_audio_file}\nRequired: >0.1s duration")
@@ -810,10 +805,19 @@ class STTMenuApp(tk.Tk):
             self._set_progress(30, self.lang.get("transcribing_audio"))
 
             if engine_type == "vosk":
-                result = self.stt_manager.transcribe(self.selected_audio_data, lang_code)
+                transcribing_msg = self.lang.get("transcribing_audio")
+
+                def on_partial(text: str, final: bool):
+                    tail = text[-60:]
+                    self._set_progress(30, f"{transcribing_msg} …{tail}" if tail else transcribing_msg)
+
+                result = self.stt_manager.transcribe_stream(self.selected_audio_file, lang_code, on_partial)
                 self.transcription_segments = None
             else:
-                result = self.stt_manager.transcribe(self.selected_audio_file, lang_code)
+                result = self.stt_manager.transcribe_with_progress(
+                    self.selected_audio_file, lang_code,
+                    lambda pct, msg: self._set_progress(30 + pct * 0.6, msg)
+                )
                 try:
                     self.transcription_segments = self.stt_manager.get_segments()
                 except Exception:
@@ -988,6 +992,7 @@ class STTMenuApp(tk.Tk):
                     write_json_file(logs_dir / f"export_error_{int(time.time())}.json", error_log_data)
 
     def _display_transcription_result(self, result):
+        self.transcription_text = result
         self.text.config(state="normal")
         self.text.delete("1.0", tk.END)
         
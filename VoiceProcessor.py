@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 import io
 import time
+from pathlib import Path
 from pydub import AudioSegment, effects
+from audio_dsp.EffectsCache import EffectsCache
+from audio_dsp.EffectsEngine import EffectsEngine
+from audio_dsp.StreamingEffects import StreamingEffects
 from data_manager.DataManager import DataManager
 from logs_manager.LogsManager import LogsManager
 from logs_manager.LogsHelperManager import LogsHelperManager
@@ -10,6 +14,24 @@ class VoiceProcessor:
     logger = LogsManager.get_logger("VoiceProcessor")
     @staticmethod
     def apply(audio: AudioSegment, settings: dict) -> AudioSegment:
+        if EffectsEngine.is_available():
+            return VoiceProcessor._apply_numpy(audio, settings)
+        return VoiceProcessor._apply_pydub(audio, settings)
+
+    @staticmethod
+    def _apply_numpy(audio: AudioSegment, settings: dict) -> AudioSegment:
+        start_time = time.time()
+        samples = EffectsEngine.to_array(audio)
+        samples, frame_rate = EffectsEngine.apply(samples, audio.frame_rate, settings)
+        processed = EffectsEngine.to_segment(samples, frame_rate)
+        LogsHelperManager.log_performance(
+            VoiceProcessor.logger, "APPLY_EFFECTS_NUMPY", time.time() - start_time,
+            {"frames": len(samples), "channels": audio.channels, "settings": settings}
+        )
+        return processed
+
+    @staticmethod
+    def _apply_pydub(audio: AudioSegment, settings: dict) -> AudioSegment:
         original_frame_rate = audio.frame_rate
 
         if settings.get("volume") != 1.0:
@@ -71,18 +93,35 @@ class VoiceProcessor:
             {"input_bytes": len(data), "format": fmt, "settings": settings}
         )
 
-        try:
-            audio = DataManager.from_bytes(data, fmt)
-            LogsHelperManager.log_debug(VoiceProcessor.logger, "AUDIO_LOADED_FROM_BYTES", {"size": len(data)})
-        except Exception as e:
-            LogsHelperManager.log_error(
+        if not return_audio and StreamingEffects.is_available() and len(data) >= StreamingEffects.threshold_bytes():
+            output_bytes = StreamingEffects(settings).process_bytes(data, fmt)
+            LogsHelperManager.log_performance(
                 VoiceProcessor.logger,
-                "VOICE_PROCESS_LOAD_FAILURE",
-                f"Format: {fmt}, Error: {str(e)}"
+                "PROCESS_FROM_MEMORY_STREAMED",
+                time.time() - start_time,
+                {"input_bytes": len(data), "output_bytes": len(output_bytes)}
             )
-            raise ValueError(f"Invalid input data or format ({fmt}): {e}")
-
-        processed = VoiceProcessor.apply(audio, settings)
+            return output_bytes
+
+        cache_key = EffectsCache.make_key(data, fmt, settings) if EffectsCache.is_enabled() else None
+        processed = EffectsCache.instance().get(cache_key) if cache_key else None
+        if processed is not None:
+            LogsHelperManager.log_debug(VoiceProcessor.logger, "EFFECTS_CACHE_HIT", {"key": cache_key[:12]})
+        else:
+            try:
+                audio = DataManager.from_bytes(data, fmt)
+                LogsHelperManager.log_debug(VoiceProcessor.logger, "AUDIO_LOADED_FROM_BYTES", {"size": len(data)})
+            except Exception as e:
+                LogsHelperManager.log_error(
+                    VoiceProcessor.logger,
+                    "VOICE_PROCESS_LOAD_FAILURE",
+                    f"Format: {fmt}, Error: {str(e)}"
+                )
+                raise ValueError(f"Invalid input data or format ({fmt}): {e}")
+
+            processed = VoiceProcessor.apply(audio, settings)
+            if cache_key:
+                EffectsCache.instance().put(cache_key, processed)
 
         if return_audio:
             duration = time.time() - start_time
@@ -105,4 +144,16 @@ class VoiceProcessor:
             {"input_bytes": len(data), "output_bytes": len(output_bytes)}
         )
 
-        return output_bytes
\ No newline at end of file
+        return output_bytes
+
+    @staticmethod
+    def process_file(in_path: Path, out_path: Path, settings: dict, out_format: str = None) -> Path:
+        in_path, out_path = Path(in_path), Path(out_path)
+        out_format = out_format or out_path.suffix.lstrip(".") or in_path.suffix.lstrip(".")
+        if StreamingEffects.is_available():
+            return StreamingEffects(settings).process(in_path, out_path, out_format)
+
+        audio = VoiceProcessor.apply(DataManager.load_from_file(in_path), settings)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        audio.export(str(out_path), format=out_format)
+        return out_path
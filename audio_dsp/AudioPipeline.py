@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Type
+
+from pydub import AudioSegment
+
+from VoiceProcessor import VoiceProcessor
+from audio_dsp.EffectsCache import EffectsCache
+from audio_dsp.StreamingEffects import StreamingEffects
+from data_manager.DataManager import DataManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+from media_formats.BaseFormat import BaseFormat
+
+
+class AudioPipeline:
+    def __init__(self, name: str = "convert"):
+        self.logger = LogsManager.get_logger("AudioPipeline")
+        self.name = name
+        self.audio: AudioSegment = None
+        self.timings = {}
+        self.codec_calls = 0
+        self.audio_seconds = 0.0
+        self.cache_hit = False
+        self.started_at = time.time()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.time()
+        try:
+            yield self
+        finally:
+            self.timings[name] = round(self.timings.get(name, 0.0) + time.time() - start, 4)
+
+    def decode(self, data: bytes, fmt: str = "mp3") -> "AudioPipeline":
+        with self.stage("decode"):
+            try:
+                self.audio = DataManager.from_bytes(data, fmt)
+            except Exception as e:
+                LogsHelperManager.log_error(self.logger, "PIPELINE_DECODE_FAIL", f"Format: {fmt}, Error: {e}")
+                raise ValueError(f"Invalid input data or format ({fmt}): {e}")
+            self.codec_calls += 1
+        self.audio_seconds = round(len(self.audio) / 1000.0, 2)
+        LogsHelperManager.log_debug(self.logger, "PIPELINE_DECODED", {
+            "input_bytes": len(data),
+            "frames": int(self.audio.frame_count()),
+            "frame_rate": self.audio.frame_rate,
+            "channels": self.audio.channels
+        })
+        return self
+
+    def apply_effects(self, settings: dict) -> "AudioPipeline":
+        self._require_audio()
+        with self.stage("effects"):
+            self.audio = VoiceProcessor.apply(self.audio, settings)
+        return self
+
+    def render(self, data: bytes, fmt: str, settings: dict) -> "AudioPipeline":
+        # Re-exporting the same synthesis with the same effects (e.g. only the
+        # output format changed) reuses the processed PCM and skips decode+effects.
+        cache_key = None
+        if EffectsCache.is_enabled():
+            with self.stage("cache_lookup"):
+                cache_key = EffectsCache.make_key(data, fmt, settings)
+                cached = EffectsCache.instance().get(cache_key)
+            if cached is not None:
+                self.audio = cached
+                self.cache_hit = True
+                self.audio_seconds = round(len(cached) / 1000.0, 2)
+                LogsHelperManager.log_debug(self.logger, "PIPELINE_EFFECTS_CACHE_HIT", {"key": cache_key[:12]})
+                return self
+
+        self.decode(data, fmt).apply_effects(settings)
+        if cache_key:
+            EffectsCache.instance().put(cache_key, self.audio)
+        return self
+
+    def encode(self, fmt_class: Type[BaseFormat], out_dir: Path, filename: str = None) -> Path:
+        self._require_audio()
+        with self.stage("encode"):
+            out_path = fmt_class(self.audio, filename=filename).export(out_dir)
+            self.codec_calls += 1
+        return out_path
+
+    @staticmethod
+    def should_stream(data: bytes) -> bool:
+        return StreamingEffects.is_available() and len(data) >= StreamingEffects.threshold_bytes()
+
+    def stream(self, data: bytes, fmt: str, settings: dict, fmt_class: Type[BaseFormat],
+               out_dir: Path, filename: str = None) -> Path:
+        # Decode, effects and encode overlap block by block through two ffmpeg
+        # pipes, so memory stays bounded regardless of how long the audio is.
+        out_format = fmt_class.get_ffmpeg_format()
+        out_path = DataManager.output_path(out_format, out_dir, filename)
+        streamer = StreamingEffects(settings)
+        with self.stage("stream_effects"):
+            streamer.process(data, out_path, out_format, fmt=fmt)
+            self.codec_calls += 2
+        self.audio_seconds = round(streamer.frames_in / max(1, streamer.frame_rate), 2)
+        return out_path
+
+    def report(self) -> dict:
+        return {
+            "pipeline": self.name,
+            "stages": dict(self.timings),
+            "codec_calls": self.codec_calls,
+            "effects_cache_hit": self.cache_hit,
+            "audio_seconds": self.audio_seconds
+        }
+
+    def log_report(self, extra: dict = None):
+        data = self.report()
+        if extra:
+            data.update(extra)
+        LogsHelperManager.log_performance(self.logger, "PIPELINE_DONE", time.time() - self.started_at, data)
+
+    def _require_audio(self):
+        if self.audio is None:
+            raise RuntimeError("AudioPipeline has no decoded audio; call decode() first.")
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from pydub import AudioSegment
+
+from PathHelper import PathHelper
+from data_manager.DiskCache import DiskCache
+from data_manager.MemoryManager import MemoryManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+
+
+class EffectsCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    DEFAULT_MEMORY_MB = 128
+    DEFAULT_DISK_MB = 512
+    CACHE_DIR = "cache/effects"
+    # Bump when the effect DSP changes so stale renders are not reused.
+    VERSION = "2"
+    EFFECT_DEFAULTS = {
+        "pitch": 0.0, "speed": 1.0, "volume": 1.0,
+        "echo": False, "reverb": False, "robot": False
+    }
+    HEADER = struct.Struct("<IHH")
+
+    def __init__(self, max_memory_bytes: int, disk: DiskCache):
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.disk = disk
+        self._entries: "OrderedDict[str, AudioSegment]" = OrderedDict()
+        self._memory_bytes = 0
+        self._entries_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.spills = 0
+
+    @classmethod
+    def instance(cls) -> "EffectsCache":
+        with cls._lock:
+            if cls._instance is None:
+                memory_mb = MemoryManager.get("effects_cache_memory_mb", cls.DEFAULT_MEMORY_MB)
+                disk_mb = MemoryManager.get("effects_cache_max_mb", cls.DEFAULT_DISK_MB)
+                cls._instance = cls(
+                    int(memory_mb) * 1024 * 1024,
+                    DiskCache(PathHelper.base_dir() / cls.CACHE_DIR, max_bytes=int(disk_mb) * 1024 * 1024, suffix=".pcm")
+                )
+            return cls._instance
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(MemoryManager.get("effects_cache_enabled", True))
+
+    @classmethod
+    def normalize_settings(cls, settings: dict) -> dict:
+        settings = settings or {}
+        normalized = {}
+        for key, default in cls.EFFECT_DEFAULTS.items():
+            value = settings.get(key)
+            if value is None:
+                value = default
+            normalized[key] = bool(value) if isinstance(default, bool) else round(float(value), 4)
+        return normalized
+
+    @classmethod
+    def make_key(cls, data: bytes, fmt: str, settings: dict) -> str:
+        raw = "\x1f".join([
+            cls.VERSION,
+            (fmt or "").lower(),
+            json.dumps(cls.normalize_settings(settings), sort_keys=True),
+            hashlib.sha256(data).hexdigest()
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _pack(cls, audio: AudioSegment) -> bytes:
+        return cls.HEADER.pack(audio.frame_rate, audio.channels, audio.sample_width) + audio.raw_data
+
+    @classmethod
+    def _unpack(cls, blob: bytes) -> Optional[AudioSegment]:
+        if len(blob) < cls.HEADER.size:
+            return None
+        frame_rate, channels, sample_width = cls.HEADER.unpack_from(blob)
+        return AudioSegment(
+            data=blob[cls.HEADER.size:],
+            sample_width=sample_width,
+            frame_rate=frame_rate,
+            channels=channels
+        )
+
+    def _evict_locked(self) -> list:
+        spilled = []
+        while self._memory_bytes > self.max_memory_bytes and self._entries:
+            key, audio = self._entries.popitem(last=False)
+            self._memory_bytes -= len(audio.raw_data)
+            spilled.append((key, audio))
+        return spilled
+
+    def _spill(self, entries: list):
+        for key, audio in entries:
+            if not self.disk.contains(key):
+                self.disk.put(key, self._pack(audio))
+                self.spills += 1
+
+    def get(self, key: str) -> Optional[AudioSegment]:
+        with self._entries_lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+
+        blob = self.disk.get(key)
+        audio = self._unpack(blob) if blob else None
+        if audio is None:
+            with self._entries_lock:
+                self.misses += 1
+            return None
+
+        with self._entries_lock:
+            self.disk_hits += 1
+        self.put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: AudioSegment):
+        size = len(audio.raw_data)
+        if size > self.max_memory_bytes:
+            self._spill([(key, audio)])
+            return
+
+        with self._entries_lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old.raw_data)
+            self._entries[key] = audio
+            self._memory_bytes += size
+            spilled = self._evict_locked()
+        self._spill(spilled)
+
+    def clear(self):
+        with self._entries_lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+        self.disk.clear()
+
+    def stats(self) -> dict:
+        with self._entries_lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            data = {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "spills": self.spills
+            }
+        data["disk"] = self.disk.stats()
+        return data
+
+    @classmethod
+    def log_stats(cls, logger, action: str, duration: float, extra: dict = None):
+        data = cls.instance().stats()
+        if extra:
+            data.update(extra)
+        LogsHelperManager.log_performance(logger, action, duration, data)
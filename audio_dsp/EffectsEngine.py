@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import Tuple
+
+from pydub import AudioSegment
+
+try:
+    import numpy as np
+    from scipy.signal import lfilter
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SAMPLE_DTYPES = {1: "int8", 2: "int16", 4: "int32"}
+NORMALIZE_HEADROOM_DB = 0.1
+BLOCK_FRAMES = 1 << 16
+
+
+class EffectsEngine:
+    @staticmethod
+    def is_available() -> bool:
+        return NUMPY_AVAILABLE
+
+    @staticmethod
+    def to_array(audio: AudioSegment) -> "np.ndarray":
+        if audio.sample_width not in SAMPLE_DTYPES:
+            audio = audio.set_sample_width(2)
+        scale = float(1 << (8 * audio.sample_width - 1))
+        samples = np.frombuffer(audio.raw_data, dtype=SAMPLE_DTYPES[audio.sample_width])
+        samples = samples.astype(np.float32)
+        samples *= 1.0 / scale
+        return samples.reshape(-1, audio.channels)
+
+    @staticmethod
+    def to_pcm16(samples: "np.ndarray") -> bytes:
+        out = np.empty(samples.shape, dtype="<i2")
+        for start in range(0, len(samples), BLOCK_FRAMES):
+            block = np.clip(samples[start:start + BLOCK_FRAMES], -1.0, 1.0)
+            block *= 32767.0
+            np.rint(block, out=out[start:start + BLOCK_FRAMES], casting="unsafe")
+        return out.tobytes()
+
+    @staticmethod
+    def to_segment(samples: "np.ndarray", frame_rate: int) -> AudioSegment:
+        return AudioSegment(
+            data=EffectsEngine.to_pcm16(samples),
+            sample_width=2,
+            frame_rate=int(frame_rate),
+            channels=samples.shape[1]
+        )
+
+    @staticmethod
+    def db_to_gain(db: float) -> float:
+        return 10.0 ** (db / 20.0)
+
+    @staticmethod
+    def ms_to_frames(ms: float, frame_rate: int) -> int:
+        return int(ms * frame_rate / 1000.0)
+
+    @staticmethod
+    def peak(samples: "np.ndarray") -> float:
+        if not samples.size:
+            return 0.0
+        return float(max(np.max(samples), -np.min(samples)))
+
+    @staticmethod
+    def apply_gain(samples: "np.ndarray", db: float) -> "np.ndarray":
+        samples *= EffectsEngine.db_to_gain(db)
+        return np.clip(samples, -1.0, 1.0, out=samples)
+
+    @staticmethod
+    def normalize(samples: "np.ndarray", headroom: float = NORMALIZE_HEADROOM_DB) -> "np.ndarray":
+        peak = EffectsEngine.peak(samples)
+        if peak == 0.0:
+            return samples
+        samples *= EffectsEngine.db_to_gain(-headroom) / peak
+        return samples
+
+    @staticmethod
+    def mix_delayed(samples: "np.ndarray", taps, dry_gain: float = 1.0) -> "np.ndarray":
+        # y[n] = dry_gain * x[n] + sum(gain * x[n - delay]), clipped after every
+        # tap like successive pydub overlays. Blocks are written back to front
+        # so the delayed reads only ever see untouched input.
+        for end in range(len(samples), 0, -BLOCK_FRAMES):
+            start = max(0, end - BLOCK_FRAMES)
+            block = samples[start:end] * dry_gain
+            for delay, gain in taps:
+                lo = max(start, delay)
+                if lo < end:
+                    block[lo - start:] += samples[lo - delay:end - delay] * gain
+                    np.clip(block, -1.0, 1.0, out=block)
+            samples[start:end] = block
+        return samples
+
+    @staticmethod
+    def resample(samples: "np.ndarray", src_rate: int, dst_rate: int) -> "np.ndarray":
+        if src_rate == dst_rate or len(samples) < 2:
+            return samples
+        out_len = max(1, int(round(len(samples) * dst_rate / src_rate)))
+        step = src_rate / dst_rate
+        last = len(samples) - 1
+        out = np.empty((out_len, samples.shape[1]), dtype=np.float32)
+        for start in range(0, out_len, BLOCK_FRAMES):
+            pos = np.arange(start, min(out_len, start + BLOCK_FRAMES), dtype=np.float64) * step
+            np.minimum(pos, last, out=pos)
+            idx = pos.astype(np.int64)
+            frac = (pos - idx).astype(np.float32)[:, None]
+            nxt = np.minimum(idx + 1, last)
+            block = samples[idx]
+            block += (samples[nxt] - block) * frac
+            out[start:start + len(idx)] = block
+        return out
+
+    @staticmethod
+    def low_pass(samples: "np.ndarray", cutoff: float, frame_rate: int) -> "np.ndarray":
+        rc = 1.0 / (cutoff * 2 * math.pi)
+        dt = 1.0 / frame_rate
+        alpha = dt / (rc + dt)
+        zi = ((1.0 - alpha) * samples[:1]).astype(samples.dtype)
+        out, _ = lfilter(np.array([alpha], dtype=samples.dtype), np.array([1.0, alpha - 1.0], dtype=samples.dtype),
+                         samples, axis=0, zi=zi)
+        return out
+
+    @staticmethod
+    def high_pass(samples: "np.ndarray", cutoff: float, frame_rate: int) -> "np.ndarray":
+        rc = 1.0 / (cutoff * 2 * math.pi)
+        dt = 1.0 / frame_rate
+        alpha = rc / (rc + dt)
+        zi = ((1.0 - alpha) * samples[:1]).astype(samples.dtype)
+        out, _ = lfilter(np.array([alpha, -alpha], dtype=samples.dtype), np.array([1.0, -alpha], dtype=samples.dtype),
+                         samples, axis=0, zi=zi)
+        return out
+
+    @staticmethod
+    def echo(samples: "np.ndarray", frame_rate: int) -> "np.ndarray":
+        return EffectsEngine.mix_delayed(samples, [
+            (EffectsEngine.ms_to_frames(250, frame_rate), EffectsEngine.db_to_gain(-6.0)),
+            (EffectsEngine.ms_to_frames(500, frame_rate), EffectsEngine.db_to_gain(-8.0)),
+        ])
+
+    @staticmethod
+    def reverb(samples: "np.ndarray", frame_rate: int) -> "np.ndarray":
+        # Each pass overlays the previous normalized mix onto the running wet
+        # signal. That normalized mix is just the wet signal times a gain, so
+        # the whole effect runs in one buffer with a scalar carried between passes.
+        dry_gain = EffectsEngine.db_to_gain(-3.0)
+        scale = 1.0
+        for delay_ms in (50, 100, 150, 200):
+            tap_gain = EffectsEngine.db_to_gain(-delay_ms / 20.0) * scale
+            EffectsEngine.mix_delayed(samples, [(EffectsEngine.ms_to_frames(delay_ms, frame_rate), tap_gain)],
+                                      dry_gain=dry_gain)
+            dry_gain = 1.0
+            peak = EffectsEngine.peak(samples)
+            scale = EffectsEngine.db_to_gain(-NORMALIZE_HEADROOM_DB) / peak if peak else 1.0
+        samples *= scale
+        return samples
+
+    @staticmethod
+    def robot(samples: "np.ndarray", frame_rate: int, original_frame_rate: int) -> "np.ndarray":
+        samples = EffectsEngine.resample(samples, int(frame_rate * 0.9), original_frame_rate)
+        samples = EffectsEngine.high_pass(samples, 300, original_frame_rate)
+        samples = EffectsEngine.low_pass(samples, 3000, original_frame_rate)
+        EffectsEngine.mix_delayed(samples, [(EffectsEngine.ms_to_frames(10, original_frame_rate), 1.0)])
+        return EffectsEngine.normalize(samples)
+
+    @staticmethod
+    def apply(samples: "np.ndarray", frame_rate: int, settings: dict) -> Tuple["np.ndarray", int]:
+        original_frame_rate = frame_rate
+
+        volume = settings.get("volume", 1.0)
+        if volume is not None and volume != 1.0:
+            EffectsEngine.apply_gain(samples, (volume - 1.0) * 10)
+
+        speed = settings.get("speed", 1.0)
+        pitch = settings.get("pitch", 0)
+        if (speed is not None and speed != 1.0) or (pitch is not None and pitch != 0):
+            from audio_dsp.TimeStretch import TimeStretch
+            samples = TimeStretch.apply(samples, frame_rate, speed, pitch)
+
+        if settings.get("echo"):
+            samples = EffectsEngine.echo(samples, frame_rate)
+
+        if settings.get("reverb"):
+            samples = EffectsEngine.reverb(samples, frame_rate)
+
+        if settings.get("robot"):
+            samples = EffectsEngine.robot(samples, frame_rate, original_frame_rate)
+            frame_rate = original_frame_rate
+
+        return samples, frame_rate
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import json
+import subprocess
+import threading
+from pathlib import Path
+from typing import Iterator, Union
+
+from pydub import AudioSegment
+
+Source = Union[str, Path, bytes]
+
+PIPE_WRITE_BYTES = 1 << 16
+
+
+class FFmpegPipe:
+    @staticmethod
+    def ffmpeg_binary() -> str:
+        return AudioSegment.converter or "ffmpeg"
+
+    @staticmethod
+    def ffprobe_binary() -> str:
+        return getattr(AudioSegment, "ffprobe", None) or "ffprobe"
+
+    @staticmethod
+    def _input_args(source: Source, fmt: str = None) -> list:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return (["-f", fmt] if fmt else []) + ["-i", "pipe:0"]
+        return ["-i", str(source)]
+
+    @staticmethod
+    def _feed(proc: subprocess.Popen, data: bytes):
+        view = memoryview(data)
+        try:
+            for start in range(0, len(view), PIPE_WRITE_BYTES):
+                proc.stdin.write(view[start:start + PIPE_WRITE_BYTES])
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    @staticmethod
+    def _start_feeder(proc: subprocess.Popen, source: Source):
+        if not isinstance(source, (bytes, bytearray, memoryview)):
+            return None
+        feeder = threading.Thread(target=FFmpegPipe._feed, args=(proc, source), daemon=True)
+        feeder.start()
+        return feeder
+
+    @staticmethod
+    def probe(source: Source, fmt: str = None) -> dict:
+        is_bytes = isinstance(source, (bytes, bytearray, memoryview))
+        cmd = [
+            FFmpegPipe.ffprobe_binary(), "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=sample_rate,channels,codec_name:format=duration",
+            "-of", "json"
+        ]
+        if is_bytes and fmt:
+            cmd += ["-f", fmt]
+        cmd.append("pipe:0" if is_bytes else str(source))
+
+        result = subprocess.run(
+            cmd,
+            input=bytes(source) if is_bytes else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffprobe failed: {result.stderr.decode(errors='ignore').strip()}")
+
+        info = json.loads(result.stdout or b"{}")
+        streams = info.get("streams") or []
+        if not streams:
+            raise RuntimeError("ffprobe found no audio stream.")
+        stream = streams[0]
+        duration = (info.get("format") or {}).get("duration")
+        return {
+            "sample_rate": int(stream.get("sample_rate") or 0),
+            "channels": int(stream.get("channels") or 0),
+            "codec": stream.get("codec_name"),
+            "duration_seconds": float(duration) if duration not in (None, "N/A") else None
+        }
+
+    @staticmethod
+    def iter_pcm(source: Source, block_frames: int, channels: int, sample_rate: int = None,
+                 fmt: str = None) -> Iterator[bytes]:
+        is_bytes = isinstance(source, (bytes, bytearray, memoryview))
+        cmd = [FFmpegPipe.ffmpeg_binary(), "-v", "error"]
+        if not is_bytes:
+            cmd.append("-nostdin")
+        cmd += FFmpegPipe._input_args(source, fmt)
+        cmd += ["-vn", "-map_metadata", "-1", "-ac", str(channels)]
+        if sample_rate:
+            cmd += ["-ar", str(sample_rate)]
+        cmd += ["-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"]
+
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if is_bytes else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        feeder = FFmpegPipe._start_feeder(proc, source)
+        frame_bytes = 2 * channels
+        block_bytes = max(1, int(block_frames)) * frame_bytes
+        finished = False
+        try:
+            while True:
+                data = proc.stdout.read(block_bytes)
+                if not data:
+                    break
+                usable = len(data) - len(data) % frame_bytes
+                if usable:
+                    yield data[:usable]
+            finished = True
+        finally:
+            if not finished and proc.poll() is None:
+                proc.kill()
+            stderr = proc.stderr.read()
+            proc.wait()
+            if feeder:
+                feeder.join(timeout=1.0)
+            if finished and proc.returncode != 0:
+                raise RuntimeError(f"ffmpeg decode failed: {stderr.decode(errors='ignore').strip()}")
+
+
+class PCMEncoder:
+    def __init__(self, out_path: Union[str, Path], fmt: str, sample_rate: int, channels: int):
+        self.out_path = Path(out_path)
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            FFmpegPipe.ffmpeg_binary(), "-v", "error", "-y",
+            "-f", "s16le", "-ar", str(int(sample_rate)), "-ac", str(int(channels)), "-i", "pipe:0",
+            "-f", fmt, str(self.out_path)
+        ]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self.bytes_written = 0
+
+    def write(self, pcm: bytes):
+        if not pcm:
+            return
+        try:
+            self.proc.stdin.write(pcm)
+        except BrokenPipeError:
+            self.close()
+            raise
+        self.bytes_written += len(pcm)
+
+    def close(self) -> Path:
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        stderr = self.proc.stderr.read()
+        self.proc.wait()
+        if self.proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg encode failed: {stderr.decode(errors='ignore').strip()}")
+        return self.out_path
+
+    def abort(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+
+from pydub import AudioSegment
+
+
+class PCMBuffer:
+    # Growable raw-PCM accumulator. pydub rebuilds raw_data on every `+`, so
+    # appending n pieces costs O(total^2); this keeps a bytearray with
+    # amortized doubling and builds one AudioSegment at the end.
+    MIN_CAPACITY = 64 * 1024
+
+    def __init__(self, frame_rate: int = None, channels: int = None, sample_width: int = None,
+                 capacity_bytes: int = 0):
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self._buf = bytearray(max(0, int(capacity_bytes)))
+        self._length = 0
+
+    @classmethod
+    def like(cls, audio: AudioSegment, capacity_bytes: int = 0) -> "PCMBuffer":
+        return cls(audio.frame_rate, audio.channels, audio.sample_width, capacity_bytes)
+
+    @property
+    def frame_width(self) -> int:
+        return (self.channels or 1) * (self.sample_width or 2)
+
+    @property
+    def duration_ms(self) -> float:
+        if not self.frame_rate:
+            return 0.0
+        return 1000.0 * (self._length // self.frame_width) / self.frame_rate
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _reserve(self, extra: int):
+        needed = self._length + extra
+        capacity = len(self._buf)
+        if needed <= capacity:
+            return
+        capacity = max(capacity, self.MIN_CAPACITY)
+        while capacity < needed:
+            capacity *= 2
+        self._buf.extend(bytes(capacity - len(self._buf)))
+
+    def reserve_ms(self, duration_ms: float):
+        if self.frame_rate:
+            self._reserve(int(self.frame_rate * duration_ms / 1000.0 + 1) * self.frame_width - self._length)
+
+    def _conform(self, audio: AudioSegment) -> AudioSegment:
+        if self.frame_rate is None:
+            self.frame_rate = audio.frame_rate
+            self.channels = audio.channels
+            self.sample_width = audio.sample_width
+            return audio
+        if audio.frame_rate != self.frame_rate:
+            audio = audio.set_frame_rate(self.frame_rate)
+        if audio.channels != self.channels:
+            audio = audio.set_channels(self.channels)
+        if audio.sample_width != self.sample_width:
+            audio = audio.set_sample_width(self.sample_width)
+        return audio
+
+    def append_raw(self, data):
+        size = len(data)
+        if not size:
+            return
+        self._reserve(size)
+        self._buf[self._length:self._length + size] = data
+        self._length += size
+
+    def append(self, audio: AudioSegment):
+        self.append_raw(self._conform(audio).raw_data)
+
+    def append_silence(self, duration_ms: float):
+        if self.frame_rate is None:
+            raise ValueError("PCMBuffer format is unknown; append audio before silence.")
+        size = int(self.frame_rate * duration_ms / 1000.0) * self.frame_width
+        if size <= 0:
+            return
+        # Reserved space past _length is never written, so it is already zero.
+        self._reserve(size)
+        self._length += size
+
+    def to_bytes(self) -> bytes:
+        return bytes(memoryview(self._buf)[:self._length])
+
+    def to_segment(self) -> AudioSegment:
+        if self.frame_rate is None:
+            return AudioSegment.silent(duration=0)
+        return AudioSegment(
+            data=self.to_bytes(),
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels
+        )
+
+    def export(self, fmt: str) -> bytes:
+        buf = BytesIO()
+        self.to_segment().export(buf, format=fmt)
+        buf.seek(0)
+        return buf.read()
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Union
+
+from audio_dsp.EffectsEngine import EffectsEngine, NORMALIZE_HEADROOM_DB, NUMPY_AVAILABLE
+from audio_dsp.FFmpegPipe import FFmpegPipe, PCMEncoder, Source
+from audio_dsp.TimeStretch import PhaseVocoder, TimeStretch
+from data_manager.MemoryManager import MemoryManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from scipy.signal import lfilter
+
+DEFAULT_BLOCK_FRAMES = 1 << 15
+BARRIER = object()
+
+
+class _GainStage:
+    def __init__(self, gain: float, clip: bool = True):
+        self.gain = gain
+        self.clip = clip
+
+    def process(self, block):
+        block *= self.gain
+        if self.clip:
+            np.clip(block, -1.0, 1.0, out=block)
+        return block
+
+    def flush(self):
+        return None
+
+
+class _DelayMixStage:
+    # Streaming twin of EffectsEngine.mix_delayed: the longest tap's worth of
+    # input is kept as history so taps reach back across block boundaries.
+    def __init__(self, taps, channels: int, dry_gain: float = 1.0):
+        self.taps = [(int(d), g) for d, g in taps]
+        self.dry_gain = dry_gain
+        self.history = np.zeros((max(d for d, _ in self.taps), channels), dtype=np.float32)
+
+    def process(self, block):
+        hist_len = len(self.history)
+        extended = np.concatenate((self.history, block))
+        out = block * self.dry_gain
+        for delay, gain in self.taps:
+            out += extended[hist_len - delay:hist_len - delay + len(block)] * gain
+            np.clip(out, -1.0, 1.0, out=out)
+        self.history = extended[len(extended) - hist_len:].copy()
+        return out
+
+    def flush(self):
+        return None
+
+
+class _ResampleStage:
+    # Streaming twin of EffectsEngine.resample. Output index k always maps to
+    # input position k * step, so block boundaries do not shift the result.
+    def __init__(self, src_rate: int, dst_rate: int, channels: int):
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.step = src_rate / dst_rate
+        self.buffer = np.zeros((0, channels), dtype=np.float32)
+        self.buffer_start = 0
+        self.total_in = 0
+        self.next_k = 0
+
+    def _emit(self, k_end: int, last: int):
+        if k_end <= self.next_k:
+            return self.buffer[:0]
+        pos = np.arange(self.next_k, k_end, dtype=np.float64) * self.step
+        np.minimum(pos, last, out=pos)
+        idx = pos.astype(np.int64)
+        frac = (pos - idx).astype(np.float32)[:, None]
+        nxt = np.minimum(idx + 1, last)
+        block = self.buffer[idx - self.buffer_start]
+        block += (self.buffer[nxt - self.buffer_start] - block) * frac
+        self.next_k = k_end
+        return block
+
+    def _trim(self):
+        keep_from = min(len(self.buffer), max(0, int(self.next_k * self.step) - self.buffer_start))
+        self.buffer = self.buffer[keep_from:]
+        self.buffer_start += keep_from
+
+    def process(self, block):
+        self.buffer = np.concatenate((self.buffer, block))
+        self.total_in += len(block)
+        last = self.total_in - 1
+        k_end = int(math.floor((last - 1) / self.step)) + 1 if last >= 1 else 0
+        out = self._emit(k_end, last)
+        self._trim()
+        return out
+
+    def flush(self):
+        if self.total_in < 2:
+            return self.buffer
+        out_len = max(1, int(round(self.total_in * self.dst_rate / self.src_rate)))
+        out = self._emit(out_len, self.total_in - 1)
+        self.buffer = self.buffer[:0]
+        return out
+
+
+class _FilterStage:
+    def __init__(self, b, a):
+        self.b = np.asarray(b, dtype=np.float32)
+        self.a = np.asarray(a, dtype=np.float32)
+        self.zi = None
+
+    def process(self, block):
+        if not len(block):
+            return block
+        if self.zi is None:
+            self.zi = ((1.0 - self.b[0]) * block[:1]).astype(np.float32)
+        out, self.zi = lfilter(self.b, self.a, block, axis=0, zi=self.zi)
+        return out
+
+    def flush(self):
+        return None
+
+
+class StreamingEffects:
+    def __init__(self, settings: dict, block_frames: int = None, spill_dir: Union[str, Path] = None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Streaming effects require numpy and scipy.")
+        self.logger = LogsManager.get_logger("StreamingEffects")
+        self.settings = dict(settings or {})
+        self.block_frames = int(block_frames or MemoryManager.get("streaming_block_frames", DEFAULT_BLOCK_FRAMES))
+        self.spill_dir = str(spill_dir) if spill_dir else None
+        self.passes = 0
+        self.frame_rate = 0
+        self.frames_in = 0
+        self.frames_out = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        return NUMPY_AVAILABLE
+
+    @staticmethod
+    def threshold_bytes() -> int:
+        return int(float(MemoryManager.get("streaming_effects_min_mb", 16)) * 1024 * 1024)
+
+    @staticmethod
+    def _normalize_gain(peak: float) -> float:
+        return EffectsEngine.db_to_gain(-NORMALIZE_HEADROOM_DB) / peak if peak else 1.0
+
+    @staticmethod
+    def _low_pass_coeffs(cutoff: float, frame_rate: int):
+        rc = 1.0 / (cutoff * 2 * math.pi)
+        dt = 1.0 / frame_rate
+        alpha = dt / (rc + dt)
+        return [alpha], [1.0, alpha - 1.0]
+
+    @staticmethod
+    def _high_pass_coeffs(cutoff: float, frame_rate: int):
+        rc = 1.0 / (cutoff * 2 * math.pi)
+        dt = 1.0 / frame_rate
+        alpha = rc / (rc + dt)
+        return [alpha, -alpha], [1.0, -alpha]
+
+    def _plan(self, frame_rate: int, channels: int):
+        # Returns (steps, output_frame_rate). A step is a factory taking the
+        # peak measured at the previous BARRIER, so reverb/robot normalize
+        # gains are known before the pass that needs them starts.
+        settings = self.settings
+        steps = []
+        ms = EffectsEngine.ms_to_frames
+        db = EffectsEngine.db_to_gain
+        original_frame_rate = frame_rate
+
+        volume = settings.get("volume", 1.0)
+        if volume is not None and volume != 1.0:
+            steps.append(lambda _: _GainStage(db((volume - 1.0) * 10)))
+
+        speed = float(settings.get("speed") or 1.0)
+        pitch = float(settings.get("pitch") or 0.0)
+        if speed != 1.0 or pitch != 0.0:
+            stretch = TimeStretch.stretch_rate(speed, pitch)
+            if stretch != 1.0:
+                steps.append(lambda _: PhaseVocoder(stretch, channels, frame_rate))
+            if pitch != 0.0:
+                src = int(round(frame_rate * TimeStretch.pitch_ratio(pitch)))
+                steps.append(lambda _, src=src: _ResampleStage(src, frame_rate, channels))
+
+        if settings.get("echo"):
+            taps = [(ms(250, frame_rate), db(-6.0)), (ms(500, frame_rate), db(-8.0))]
+            steps.append(lambda _, taps=taps: _DelayMixStage(taps, channels))
+
+        if settings.get("reverb"):
+            rate = frame_rate
+            steps.append(lambda _: _DelayMixStage([(ms(50, rate), db(-2.5))], channels, dry_gain=db(-3.0)))
+            steps.append(BARRIER)
+            for delay_ms in (100, 150, 200):
+                steps.append(lambda peak, d=delay_ms: _DelayMixStage(
+                    [(ms(d, rate), db(-d / 20.0) * self._normalize_gain(peak))], channels))
+                steps.append(BARRIER)
+            steps.append(lambda peak: _GainStage(self._normalize_gain(peak), clip=False))
+
+        if settings.get("robot"):
+            src = int(frame_rate * 0.9)
+            hp = self._high_pass_coeffs(300, original_frame_rate)
+            lp = self._low_pass_coeffs(3000, original_frame_rate)
+            steps.append(lambda _, src=src: _ResampleStage(src, original_frame_rate, channels))
+            steps.append(lambda _: _FilterStage(*hp))
+            steps.append(lambda _: _FilterStage(*lp))
+            steps.append(lambda _: _DelayMixStage([(ms(10, original_frame_rate), 1.0)], channels))
+            steps.append(BARRIER)
+            steps.append(lambda peak: _GainStage(self._normalize_gain(peak), clip=False))
+            frame_rate = original_frame_rate
+
+        return steps, frame_rate
+
+    @staticmethod
+    def _split_passes(steps) -> list:
+        passes = [[]]
+        for step in steps:
+            if step is BARRIER:
+                passes.append([])
+            else:
+                passes[-1].append(step)
+        return passes
+
+    @staticmethod
+    def _run_stages(stages, blocks: Iterable) -> Iterator:
+        for block in blocks:
+            for stage in stages:
+                block = stage.process(block)
+                if not len(block):
+                    break
+            if len(block):
+                yield block
+
+        pending = None
+        for stage in stages:
+            if pending is not None and len(pending):
+                pending = stage.process(pending)
+            tail = stage.flush()
+            if tail is not None and len(tail):
+                pending = tail if pending is None or not len(pending) else np.concatenate((pending, tail))
+        if pending is not None and len(pending):
+            yield pending
+
+    def _spill_blocks(self, spill, channels: int) -> Iterator:
+        spill.seek(0)
+        count = self.block_frames * channels
+        while True:
+            data = np.fromfile(spill, dtype=np.float32, count=count)
+            if not data.size:
+                break
+            yield data.reshape(-1, channels)
+
+    def process_blocks(self, blocks: Iterable, frame_rate: int, channels: int,
+                       sink: Callable) -> int:
+        steps, out_rate = self._plan(frame_rate, channels)
+        passes = self._split_passes(steps)
+        peak = None
+        source = blocks
+        spill = None
+
+        try:
+            for index, factories in enumerate(passes):
+                stages = [factory(peak) for factory in factories]
+                self.passes += 1
+                output = self._run_stages(stages, source)
+
+                if index == len(passes) - 1:
+                    for block in output:
+                        self.frames_out += len(block)
+                        sink(block)
+                    break
+
+                next_spill = tempfile.TemporaryFile(prefix="fx_spill_", dir=self.spill_dir)
+                peak = 0.0
+                for block in output:
+                    peak = max(peak, EffectsEngine.peak(block))
+                    np.ascontiguousarray(block, dtype=np.float32).tofile(next_spill)
+                if spill is not None:
+                    spill.close()
+                spill = next_spill
+                source = self._spill_blocks(spill, channels)
+        finally:
+            if spill is not None:
+                spill.close()
+
+        return out_rate
+
+    def _decoded_blocks(self, source: Source, channels: int, fmt: str = None) -> Iterator:
+        for pcm in FFmpegPipe.iter_pcm(source, self.block_frames, channels, fmt=fmt):
+            block = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+            block *= 1.0 / 32768.0
+            block = block.reshape(-1, channels)
+            self.frames_in += len(block)
+            yield block
+
+    def process(self, source: Source, out_path: Union[str, Path], out_format: str, fmt: str = None) -> Path:
+        start_time = time.time()
+        info = FFmpegPipe.probe(source, fmt)
+        frame_rate, channels = info["sample_rate"], info["channels"]
+        self.frame_rate = frame_rate
+        _, out_rate = self._plan(frame_rate, channels)
+
+        encoder = PCMEncoder(out_path, out_format, out_rate, channels)
+        try:
+            self.process_blocks(
+                self._decoded_blocks(source, channels, fmt), frame_rate, channels,
+                lambda block: encoder.write(EffectsEngine.to_pcm16(block))
+            )
+        except Exception:
+            encoder.abort()
+            raise
+        result = encoder.close()
+
+        LogsHelperManager.log_performance(self.logger, "STREAMING_EFFECTS_DONE", time.time() - start_time, {
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "frame_rate": frame_rate,
+            "out_frame_rate": out_rate,
+            "channels": channels,
+            "block_frames": self.block_frames,
+            "passes": self.passes,
+            "settings": self.settings
+        })
+        return result
+
+    def process_bytes(self, data: bytes, fmt: str, out_format: str = None) -> bytes:
+        out_format = out_format or fmt
+        with tempfile.TemporaryDirectory(prefix="fx_stream_", dir=self.spill_dir) as tmp:
+            out_path = self.process(data, Path(tmp) / f"out.{out_format}", out_format, fmt=fmt)
+            return out_path.read_bytes()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+import math
+
+from pydub import AudioSegment
+
+from audio_dsp.EffectsEngine import EffectsEngine, NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+MAX_FRAMES_PER_CHUNK = 256
+
+
+class PhaseVocoder:
+    # Phase-vocoder tempo change (output length = input / rate, pitch kept).
+    # Works incrementally: feed blocks through process() and call flush() at
+    # the end. STFT frames are computed at most MAX_FRAMES_PER_CHUNK at a time
+    # and the running phase is carried between chunks, so memory does not grow
+    # with the input length.
+    def __init__(self, rate: float, channels: int, frame_rate: int, n_fft: int = None):
+        self.rate = float(rate)
+        self.channels = channels
+        self.n_fft = n_fft or self.default_n_fft(frame_rate)
+        self.hop = self.n_fft // 4
+        self.pad = self.n_fft // 2
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.n_fft) / self.n_fft)).astype(np.float32)
+        self.advance = (2 * np.pi * self.hop * np.arange(self.n_fft // 2 + 1) / self.n_fft)
+
+        self.in_buf = np.zeros((self.pad, channels), dtype=np.float32)
+        self.in_start = 0
+        self.total_in = 0
+        self.n_frames_total = None
+        self.next_t = 0
+        self.phase = None
+
+        self.out_buf = np.zeros((0, channels), dtype=np.float32)
+        self.norm_buf = np.zeros(0, dtype=np.float32)
+        self.out_start = 0
+        self.emitted = 0
+        self.target_len = None
+
+    @staticmethod
+    def default_n_fft(frame_rate: int) -> int:
+        return 1 << max(8, int(round(math.log2(max(1, frame_rate) * 0.046))))
+
+    def _available_frames(self) -> int:
+        if self.n_frames_total is not None:
+            return self.n_frames_total
+        padded_len = self.in_start + len(self.in_buf)
+        return max(0, (padded_len - self.n_fft) // self.hop + 1)
+
+    def _analysis(self, i0: int, i1: int):
+        # Complex spectra of analysis frames [i0, i1); frames past the end of
+        # the signal are zero, like a zero-padded STFT.
+        n_bins = self.n_fft // 2 + 1
+        spectra = np.zeros((i1 - i0, self.channels, n_bins), dtype=np.complex64)
+        real_end = min(i1, self._available_frames())
+        if real_end > i0:
+            start = i0 * self.hop - self.in_start
+            stop = (real_end - 1) * self.hop + self.n_fft - self.in_start
+            segment = self.in_buf[start:stop]
+            if len(segment) < stop - start:
+                segment = np.concatenate((segment, np.zeros((stop - start - len(segment), self.channels), np.float32)))
+            frames = sliding_window_view(segment, self.n_fft, axis=0)[::self.hop]
+            spectra[:real_end - i0] = np.fft.rfft(frames * self.window, axis=-1)
+        return spectra
+
+    def _synthesize(self, t0: int, t1: int):
+        steps = np.arange(t0, t1, dtype=np.float64) * self.rate
+        idx = steps.astype(np.int64)
+        alpha = (steps - idx)[:, None, None]
+        base = int(idx[0])
+        spectra = self._analysis(base, int(idx[-1]) + 2)
+        left = spectra[idx - base]
+        right = spectra[idx + 1 - base]
+
+        magnitude = (1.0 - alpha) * np.abs(left) + alpha * np.abs(right)
+        delta = np.angle(right) - np.angle(left) - self.advance
+        delta -= 2 * np.pi * np.round(delta / (2 * np.pi))
+        step_phase = self.advance + delta
+
+        if self.phase is None:
+            self.phase = np.angle(left[0])
+        phases = self.phase + np.cumsum(step_phase, axis=0) - step_phase
+        self.phase = phases[-1] + step_phase[-1]
+
+        frames = np.fft.irfft(magnitude * np.exp(1j * phases), n=self.n_fft, axis=-1).astype(np.float32)
+        frames *= self.window
+
+        needed = (t1 - 1) * self.hop + self.n_fft - self.out_start
+        if needed > len(self.out_buf):
+            grow = needed - len(self.out_buf)
+            self.out_buf = np.concatenate((self.out_buf, np.zeros((grow, self.channels), np.float32)))
+            self.norm_buf = np.concatenate((self.norm_buf, np.zeros(grow, np.float32)))
+
+        window_sq = self.window ** 2
+        for k, t in enumerate(range(t0, t1)):
+            pos = t * self.hop - self.out_start
+            self.out_buf[pos:pos + self.n_fft] += frames[k].T
+            self.norm_buf[pos:pos + self.n_fft] += window_sq
+
+        self.next_t = t1
+
+    def _drain(self, upto: int):
+        # Emits finished output samples (padded coordinates < upto), dropping
+        # the leading half-window of padding.
+        count = max(0, min(upto - self.out_start, len(self.out_buf)))
+        if not count:
+            return self.out_buf[:0]
+        ready = self.out_buf[:count]
+        norm = self.norm_buf[:count]
+        ready = ready / np.where(norm > 1e-8, norm, 1.0)[:, None]
+        self.out_buf = self.out_buf[count:]
+        self.norm_buf = self.norm_buf[count:]
+
+        skip = max(0, self.pad - self.out_start)
+        self.out_start += count
+        ready = ready[skip:]
+        if self.target_len is not None:
+            ready = ready[:max(0, self.target_len - self.emitted)]
+        self.emitted += len(ready)
+        return ready
+
+    def _run(self) -> "np.ndarray":
+        available = self._available_frames()
+        if self.n_frames_total is None:
+            # Output frame t needs analysis frames floor(t*rate) and +1.
+            t_end = int(math.floor((available - 2) / self.rate)) + 1 if available >= 2 else 0
+        else:
+            t_end = int(math.ceil(self.n_frames_total / self.rate))
+
+        out = []
+        while self.next_t < t_end:
+            t1 = min(t_end, self.next_t + MAX_FRAMES_PER_CHUNK)
+            self._synthesize(self.next_t, t1)
+            out.append(self._drain(self.next_t * self.hop))
+
+        keep_from = int(self.next_t * self.rate) * self.hop - self.in_start
+        if keep_from > 0:
+            self.in_buf = self.in_buf[keep_from:]
+            self.in_start += keep_from
+
+        return np.concatenate(out) if out else self.out_buf[:0]
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        if not len(block):
+            return block
+        self.in_buf = np.concatenate((self.in_buf, block.astype(np.float32, copy=False)))
+        self.total_in += len(block)
+        return self._run()
+
+    def flush(self) -> "np.ndarray":
+        self.n_frames_total = 1 + self.total_in // self.hop
+        self.target_len = int(round(self.total_in / self.rate))
+        pad_to = (self.n_frames_total - 1) * self.hop + self.n_fft
+        missing = pad_to - (self.in_start + len(self.in_buf))
+        if missing > 0:
+            self.in_buf = np.concatenate((self.in_buf, np.zeros((missing, self.channels), np.float32)))
+
+        tail = [self._run(), self._drain(self.out_start + len(self.out_buf))]
+        out = np.concatenate(tail)
+        short = self.target_len - self.emitted
+        if short > 0:
+            out = np.concatenate((out, np.zeros((short, self.channels), np.float32)))
+            self.emitted += short
+        return out
+
+
+class TimeStretch:
+    @staticmethod
+    def is_available() -> bool:
+        return NUMPY_AVAILABLE
+
+    @staticmethod
+    def pitch_ratio(semitones: float) -> float:
+        return 2.0 ** (float(semitones or 0) / 12.0)
+
+    @staticmethod
+    def stretch_rate(speed: float, semitones: float) -> float:
+        # Pitch is shifted by resampling afterwards, which also scales tempo
+        # by the pitch ratio, so the vocoder only makes up the difference.
+        return float(speed or 1.0) / TimeStretch.pitch_ratio(semitones)
+
+    @staticmethod
+    def apply(samples: "np.ndarray", frame_rate: int, speed: float = 1.0, semitones: float = 0.0) -> "np.ndarray":
+        speed = float(speed or 1.0)
+        semitones = float(semitones or 0.0)
+        if speed == 1.0 and semitones == 0.0:
+            return samples
+
+        rate = TimeStretch.stretch_rate(speed, semitones)
+        if rate != 1.0 and len(samples):
+            vocoder = PhaseVocoder(rate, samples.shape[1], frame_rate)
+            samples = np.concatenate((vocoder.process(samples), vocoder.flush()))
+
+        if semitones != 0.0:
+            samples = EffectsEngine.resample(
+                samples, int(round(frame_rate * TimeStretch.pitch_ratio(semitones))), frame_rate
+            )
+        return samples
+
+    @staticmethod
+    def apply_segment(audio: AudioSegment, speed: float = 1.0, semitones: float = 0.0) -> AudioSegment:
+        speed = float(speed or 1.0)
+        semitones = float(semitones or 0.0)
+        if speed == 1.0 and semitones == 0.0:
+            return audio
+
+        if not NUMPY_AVAILABLE:
+            ratio = speed * TimeStretch.pitch_ratio(semitones)
+            relabelled = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * ratio)})
+            return relabelled.set_frame_rate(audio.frame_rate)
+
+        samples = TimeStretch.apply(EffectsEngine.to_array(audio), audio.frame_rate, speed, semitones)
+        return EffectsEngine.to_segment(samples, audio.frame_rate)
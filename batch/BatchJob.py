@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEFAULT_SETTINGS = {
+    "pitch": 0, "speed": 1.0, "volume": 1.0,
+    "echo": False, "reverb": False, "robot": False
+}
+
+
+@dataclass
+class BatchJob:
+    id: str
+    text: str
+    service: str = "google"
+    lang: str = "en"
+    voice: str = "female"
+    fmt: str = "mp3"
+    settings: dict = field(default_factory=lambda: dict(DEFAULT_SETTINGS))
+    source: Optional[str] = None
+
+    @property
+    def chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def fingerprint(self) -> str:
+        raw = json.dumps({
+            "text": self.text, "service": self.service, "lang": self.lang,
+            "voice": self.voice, "fmt": self.fmt, "settings": self.settings
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _safe_id(raw: str) -> str:
+        return "".join(c if c.isalnum() or c in "-_." else "_" for c in raw)
+
+    @classmethod
+    def from_directory(cls, directory: Path, pattern: str = "*.txt", **defaults) -> Iterator["BatchJob"]:
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise FileNotFoundError(f"Batch directory not found: {directory}")
+
+        for path in sorted(directory.rglob(pattern)):
+            text = path.read_text(encoding="utf-8").strip()
+            if not text:
+                continue
+            job_id = cls._safe_id(str(path.relative_to(directory).with_suffix("")))
+            yield cls(id=job_id, text=text, source=str(path), **defaults)
+
+    @classmethod
+    def from_manifest(cls, manifest: Path, **defaults) -> Iterator["BatchJob"]:
+        manifest = Path(manifest)
+        if not manifest.is_file():
+            raise FileNotFoundError(f"Batch manifest not found: {manifest}")
+
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{manifest}:{line_no}: invalid JSON ({e})")
+
+                text = entry.get("text")
+                source = None
+                if text is None and entry.get("path"):
+                    source = manifest.parent / entry["path"]
+                    text = source.read_text(encoding="utf-8")
+                if not text or not text.strip():
+                    raise ValueError(f"{manifest}:{line_no}: entry has no 'text' or 'path'")
+
+                job = cls(
+                    id=cls._safe_id(str(entry.get("id", f"line_{line_no}"))),
+                    text=text.strip(),
+                    source=str(source) if source else f"{manifest}:{line_no}",
+                    **defaults
+                )
+                for key in ("service", "lang", "voice"):
+                    if key in entry:
+                        setattr(job, key, entry[key])
+                if "format" in entry:
+                    job.fmt = entry["format"]
+                if "settings" in entry:
+                    job.settings = {**job.settings, **entry["settings"]}
+                yield job
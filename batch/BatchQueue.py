@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Optional
+
+from VoiceProcessor import VoiceProcessor
+from batch.BatchJob import BatchJob
+from batch.BatchState import BatchState
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+from media_formats.Formats import get_format_class
+from tts.factory.TTSFactory import TTSFactory
+
+
+class BatchQueue:
+    STATE_FILE = "batch_state.json"
+
+    def __init__(self, jobs: Iterable[BatchJob], output_dir: Path, max_workers: int = 2,
+                 state_path: Optional[Path] = None, progress_cb=None):
+        self.logger = LogsManager.get_logger("BatchQueue")
+        self.jobs = list(jobs)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max(1, int(max_workers))
+        self.state = BatchState(state_path or self.output_dir / self.STATE_FILE)
+        self.progress_cb = progress_cb
+
+        self._lock = threading.Lock()
+        self._services = {}
+        self._throughput = {}
+        self._stop = threading.Event()
+
+        seen = set()
+        for job in self.jobs:
+            if job.id in seen:
+                raise ValueError(f"Duplicate batch job id: {job.id}")
+            seen.add(job.id)
+
+    def stop(self):
+        self._stop.set()
+
+    def _get_service(self, job: BatchJob):
+        key = (job.service.lower(), job.lang, job.voice)
+        with self._lock:
+            if key not in self._services:
+                self._services[key] = TTSFactory.create(job.service, job.lang, job.voice)
+            return self._services[key]
+
+    def _record(self, job: BatchJob, started: float, finished: float, ok: bool):
+        with self._lock:
+            stats = self._throughput.setdefault(job.service.lower(), {
+                "files": 0, "failed": 0, "chars": 0, "busy_seconds": 0.0,
+                "first_start": started, "last_end": finished
+            })
+            stats["first_start"] = min(stats["first_start"], started)
+            stats["last_end"] = max(stats["last_end"], finished)
+            stats["busy_seconds"] += finished - started
+            if ok:
+                stats["files"] += 1
+                stats["chars"] += job.chars
+            else:
+                stats["failed"] += 1
+
+    def _run_job(self, job: BatchJob) -> Path:
+        if self._stop.is_set():
+            raise RuntimeError("Batch stopped.")
+
+        started = time.time()
+        self.state.mark(job.id, "running", job.fingerprint, source=job.source)
+        try:
+            tts = self._get_service(job)
+            raw_bytes = tts.synthesize_to_bytes(job.text)
+            audio = VoiceProcessor.process_from_memory(raw_bytes, "mp3", job.settings, return_audio=True)
+            out_path = get_format_class(job.fmt)(audio, filename=job.id).export(self.output_dir)
+        except Exception as e:
+            finished = time.time()
+            self._record(job, started, finished, ok=False)
+            self.state.mark(job.id, "failed", job.fingerprint, source=job.source, error=str(e))
+            LogsHelperManager.log_error(self.logger, "BATCH_JOB_FAIL", f"{job.id}: {e}")
+            raise
+
+        finished = time.time()
+        self._record(job, started, finished, ok=True)
+        self.state.mark(
+            job.id, "done", job.fingerprint,
+            source=job.source, output=str(out_path), service=job.service,
+            chars=job.chars, duration=round(finished - started, 3)
+        )
+        LogsHelperManager.log_performance(self.logger, "BATCH_JOB_DONE", finished - started, {
+            "id": job.id, "service": job.service, "chars": job.chars, "output": str(out_path)
+        })
+        return out_path
+
+    def throughput(self) -> dict:
+        result = {}
+        with self._lock:
+            for service, stats in self._throughput.items():
+                window = max(stats["last_end"] - stats["first_start"], 1e-6)
+                result[service] = {
+                    "files": stats["files"],
+                    "failed": stats["failed"],
+                    "chars": stats["chars"],
+                    "chars_per_sec": round(stats["chars"] / window, 2),
+                    "files_per_min": round(stats["files"] / window * 60, 2),
+                    "busy_seconds": round(stats["busy_seconds"], 2)
+                }
+        return result
+
+    def run(self) -> dict:
+        start = time.time()
+        pending = [job for job in self.jobs if not self.state.is_done(job.id, job.fingerprint)]
+        skipped = len(self.jobs) - len(pending)
+        total = len(pending)
+        done = failed = 0
+
+        LogsHelperManager.log_event(self.logger, "BATCH_START", {
+            "jobs": len(self.jobs), "pending": total, "resumed_skipped": skipped,
+            "workers": self.max_workers, "output_dir": str(self.output_dir)
+        })
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as pool:
+            futures = {pool.submit(self._run_job, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    future.result()
+                    done += 1
+                except Exception:
+                    failed += 1
+
+                if self.progress_cb:
+                    finished = done + failed
+                    pct = int(finished / total * 100) if total else 100
+                    self.progress_cb(pct, f"Batch {finished}/{total}  ({job.id})")
+
+        duration = time.time() - start
+        summary = {
+            "total": len(self.jobs),
+            "done": done,
+            "failed": failed,
+            "skipped": skipped,
+            "duration": round(duration, 2),
+            "services": self.throughput()
+        }
+        LogsHelperManager.log_performance(self.logger, "BATCH_DONE", duration, summary)
+        return summary
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class BatchState:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.jobs = {}
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.jobs = json.load(f).get("jobs", {})
+        except (OSError, json.JSONDecodeError):
+            self.jobs = {}
+
+    def _save_locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": time.time(), "jobs": self.jobs}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, job_id: str, fingerprint: str) -> bool:
+        entry = self.jobs.get(job_id)
+        if not entry or entry.get("status") != "done" or entry.get("fingerprint") != fingerprint:
+            return False
+        output = entry.get("output")
+        return bool(output) and Path(output).exists()
+
+    def mark(self, job_id: str, status: str, fingerprint: str, **extra):
+        with self._lock:
+            self.jobs[job_id] = {
+                "status": status,
+                "fingerprint": fingerprint,
+                "updated_at": time.time(),
+                **extra
+            }
+            self._save_locked()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.jobs.get(job_id)
+
+    def counts(self) -> dict:
+        result = {}
+        for entry in self.jobs.values():
+            result[entry.get("status", "unknown")] = result.get(entry.get("status", "unknown"), 0) + 1
+        return result
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "baseline.json"
+SAMPLE_RATE = 24000
+GENERATE_BLOCK = 1 << 20
+
+LENGTHS = {
+    "10s": 10,
+    "10min": 600,
+    "1h": 3600
+}
+
+NEUTRAL = {"pitch": 0, "speed": 1.0, "volume": 1.0, "echo": False, "reverb": False, "robot": False}
+
+EFFECT_CASES = {
+    "volume": {"volume": 1.5},
+    "speed": {"speed": 1.25},
+    "pitch": {"pitch": 3},
+    "echo": {"echo": True},
+    "reverb": {"reverb": True},
+    "robot": {"robot": True},
+    "speed+pitch": {"speed": 0.9, "pitch": -2},
+    "echo+reverb": {"echo": True, "reverb": True},
+    "all": {"volume": 1.2, "speed": 1.1, "pitch": 2, "echo": True, "reverb": True, "robot": True}
+}
+
+STYLE_CASES = ["radio", "storyteller", "robotic", "deep", "soft", "cinematic", "narrator", "energetic"]
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def _synthetic_speech(seconds: float):
+    # Voiced-speech stand-in: a gliding ~140 Hz fundamental with decaying
+    # harmonics, syllable-rate amplitude modulation and a little noise.
+    # Deterministic, so runs are comparable.
+    import numpy as np
+    from pydub import AudioSegment
+
+    total = int(seconds * SAMPLE_RATE)
+    out = np.empty(total, dtype="<i2")
+    rng = np.random.default_rng(1234)
+    phase = 0.0
+    for start in range(0, total, GENERATE_BLOCK):
+        t = np.arange(start, min(total, start + GENERATE_BLOCK), dtype=np.float64) / SAMPLE_RATE
+        f0 = 140.0 + 30.0 * np.sin(2 * np.pi * 0.7 * t)
+        phases = phase + 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        phase = float(phases[-1])
+        voiced = sum(np.sin(h * phases) / h for h in range(1, 6))
+        envelope = 0.2 + 0.8 * np.sin(2 * np.pi * 3.0 * t) ** 2
+        block = voiced * envelope * 0.22 + rng.standard_normal(len(t)) * 0.01
+        out[start:start + len(t)] = np.clip(block * 32767, -32768, 32767).astype("<i2")
+
+    return AudioSegment(data=out.tobytes(), sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+
+
+def _run_case(kind: str, name: str, seconds: float, repeat: int) -> dict:
+    # Runs in a fresh worker process so peak RSS belongs to this case alone.
+    from VoiceProcessor import VoiceProcessor
+    from audio_dsp.EffectsEngine import EffectsEngine
+    from markup.VoiceCharacterManager import VoiceCharacterManager
+
+    audio = _synthetic_speech(seconds)
+    rss_before = _peak_rss_mb()
+
+    if kind == "effect":
+        settings = dict(NEUTRAL, **EFFECT_CASES[name])
+        run = lambda: VoiceProcessor.apply(audio, settings)
+    else:
+        manager = VoiceCharacterManager()
+        run = lambda: manager.apply(audio, name)
+
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+        del result
+
+    best = min(timings)
+    peak = _peak_rss_mb()
+    return {
+        "seconds": round(best, 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "realtime_factor": round(seconds / best, 1) if best else None,
+        "peak_rss_mb": round(peak, 1),
+        "rss_growth_mb": round(max(0.0, peak - rss_before), 1),
+        "engine": "numpy" if EffectsEngine.is_available() else "pydub"
+    }
+
+
+class VoiceBenchmark:
+    def __init__(self, lengths: list, repeat: int = None, include_styles: bool = True, cases: list = None):
+        self.lengths = lengths
+        self.repeat = repeat
+        self.include_styles = include_styles
+        self.cases = cases
+
+    def _plan(self) -> list:
+        plan = []
+        for length in self.lengths:
+            for name in EFFECT_CASES:
+                if not self.cases or name in self.cases:
+                    plan.append(("effect", name, length))
+            if self.include_styles:
+                for style in STYLE_CASES:
+                    if not self.cases or f"style:{style}" in self.cases:
+                        plan.append(("style", style, length))
+        return plan
+
+    def _repeat_for(self, seconds: float) -> int:
+        if self.repeat:
+            return self.repeat
+        return 5 if seconds <= 10 else 1
+
+    def run(self, progress=None) -> dict:
+        results = {}
+        plan = self._plan()
+        context = multiprocessing.get_context("spawn")
+        for index, (kind, name, length) in enumerate(plan, start=1):
+            seconds = LENGTHS[length]
+            label = f"{name if kind == 'effect' else 'style:' + name}@{length}"
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results[label] = pool.submit(_run_case, kind, name, seconds, self._repeat_for(seconds)).result()
+            if progress:
+                progress(index, len(plan), label, results[label])
+
+        return {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "sample_rate": SAMPLE_RATE,
+                "lengths": self.lengths
+            },
+            "results": results
+        }
+
+    @staticmethod
+    def compare(current: dict, baseline: dict, threshold: float) -> list:
+        regressions = []
+        base_results = baseline.get("results", {})
+        for label, result in current["results"].items():
+            base = base_results.get(label)
+            if not base or not base.get("seconds"):
+                continue
+            ratio = result["seconds"] / base["seconds"]
+            rss_ratio = result["peak_rss_mb"] / base["peak_rss_mb"] if base.get("peak_rss_mb") else 1.0
+            if ratio > 1.0 + threshold or rss_ratio > 1.0 + threshold:
+                regressions.append({
+                    "case": label,
+                    "seconds": result["seconds"],
+                    "baseline_seconds": base["seconds"],
+                    "time_ratio": round(ratio, 3),
+                    "peak_rss_mb": result["peak_rss_mb"],
+                    "baseline_peak_rss_mb": base.get("peak_rss_mb"),
+                    "rss_ratio": round(rss_ratio, 3)
+                })
+        return regressions
+
+    @staticmethod
+    def load(path: Path) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def save(path: Path, data: dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def _print_progress(index: int, total: int, label: str, result: dict):
+    print(
+        f"[{index:3d}/{total}] {label:28s} {result['seconds']:9.4f}s "
+        f"x{result['realtime_factor'] or 0:<8} peak {result['peak_rss_mb']:8.1f} MB "
+        f"(+{result['rss_growth_mb']:.1f}) [{result['engine']}]",
+        file=sys.stderr, flush=True
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark VoiceProcessor and VoiceCharacterManager rendering")
+    parser.add_argument("--lengths", default="10s,10min,1h",
+                        help=f"Comma-separated lengths from: {', '.join(LENGTHS)}")
+    parser.add_argument("--cases", help="Comma-separated case names (e.g. echo,all,style:radio); default all")
+    parser.add_argument("--no-styles", action="store_true", help="Skip VoiceCharacterManager styles")
+    parser.add_argument("--repeat", type=int, help="Runs per case (best is kept); default 5 for 10s, 1 otherwise")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown / RSS growth before a case counts as a regression (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("-o", "--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    lengths = [l.strip() for l in args.lengths.split(",") if l.strip()]
+    unknown = [l for l in lengths if l not in LENGTHS]
+    if unknown:
+        parser.error(f"Unknown length(s): {', '.join(unknown)}")
+
+    cases = [c.strip() for c in args.cases.split(",")] if args.cases else None
+    bench = VoiceBenchmark(lengths, repeat=args.repeat, include_styles=not args.no_styles, cases=cases)
+    current = bench.run(progress=_print_progress)
+
+    if args.output:
+        VoiceBenchmark.save(Path(args.output), current)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline or not baseline_path.exists():
+        VoiceBenchmark.save(baseline_path, current)
+        print(json.dumps({"baseline_written": str(baseline_path), "cases": len(current["results"])}, indent=2))
+        return 0
+
+    regressions = VoiceBenchmark.compare(current, VoiceBenchmark.load(baseline_path), args.threshold)
+    print(json.dumps({
+        "baseline": str(baseline_path),
+        "threshold": args.threshold,
+        "cases": len(current["results"]),
+        "regressions": regressions
+    }, indent=2))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+EFFECT_DEFAULTS = {
+    "pitch": 0, "speed": 1.0, "volume": 1.0,
+    "echo": False, "reverb": False, "robot": False
+}
+
+
+def _init_logs(mode: str):
+    from logs_manager.LogsManager import LogsManager
+    LogsManager.init(mode, handler_type="file", db_path=str(LogsManager.LOG_DIR / "logs.sqlite"))
+
+
+def _init_ffmpeg():
+    # Point pydub at the bundled ffmpeg, as the GUI does at startup. stdout
+    # carries the JSON results, so the status line goes to stderr.
+    from contextlib import redirect_stdout
+    from data_manager.DataManager import DataManager
+    from logs_manager.LogsHelperManager import LogsHelperManager
+    from logs_manager.LogsManager import LogsManager
+    try:
+        with redirect_stdout(sys.stderr):
+            DataManager.initialize()
+    except Exception as e:
+        LogsHelperManager.log_error(LogsManager.get_logger("CLI"), "FFMPEG_INIT_FAILED", str(e))
+
+
+def _read_text(args) -> str:
+    if args.input == "-":
+        return sys.stdin.read().strip()
+    if args.input:
+        return Path(args.input).read_text(encoding="utf-8").strip()
+    return (args.text or "").strip()
+
+
+def _effect_settings(args) -> dict:
+    return {
+        "pitch": args.pitch,
+        "speed": args.speed,
+        "volume": args.volume,
+        "echo": args.echo,
+        "reverb": args.reverb,
+        "robot": args.robot
+    }
+
+
+def _progress(quiet: bool):
+    if quiet:
+        return None
+
+    def report(pct, msg):
+        print(f"[{int(pct):3d}%] {msg}", file=sys.stderr, flush=True)
+    return report
+
+
+def _emit(result: dict):
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+
+
+def cmd_convert(args) -> int:
+    from audio_dsp.AudioPipeline import AudioPipeline
+    from media_formats.Formats import get_format_class
+    from tts.factory.TTSFactory import TTSFactory
+
+    text = _read_text(args)
+    if not text:
+        raise ValueError("No text provided.")
+
+    start = time.time()
+    tts = TTSFactory.create(args.service, args.lang, args.voice)
+    pipeline = AudioPipeline("cli_convert")
+    with pipeline.stage("synthesize"):
+        raw_bytes = tts.synthesize_to_bytes(text, progress_cb=_progress(args.quiet))
+    fmt_class = get_format_class(args.format)
+    if AudioPipeline.should_stream(raw_bytes):
+        out_path = pipeline.stream(raw_bytes, "mp3", _effect_settings(args), fmt_class, Path(args.output),
+                                   filename=args.name)
+    else:
+        pipeline.render(raw_bytes, "mp3", _effect_settings(args))
+        out_path = pipeline.encode(fmt_class, Path(args.output), filename=args.name)
+    pipeline.log_report({"service": args.service, "chars": len(text)})
+
+    _emit({
+        "output": str(out_path),
+        "chars": len(text),
+        "duration": round(time.time() - start, 2),
+        "stages": pipeline.timings
+    })
+    return 0
+
+
+def cmd_transcribe(args) -> int:
+    from stt.factory.STTFactory import STTManager
+
+    start = time.time()
+    manager = STTManager(config_path=args.config)
+    manager.set_engine(args.engine, args.model, args.device)
+    try:
+        text = manager.transcribe(args.audio, args.language)
+        result = {"text": text, "duration": round(time.time() - start, 2)}
+        if args.timestamps:
+            result["segments"] = manager.get_segments() or []
+    finally:
+        manager.cleanup()
+
+    if args.output:
+        Path(args.output).write_text(result["text"], encoding="utf-8")
+        result["output"] = args.output
+    _emit(result)
+    return 0
+
+
+def cmd_zip(args) -> int:
+    from data_manager.MemoryManager import MemoryManager
+    from zip.ZIPConvertor import ZIPConvertor
+
+    text = _read_text(args)
+    if not text:
+        raise ValueError("No text provided.")
+
+    MemoryManager.set("tts_service", args.service)
+    MemoryManager.set("tts_lang", args.lang)
+    MemoryManager.set("tts_voice", args.voice)
+    for key, value in _effect_settings(args).items():
+        MemoryManager.set(key, value)
+
+    start = time.time()
+    result = ZIPConvertor(Path(args.output)).export(text, args.format.lower(), zip_name=args.name)
+    _emit({"output": str(result), "duration": round(time.time() - start, 2)})
+    return 0
+
+
+def cmd_batch(args) -> int:
+    from batch.BatchJob import BatchJob
+    from batch.BatchQueue import BatchQueue
+
+    defaults = {
+        "service": args.service, "lang": args.lang, "voice": args.voice,
+        "fmt": args.format.lower(), "settings": _effect_settings(args)
+    }
+    source = Path(args.source)
+    if source.is_dir():
+        jobs = BatchJob.from_directory(source, pattern=args.pattern, **defaults)
+    else:
+        jobs = BatchJob.from_manifest(source, **defaults)
+
+    queue = BatchQueue(jobs, Path(args.output), max_workers=args.workers, progress_cb=_progress(args.quiet))
+    summary = queue.run()
+    _emit(summary)
+    return 0 if summary["failed"] == 0 else 1
+
+
+def _add_tts_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--service", choices=["google", "edge"], default="google")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--voice", default="female")
+    parser.add_argument("--format", default="mp3", choices=["mp3", "wav", "webm", "flac", "aac"])
+    parser.add_argument("-o", "--output", default="output")
+    parser.add_argument("--pitch", type=float, default=EFFECT_DEFAULTS["pitch"])
+    parser.add_argument("--speed", type=float, default=EFFECT_DEFAULTS["speed"])
+    parser.add_argument("--volume", type=float, default=EFFECT_DEFAULTS["volume"])
+    parser.add_argument("--echo", action="store_true")
+    parser.add_argument("--reverb", action="store_true")
+    parser.add_argument("--robot", action="store_true")
+
+
+def _add_text_args(parser: argparse.ArgumentParser):
+    parser.add_argument("text", nargs="?", help="Text to synthesize")
+    parser.add_argument("-i", "--input", help="Read text from a file ('-' for stdin)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="zerotodev", description="Zero to Dev headless TTS/STT tools")
+    parser.add_argument("--log-mode", default="ERROR", choices=["INFO", "DEBUG", "ERROR"])
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print progress to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert = sub.add_parser("convert", help="Synthesize text to an audio file")
+    _add_text_args(convert)
+    _add_tts_args(convert)
+    convert.add_argument("--name", help="Output file name without extension")
+    convert.set_defaults(func=cmd_convert)
+
+    transcribe = sub.add_parser("transcribe", help="Transcribe an audio file")
+    transcribe.add_argument("audio")
+    transcribe.add_argument("--engine", choices=["whisper", "vosk"], default="whisper")
+    transcribe.add_argument("--model", default="base")
+    transcribe.add_argument("--device", default="cpu")
+    transcribe.add_argument("--language", default="auto")
+    transcribe.add_argument("--timestamps", action="store_true")
+    transcribe.add_argument("--config", default="stt/stt-config.json")
+    transcribe.add_argument("-o", "--output", help="Write the transcript to this file")
+    transcribe.set_defaults(func=cmd_transcribe)
+
+    zip_cmd = sub.add_parser("zip", help="Export a ZIP package")
+    _add_text_args(zip_cmd)
+    _add_tts_args(zip_cmd)
+    zip_cmd.add_argument("--name", default="tts_package.zip")
+    zip_cmd.set_defaults(func=cmd_zip)
+
+    batch = sub.add_parser("batch", help="Convert a directory of .txt files or a JSONL manifest")
+    batch.add_argument("source")
+    _add_tts_args(batch)
+    batch.add_argument("--workers", type=int, default=2)
+    batch.add_argument("--pattern", default="*.txt")
+    batch.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    _init_logs(args.log_mode)
+    _init_ffmpeg()
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
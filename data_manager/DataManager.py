@@ -56,12 +56,20 @@ class DataManager:
         return buf.read()
 
     @staticmethod
-    def save_to_file(audio: AudioSegment, fmt: str, out_dir: Path) -> Path:
-        date_str = datetime.now().strftime("%m-%d-%Y").replace('-0', '-').replace('/0', '/')
-        unique_id = uuid.uuid4().hex[:8]
-        filename = f"tts_{date_str}_{unique_id}.{fmt.lower()}"
+    def output_path(fmt: str, out_dir: Path, filename: str = None) -> Path:
+        if filename:
+            filename = f"{filename}.{fmt.lower()}"
+        else:
+            date_str = datetime.now().strftime("%m-%d-%Y").replace('-0', '-').replace('/0', '/')
+            unique_id = uuid.uuid4().hex[:8]
+            filename = f"tts_{date_str}_{unique_id}.{fmt.lower()}"
         out_path = out_dir / filename
         out_path.parent.mkdir(parents=True, exist_ok=True)
+        return out_path
+
+    @staticmethod
+    def save_to_file(audio: AudioSegment, fmt: str, out_dir: Path, filename: str = None) -> Path:
+        out_path = DataManager.output_path(fmt, out_dir, filename)
         audio.export(str(out_path), format=fmt.lower())
         return out_path
 
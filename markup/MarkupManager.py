@@ -1,16 +1,44 @@
 # -*- coding: utf-8 -*-
-import re
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from io import BytesIO
 from pydub import AudioSegment
 
+from audio_dsp.PCMBuffer import PCMBuffer
+from audio_dsp.TimeStretch import TimeStretch
 from data_manager.MemoryManager import MemoryManager
-from markup.MarkupManagerUtility import MarkupManagerUtility
+from markup.MarkupManagerTags import MarkupManagerTags
+from markup.MarkupManagerUtility import MarkupManagerUtility, TTSToken
+from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
 from markup.VoiceCharacterManager import VoiceCharacterManager
 from markup.utils.SayAsTagManager import SayAsTagManager
 
 
+@dataclass
+class MarkupSegment:
+    index: int
+    kind: str
+    text: str = ""
+    attrs: dict = field(default_factory=dict)
+    silence_ms: int = 0
+    chars: int = 0
+    transforms: list = field(default_factory=list)
+    synth_seconds: float = 0.0
+
+
 class MarkupManager:
+    DEFAULT_MAX_WORKERS = 6
+    AUDIO_TRANSFORMS = (
+        MarkupManagerTags.EMPHASIS.name,
+        MarkupManagerTags.STYLE.name,
+        MarkupManagerTags.PROSODY.name
+    )
+
     def __init__(self, tts_service, default_format="mp3"):
         self.tts_service = tts_service
         self.format = default_format
@@ -21,130 +49,195 @@ class MarkupManager:
         self.sayas_manager = SayAsTagManager(locale)
 
 
-    def synthesize_with_markup(self, text: str, progress_cb=None) -> bytes:
-        if not text or not text.strip():
-            raise ValueError("Empty text provided to MarkupManager.")
-
-        tokens = self.parser.parse(text)
-        self.parser.debug_tokens(tokens)
-
-        combined = AudioSegment.silent(duration=0)
-        pos = 0
+    def _collect_segments(self, root: TTSToken) -> list[MarkupSegment]:
+        segments = []
+
+        def add(kind: str, seg_text: str = "", attrs: dict = None, transforms: list = None,
+                silence_ms: int = 0, chars: int = 0):
+            segments.append(MarkupSegment(
+                len(segments), kind, seg_text, attrs or {}, silence_ms, chars, list(transforms or [])
+            ))
+
+        def walk(node: TTSToken, transforms: list):
+            kind, attrs = transforms[-1] if transforms else ("plain", {})
+            for child in node.children:
+                if child.type == "text":
+                    value = child.value.strip()
+                    if value:
+                        add(kind, value, attrs, transforms, chars=len(value))
+
+                elif child.type == MarkupManagerTags.BREAK.name:
+                    add("break", silence_ms=child.attrs["time"])
+
+                elif child.type == MarkupManagerTags.SAY_AS.name:
+                    inner = child.inner_text().strip()
+                    if inner:
+                        interpret_as = child.attrs["interpret-as"]
+                        transformed = self.sayas_manager.interpret(inner, interpret_as)
+                        add("say-as", transformed, child.attrs, transforms, chars=len(inner))
+
+                elif child.type in self.AUDIO_TRANSFORMS:
+                    walk(child, transforms + [(child.type, child.attrs)])
+
+                else:
+                    walk(child, transforms)
+
+        walk(root, [])
+        return segments
+
+    def _synthesize_segment(self, segment: MarkupSegment) -> bytes:
+        start = time.time()
+        raw = self.tts_service.synthesize_to_bytes(segment.text)
+        segment.synth_seconds = time.time() - start
+        return raw
+
+    def _render_segment(self, segment: MarkupSegment, raw: bytes) -> AudioSegment:
+        audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
+        for name, attrs in reversed(segment.transforms):
+            if name == MarkupManagerTags.EMPHASIS.name:
+                audio = self._apply_emphasis(audio, attrs["level"])
+            elif name == MarkupManagerTags.STYLE.name:
+                audio = self._apply_style(audio, attrs["type"])
+            elif name == MarkupManagerTags.PROSODY.name:
+                audio = self._apply_prosody(audio, attrs)
+        return audio
 
-        pattern = re.compile(
-            r'(<(emphasis|prosody|style|say-as).*?>.*?</\2>|<break.*?>)',
-            re.DOTALL | re.IGNORECASE
+    @staticmethod
+    def _chain(synth_future: Future, post_pool: ThreadPoolExecutor, work, done: Future):
+        # synth -> post-process edge of the task graph: a segment's decode and
+        # transform start as soon as its own synthesis finishes, on the CPU pool.
+        def forward(post: Future):
+            if post.cancelled():
+                done.cancel()
+            elif post.exception() is not None:
+                done.set_exception(post.exception())
+            else:
+                done.set_result(post.result())
+
+        def on_synth_done(f: Future):
+            if done.cancelled():
+                return
+            if f.cancelled():
+                done.cancel()
+                return
+            if f.exception() is not None:
+                done.set_exception(f.exception())
+                return
+            try:
+                post_pool.submit(work, f.result()).add_done_callback(forward)
+            except RuntimeError as e:
+                done.set_exception(e)
+
+        synth_future.add_done_callback(on_synth_done)
+
+    def _segment_key(self, segment: MarkupSegment, voice: str) -> str:
+        return json.dumps([voice, segment.text, segment.transforms], sort_keys=True, ensure_ascii=False)
+
+    def _group_segments(self, segments: list[MarkupSegment]) -> dict:
+        # Identical (voice, text, transform chain) segments share one render.
+        voice_key = getattr(self.tts_service, "voice_key", None)
+        voice = voice_key() if voice_key else type(self.tts_service).__name__
+        groups = {}
+        for segment in segments:
+            if segment.kind != "break":
+                groups.setdefault(self._segment_key(segment, voice), []).append(segment)
+        return groups
+
+    def _run_graph(self, groups: dict, on_done=None) -> dict:
+        max_workers = max(1, int(MemoryManager.get("markup_max_workers", self.DEFAULT_MAX_WORKERS)))
+        post_workers = max(1, min(max_workers, os.cpu_count() or 1))
+        synth_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="markup-synth")
+        post_pool = ThreadPoolExecutor(max_workers=post_workers, thread_name_prefix="markup-post")
+
+        pending = {}
+        results = {}
+        try:
+            for members in groups.values():
+                lead = members[0]
+                done = Future()
+                synth_future = synth_pool.submit(self._synthesize_segment, lead)
+                self._chain(synth_future, post_pool, lambda raw, seg=lead: self._render_segment(seg, raw), done)
+                pending[done] = members
+
+            for done in as_completed(pending):
+                audio = done.result()
+                members = pending[done]
+                for segment in members:
+                    results[segment.index] = audio
+                if on_done:
+                    on_done(members)
+        finally:
+            synth_pool.shutdown(wait=False, cancel_futures=True)
+            post_pool.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def _concat(self, segments: list[MarkupSegment], results: dict) -> PCMBuffer:
+        rendered = [a for a in results.values() if a is not None]
+        if not rendered:
+            buffer = PCMBuffer.like(AudioSegment.silent(duration=0))
+            buffer.append_silence(sum(s.silence_ms for s in segments))
+            return buffer
+
+        buffer = PCMBuffer(
+            max(a.frame_rate for a in rendered),
+            max(a.channels for a in rendered),
+            max(a.sample_width for a in rendered)
         )
+        buffer.reserve_ms(sum(len(a) for a in rendered) + sum(s.silence_ms for s in segments))
 
-        total_len = len(text.strip())
-        processed_len = 0
+        for segment in segments:
+            audio = results.get(segment.index)
+            if audio is None:
+                buffer.append_silence(segment.silence_ms)
+            else:
+                buffer.append(audio)
+        return buffer
 
-        def update_progress(local_msg: str = ""):
-            if progress_cb:
-                pct = min(100, int((processed_len / total_len) * 100))
-                progress_cb(pct, f"Processing markup… {pct}% {local_msg}")
-
-        for match in pattern.finditer(text):
-            start, end = match.span()
-
-            plain = text[pos:start]
-            if plain and plain.strip():
-                raw = self.tts_service.synthesize_to_bytes(plain.strip())
-                audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
-                combined += audio
-                processed_len += len(plain.strip())
-                update_progress("plain segment")
-
-            seg = match.group(0)
-            if not seg or not seg.strip():
-                pos = end
-                continue
-
-            if "<break" in seg:
-                ms = self._parse_duration(seg)
-                combined += AudioSegment.silent(duration=ms)
-
-            elif "<emphasis" in seg:
-                inner = self._extract_inner(seg)
-                if inner:
-                    raw = self.tts_service.synthesize_to_bytes(inner)
-                    audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
-                    level = self._get_attr(seg, "level", "moderate")
-                    combined += self._apply_emphasis(audio, level)
-                    processed_len += len(inner.strip())
-                    update_progress(f"emphasis:{level}")
-
-            elif "<style" in seg:
-                inner = self._extract_inner(seg)
-                if inner:
-                    raw = self.tts_service.synthesize_to_bytes(inner)
-                    audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
-                    style = self._get_attr(seg, "type", "neutral")
-                    combined += self._apply_style(audio, style)
-                    processed_len += len(inner.strip())
-                    update_progress(f"style:{style}")
-
-            elif "<prosody" in seg:
-                inner = self._extract_inner(seg)
-                if inner:
-                    raw = self.tts_service.synthesize_to_bytes(inner)
-                    audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
-                    rate = self._get_attr(seg, "rate", "1.0")
-                    pitch = self._get_attr(seg, "pitch", "0")
-                    combined += self._apply_prosody(audio, {"rate": rate, "pitch": pitch})
-                    processed_len += len(inner.strip())
-                    update_progress(f"prosody")
-
-            elif "<say-as" in seg:
-                inner = self._extract_inner(seg)
-                if inner:
-                    interpret_as = self._get_attr(seg, "interpret-as", "text")
-                    transformed = self.sayas_manager.interpret(inner, interpret_as)
-
-                    raw = self.tts_service.synthesize_to_bytes(transformed)
-                    audio = AudioSegment.from_file(BytesIO(raw), format=self.format)
-                    combined += audio
-                    processed_len += len(inner.strip())
-                    update_progress(f"say-as:{interpret_as}")
-
-            pos = end
-
-        if pos < len(text):
-            plain = text[pos:]
-            if plain and plain.strip():
-                raw = self.tts_service.synthesize_to_bytes(plain.strip())
-                combined += AudioSegment.from_file(BytesIO(raw), format=self.format)
-                processed_len += len(plain.strip())
-                update_progress("final segment")
-
-        update_progress("complete")
-
-        buf = BytesIO()
-        combined.export(buf, format=self.format)
-        buf.seek(0)
-        return buf.read()
-
-    def _extract_inner(self, seg: str) -> str:
-        inner = re.sub(r"<.*?>", "", seg)
-        return inner.strip()
-
-    def _parse_duration(self, seg: str) -> int:
-        dur = re.search(r'time="(.*?)"', seg)
-        if not dur:
-            return 1000
-        val = dur.group(1).strip().lower()
-        if val.endswith("ms"):
-            return int(float(val[:-2]))
-        if val.endswith("s"):
-            return int(float(val[:-1]) * 1000)
-        try:
-            return int(float(val) * 1000)
-        except ValueError:
-            return 1000
+    def synthesize_with_markup(self, text: str, progress_cb=None) -> bytes:
+        if not text or not text.strip():
+            raise ValueError("Empty text provided to MarkupManager.")
 
-    def _get_attr(self, text: str, attr: str, default: str) -> str:
-        match = re.search(rf'{attr}="(.*?)"', text)
-        return match.group(1) if match else default
+        start_time = time.time()
+        segments = self._collect_segments(self.parser.parse(text))
+        groups = self._group_segments(segments)
+        spoken = sum(len(members) for members in groups.values())
+        reused = spoken - len(groups)
+        hit_rate = round(reused / spoken, 3) if spoken else 0.0
+        total_len = max(1, sum(s.chars for s in segments))
+        state = {"processed": 0, "done": 0}
+        progress_lock = threading.Lock()
+
+        def update_progress(members: list[MarkupSegment]):
+            with progress_lock:
+                state["processed"] += sum(s.chars for s in members)
+                state["done"] += len(members)
+                pct = min(100, int((state["processed"] / total_len) * 100))
+                done = state["done"]
+            if progress_cb:
+                segment = members[0]
+                label = segment.kind if segment.kind == "plain" else f"{segment.kind}:{next(iter(segment.attrs.values()), '')}"
+                reuse = f", {reused} reused ({int(hit_rate * 100)}%)" if reused else ""
+                progress_cb(pct, f"Processing markup… {pct}% {label} ({done}/{spoken}{reuse})")
+
+        results = self._run_graph(groups, update_progress)
+        combined = self._concat(segments, results)
+
+        if progress_cb:
+            progress_cb(100, "Processing markup… 100% complete")
+
+        synth_total = sum(s.synth_seconds for s in segments)
+        LogsHelperManager.log_performance(self.logger, "MARKUP_RENDERED", time.time() - start_time, {
+            "segments": len(segments),
+            "unique_segments": len(groups),
+            "dedup_hits": reused,
+            "dedup_hit_rate": hit_rate,
+            "synth_seconds_total": round(synth_total, 3),
+            "synth_seconds_max": round(max((s.synth_seconds for s in segments), default=0.0), 3),
+            "audio_seconds": round(combined.duration_ms / 1000.0, 2)
+        })
+
+        return combined.export(self.format)
 
     def _apply_emphasis(self, audio: AudioSegment, level: str) -> AudioSegment:
         if level == "strong":
@@ -157,13 +250,4 @@ class MarkupManager:
         return self.character_manager.apply(audio, style)
 
     def _apply_prosody(self, audio: AudioSegment, attrs: dict) -> AudioSegment:
-        rate = float(attrs.get("rate", 1.0))
-        pitch = float(attrs.get("pitch", 0))
-        new_frame_rate = int(audio.frame_rate * rate)
-        modified = audio._spawn(audio.raw_data, overrides={"frame_rate": new_frame_rate})
-        modified = modified.set_frame_rate(audio.frame_rate)
-        if pitch > 0:
-            modified += pitch * 1.5
-        elif pitch < 0:
-            modified -= abs(pitch) * 1.5
-        return modified
+        return TimeStretch.apply_segment(audio, speed=attrs["rate"], semitones=attrs["pitch"])
@@ -34,6 +34,13 @@ class MarkupManagerTags:
         description="Adds emotional tone to the speech such as happy, sad, angry."
     )
 
+    STYLE = MarkupTag(
+        name="style",
+        has_inner_text=True,
+        default_attrs={"type": "neutral"},
+        description="Renders the text with a voice character style such as radio or storyteller."
+    )
+
     PROSODY = MarkupTag(
         name="prosody",
         has_inner_text=True,
@@ -52,6 +59,7 @@ class MarkupManagerTags:
         EMPHASIS.name: EMPHASIS,
         BREAK.name: BREAK,
         EMOTION.name: EMOTION,
+        STYLE.name: STYLE,
         PROSODY.name: PROSODY,
         SAY_AS.name: SAY_AS
     }
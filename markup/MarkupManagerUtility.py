@@ -1,64 +1,192 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from markup.MarkupManagerTags import MarkupManagerTags
 from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
 
+TAG_NAME_PATTERN = re.compile(r"(/?)([A-Za-z][\w-]*)(?=[\s/]|$)")
+ATTR_PATTERN = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'/>]+))""")
+
 
 @dataclass
 class TTSToken:
     type: str
     value: str = ""
     attrs: dict = field(default_factory=dict)
+    children: list = field(default_factory=list)
+
+    def inner_text(self) -> str:
+        if self.type == "text":
+            return self.value
+        return "".join(child.inner_text() for child in self.children)
 
 
 class MarkupManagerUtility:
+    CACHE_SIZE = 32
+    _cache: "OrderedDict[str, TTSToken]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def __init__(self):
         self.logger = LogsManager.get_logger("MarkupManagerUtility")
-        supported_tags = "|".join(MarkupManagerTags.list_supported_tags())
-        self.TAG_PATTERN = re.compile(
-            rf"<({supported_tags})(.*?)>(.*?)</\1>|<({supported_tags})(.*?)\/>",
-            re.DOTALL | re.IGNORECASE
-        )
-
-    def parse(self, text: str) -> list[TTSToken]:
-        tokens = []
-        last_end = 0
-
-        for match in self.TAG_PATTERN.finditer(text):
-            start, end = match.span()
-            if start > last_end:
-                tokens.append(TTSToken("text", text[last_end:start]))
 
-            tag_name = (match.group(1) or match.group(4) or "").lower()
-            attrs = self._parse_attrs(match.group(2) or match.group(5))
-            inner = match.group(3) or ""
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
-            tokens.append(TTSToken(tag_name, inner.strip(), attrs))
-            last_end = end
+    def parse(self, text: str) -> TTSToken:
+        key = self._cache_key(text)
+        with self._cache_lock:
+            root = self._cache.get(key)
+            if root is not None:
+                self._cache.move_to_end(key)
+                LogsHelperManager.log_debug(self.logger, "MARKUP_PARSE_CACHE_HIT", {"raw_length": len(text)})
+                return root
 
-        if last_end < len(text):
-            tokens.append(TTSToken("text", text[last_end:]))
+        root = self.tokenize(text)
+        with self._cache_lock:
+            self._cache[key] = root
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
 
         LogsHelperManager.log_debug(self.logger, "MARKUP_PARSED", {
-            "tokens": len(tokens),
+            "tokens": self.count_tokens(root),
             "raw_length": len(text)
         })
-        return tokens
-
-    def _parse_attrs(self, raw_attrs: str) -> dict:
-        attrs = {}
-        for part in raw_attrs.split():
-            if "=" in part:
-                k, v = part.split("=", 1)
-                attrs[k.strip()] = v.strip('"\'')
+        self.debug_tokens(root)
+        return root
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def tokenize(self, text: str) -> TTSToken:
+        # Single left-to-right scan. Supported tags open/close nodes on a
+        # stack; anything else, including tags with unknown names, stays
+        # literal text. A closing tag with no matching open element is
+        # dropped.
+        root = TTSToken("root")
+        stack = [root]
+        buf = []
+        pos = 0
+        gt = -1
+        length = len(text)
+
+        def flush_text():
+            if buf:
+                value = "".join(buf)
+                buf.clear()
+                siblings = stack[-1].children
+                if siblings and siblings[-1].type == "text":
+                    siblings[-1].value += value
+                else:
+                    siblings.append(TTSToken("text", value))
+
+        while pos < length:
+            lt = text.find("<", pos)
+            if lt < 0:
+                buf.append(text[pos:])
+                break
+            if lt > pos:
+                buf.append(text[pos:lt])
+
+            # Reuse the last '>' while it is still ahead, so runs of stray '<'
+            # do not rescan the same stretch of text.
+            if gt <= lt:
+                gt = text.find(">", lt + 1)
+            if gt < 0:
+                buf.append(text[lt:])
+                break
+            name_match = TAG_NAME_PATTERN.match(text, lt + 1, gt)
+            if not name_match:
+                buf.append("<")
+                pos = lt + 1
+                continue
+
+            name = name_match.group(2).lower()
+            tag = MarkupManagerTags.get_tag(name)
+            if tag is None:
+                buf.append("<")
+                pos = lt + 1
+                continue
+
+            closing = bool(name_match.group(1))
+            body = text[name_match.end():gt]
+            pos = gt + 1
+
+            flush_text()
+            if closing:
+                open_names = [node.type for node in stack[1:]]
+                if name in open_names:
+                    # Close the innermost open element of that name only.
+                    idx = len(open_names) - 1 - open_names[::-1].index(name)
+                    del stack[idx + 1:]
+                continue
+
+            self_closing = body.rstrip().endswith("/")
+            node = TTSToken(name, attrs=self._parse_attrs(name, body.rstrip().rstrip("/")))
+            stack[-1].children.append(node)
+            if tag.has_inner_text and not self_closing:
+                stack.append(node)
+
+        flush_text()
+        return root
+
+    def _parse_attrs(self, name: str, raw_attrs: str) -> dict:
+        tag = MarkupManagerTags.get_tag(name)
+        attrs = dict(tag.default_attrs or {})
+        for match in ATTR_PATTERN.finditer(raw_attrs):
+            value = match.group(2)
+            if value is None:
+                value = match.group(3) if match.group(3) is not None else match.group(4)
+            attrs[match.group(1).lower()] = value.strip()
+
+        if name == MarkupManagerTags.BREAK.name:
+            attrs["time"] = self.parse_duration(attrs.get("time"))
+        elif name == MarkupManagerTags.PROSODY.name:
+            attrs["rate"] = self._parse_float(attrs.get("rate"), 1.0)
+            attrs["pitch"] = self._parse_float(str(attrs.get("pitch", "")).lower().removesuffix("st"), 0.0)
+        elif name in (MarkupManagerTags.EMPHASIS.name, MarkupManagerTags.STYLE.name, MarkupManagerTags.EMOTION.name):
+            for key in ("level", "type"):
+                if key in attrs:
+                    attrs[key] = attrs[key].lower()
         return attrs
 
-    def debug_tokens(self, tokens: list[TTSToken]):
-        for t in tokens:
+    @staticmethod
+    def _parse_float(value, default: float) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def parse_duration(value) -> int:
+        if value is None:
+            return 1000
+        val = str(value).strip().lower()
+        try:
+            if val.endswith("ms"):
+                return int(float(val[:-2]))
+            if val.endswith("s"):
+                return int(float(val[:-1]) * 1000)
+            return int(float(val) * 1000)
+        except ValueError:
+            return 1000
+
+    @classmethod
+    def count_tokens(cls, node: TTSToken) -> int:
+        return sum(1 + cls.count_tokens(child) for child in node.children)
+
+    def debug_tokens(self, node: TTSToken, depth: int = 0):
+        for t in node.children:
             LogsHelperManager.log_debug(self.logger, "TOKEN", {
                 "type": t.type,
+                "depth": depth,
                 "value": t.value[:50],
                 "attrs": t.attrs
             })
+            self.debug_tokens(t, depth + 1)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from pydub import AudioSegment
 from pydub.effects import low_pass_filter, high_pass_filter
+from audio_dsp.PCMBuffer import PCMBuffer
+from audio_dsp.TimeStretch import TimeStretch
 from logs_manager.LogsManager import LogsManager
 
 
@@ -61,13 +63,14 @@ class VoiceCharacterManager:
 
 
         if profile["tempo_shift"] != 1.0:
-            new_rate = int(audio.frame_rate * profile["tempo_shift"])
-            audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_rate})
-            audio = audio.set_frame_rate(44100)
+            audio = TimeStretch.apply_segment(audio, speed=profile["tempo_shift"])
 
 
-        pause = AudioSegment.silent(duration=profile["pause"])
-        audio = audio + pause
+        pause_bytes = int(audio.frame_rate * profile["pause"] / 1000.0) * audio.frame_width
+        buffer = PCMBuffer.like(audio, capacity_bytes=len(audio.raw_data) + pause_bytes)
+        buffer.append(audio)
+        buffer.append_silence(profile["pause"])
+        audio = buffer.to_segment()
 
         self.logger.debug(f"[Style] {style} applied → {profile}")
         return audio
@@ -5,6 +5,7 @@ from media_formats.BaseFormat import BaseFormat
 class AAC(BaseFormat):
     extension = "aac"
     mime_type = "audio/aac"
+    ffmpeg_format = "adts"
 
     def export(self, out_dir: Path) -> Path:
-        return self.save(out_dir, override_format="adts")
+        return self.save(out_dir, override_format=self.ffmpeg_format)
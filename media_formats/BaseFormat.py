@@ -7,9 +7,11 @@ from data_manager.DataManager import DataManager
 class BaseFormat(ABC):
     extension: str = None
     mime_type: str = None
+    ffmpeg_format: str = None
 
-    def __init__(self, audio: AudioSegment):
+    def __init__(self, audio: AudioSegment, filename: str = None):
         self.audio = audio
+        self.filename = filename
 
     @abstractmethod
     def export(self, out_dir: Path) -> Path:
@@ -17,10 +19,14 @@ class BaseFormat(ABC):
 
     def save(self, out_dir: Path, override_format: str = None) -> Path:
         fmt = override_format or self.extension
-        return DataManager.save_to_file(self.audio, fmt, out_dir)
+        return DataManager.save_to_file(self.audio, fmt, out_dir, filename=self.filename)
 
     def get_extension(self) -> str:
         return self.extension
 
     def get_mime_type(self) -> str:
         return self.mime_type
+
+    @classmethod
+    def get_ffmpeg_format(cls) -> str:
+        return cls.ffmpeg_format or cls.extension
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from typing import Dict, Type
+
+from media_formats.AAC import AAC
+from media_formats.BaseFormat import BaseFormat
+from media_formats.FLAC import FLAC
+from media_formats.MP3 import MP3
+from media_formats.WAV import WAV
+from media_formats.WEBM import WEBM
+
+FORMAT_MAP: Dict[str, Type[BaseFormat]] = {
+    "MP3": MP3,
+    "WAV": WAV,
+    "WEBM": WEBM,
+    "FLAC": FLAC,
+    "AAC": AAC
+}
+
+
+def get_format_class(name: str) -> Type[BaseFormat]:
+    fmt_class = FORMAT_MAP.get((name or "").upper())
+    if not fmt_class:
+        raise ValueError(f"Unknown format: {name}")
+    return fmt_class
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import List, Dict, Any
+
+import numpy as np
+
+
+@dataclass
+class AudioWindow:
+    index: int
+    start: int
+    end: int
+    core_start: int
+    core_end: int
+
+
+class AudioWindowPlanner:
+    FRAME_SECONDS = 0.03
+    MIN_SILENCE_SECONDS = 0.3
+    MIN_SPEECH_RMS = 10 ** (-45 / 20)
+
+    @classmethod
+    def speech_mask(cls, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        # Energy VAD on 30 ms frames. The threshold tracks the recording's own
+        # noise floor, but never drops below -45 dBFS.
+        frame = max(1, int(sample_rate * cls.FRAME_SECONDS))
+        count = len(audio) // frame
+        if not count:
+            return np.zeros(0, dtype=bool)
+        rms = np.empty(count, dtype=np.float32)
+        block = 1 << 14
+        for i in range(0, count, block):
+            chunk = audio[i * frame:min(count, i + block) * frame].reshape(-1, frame)
+            rms[i:i + len(chunk)] = np.sqrt(np.mean(np.square(chunk, dtype=np.float32), axis=1))
+        floor = float(np.percentile(rms, 10))
+        threshold = max(cls.MIN_SPEECH_RMS, min(floor * 3.0, float(np.percentile(rms, 50))))
+        return rms > threshold
+
+    @classmethod
+    def silence_cuts(cls, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        # Sample positions at the middle of every pause long enough to cut on.
+        mask = cls.speech_mask(audio, sample_rate)
+        if not len(mask):
+            return np.zeros(0, dtype=np.int64)
+        frame = max(1, int(sample_rate * cls.FRAME_SECONDS))
+        edges = np.diff(np.concatenate(([1], mask.astype(np.int8), [1])))
+        starts = np.flatnonzero(edges == -1)
+        ends = np.flatnonzero(edges == 1)
+        long_enough = (ends - starts) * cls.FRAME_SECONDS >= cls.MIN_SILENCE_SECONDS
+        return ((starts[long_enough] + ends[long_enough]) // 2 * frame).astype(np.int64)
+
+    @classmethod
+    def plan(cls, audio: np.ndarray, sample_rate: int, target_seconds: float = 60.0,
+             max_seconds: float = 90.0, overlap_seconds: float = 1.5) -> List[AudioWindow]:
+        total = len(audio)
+        target = int(target_seconds * sample_rate)
+        longest = max(target, int(max_seconds * sample_rate))
+        shortest = target // 2
+        overlap = int(overlap_seconds * sample_rate)
+
+        cuts = cls.silence_cuts(audio, sample_rate) if total > longest else np.zeros(0, dtype=np.int64)
+        bounds = [0]
+        while total - bounds[-1] > longest:
+            pos = bounds[-1]
+            lo = np.searchsorted(cuts, pos + shortest)
+            hi = np.searchsorted(cuts, pos + longest, side="right")
+            candidates = cuts[lo:hi]
+            if len(candidates):
+                bounds.append(int(candidates[np.argmin(np.abs(candidates - (pos + target)))]))
+            else:
+                bounds.append(pos + longest)
+        bounds.append(total)
+
+        return [
+            AudioWindow(i, max(0, start - overlap), min(total, end + overlap), start, end)
+            for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    @staticmethod
+    def stitch(windows: List[AudioWindow], results: List[Dict[str, Any]], sample_rate: int) -> Dict[str, Any]:
+        # Window-relative timestamps are shifted to absolute time. A segment
+        # transcribed in the overlap of two windows is kept only by the window
+        # whose core range contains its midpoint.
+        segments = []
+        for window, result in zip(windows, results):
+            offset = window.start / sample_rate
+            core_start = window.core_start / sample_rate
+            core_end = window.core_end / sample_rate
+            last = window.index == len(windows) - 1
+            for segment in result.get("segments", []):
+                start = segment["start"] + offset
+                end = segment["end"] + offset
+                middle = (start + end) / 2
+                if middle < core_start or (middle >= core_end and not last):
+                    continue
+                segment = dict(segment, id=len(segments), start=start, end=end)
+                if segment.get("words"):
+                    segment["words"] = [
+                        dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                        for word in segment["words"]
+                    ]
+                segments.append(segment)
+
+        return {
+            "text": " ".join(s.get("text", "").strip() for s in segments if s.get("text", "").strip()),
+            "segments": segments
+        }
@@ -1,10 +1,25 @@
+import os
 import subprocess
-from typing import Dict
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
 from pathlib import Path
 
+from audio_dsp.FFmpegPipe import FFmpegPipe
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
 SUPPORTED_FORMATS = ["wav", "mp3", "m4a", "flac"]
 
 class AudioFormatHandler:
+    PROPERTIES_CACHE_SIZE = 256
+    _properties_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+    _properties_lock = threading.Lock()
+
     def validate_format(self, audio_path: str) -> bool:
         ext = Path(audio_path).suffix.lower().replace('.', '')
         return ext in SUPPORTED_FORMATS
@@ -12,17 +27,67 @@ class AudioFormatHandler:
     def get_file_extension(self, audio_path: str) -> str:
         return Path(audio_path).suffix.lower().replace('.', '')
 
-    def get_audio_properties(self, audio_path: str) -> Dict:
+    @staticmethod
+    def _probe_mutagen(audio_path: str) -> Optional[Dict]:
+        if not MUTAGEN_AVAILABLE:
+            return None
+        try:
+            info = getattr(mutagen.File(audio_path), "info", None)
+        except Exception:
+            return None
+        if info is None or not getattr(info, "length", None):
+            return None
+        return {
+            "sample_rate": int(getattr(info, "sample_rate", 0) or 0),
+            "channels": int(getattr(info, "channels", 0) or 0),
+            "duration_seconds": float(info.length)
+        }
+
+    @staticmethod
+    def _probe_ffprobe(audio_path: str) -> Optional[Dict]:
+        try:
+            info = FFmpegPipe.probe(audio_path)
+        except (OSError, RuntimeError, ValueError):
+            return None
+        if not info.get("duration_seconds"):
+            return None
+        return {
+            "sample_rate": info["sample_rate"],
+            "channels": info["channels"],
+            "duration_seconds": info["duration_seconds"]
+        }
+
+    @staticmethod
+    def _probe_decode(audio_path: str) -> Dict:
         from pydub import AudioSegment
 
         audio = AudioSegment.from_file(audio_path)
         return {
             "sample_rate": audio.frame_rate,
             "channels": audio.channels,
-            "duration_seconds": len(audio) / 1000.0,
-            "duration_minutes": len(audio) / 60000.0
+            "duration_seconds": len(audio) / 1000.0
         }
 
+    def get_audio_properties(self, audio_path: str) -> Dict:
+        # Header-only probes (mutagen in-process, then ffprobe); a full decode
+        # is the last resort. Results are cached per path, mtime and size.
+        stat = os.stat(audio_path)
+        key = (os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size)
+        with self._properties_lock:
+            props = self._properties_cache.get(key)
+            if props is not None:
+                self._properties_cache.move_to_end(key)
+                return dict(props)
+
+        props = self._probe_mutagen(audio_path) or self._probe_ffprobe(audio_path) or self._probe_decode(audio_path)
+        props["duration_minutes"] = props["duration_seconds"] / 60.0
+
+        with self._properties_lock:
+            self._properties_cache[key] = props
+            while len(self._properties_cache) > self.PROPERTIES_CACHE_SIZE:
+                self._properties_cache.popitem(last=False)
+        return dict(props)
+
     def validate_audio_quality(self, audio_path: str) -> bool:
         props = self.get_audio_properties(audio_path)
         return (props["sample_rate"] >= 16000 and
@@ -30,7 +95,6 @@ class AudioFormatHandler:
                 props["duration_seconds"] > 0.1)
 
     def get_file_size_mb(self, audio_path: str) -> float:
-        import os
         size_bytes = os.path.getsize(audio_path)
         return size_bytes / (1024 * 1024)
     def convert_for_vosk(self, audio_path: str) -> bytes:
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from PathHelper import PathHelper
+from data_manager.DiskCache import DiskCache
+from data_manager.MemoryManager import MemoryManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+
+
+class STTCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    DEFAULT_MAX_MB = 64
+    CACHE_DIR = "cache/stt"
+    VERSION = "1"
+    HASH_BLOCK = 1 << 20
+    FINGERPRINT_MEMO_SIZE = 256
+
+    _fingerprints: "OrderedDict[tuple, str]" = OrderedDict()
+    _fingerprints_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> DiskCache:
+        with cls._lock:
+            if cls._instance is None:
+                max_mb = MemoryManager.get("stt_cache_max_mb", cls.DEFAULT_MAX_MB)
+                cls._instance = DiskCache(
+                    PathHelper.base_dir() / cls.CACHE_DIR,
+                    max_bytes=int(max_mb) * 1024 * 1024,
+                    suffix=".json"
+                )
+            return cls._instance
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(MemoryManager.get("stt_cache_enabled", True))
+
+    @classmethod
+    def fingerprint(cls, audio_input) -> str:
+        # Content hash, so a renamed or copied recording still hits. For paths
+        # the digest is memoized per (path, mtime, size) to avoid rehashing.
+        if isinstance(audio_input, (bytes, bytearray, memoryview)):
+            return hashlib.sha256(audio_input).hexdigest()
+
+        stat = os.stat(audio_input)
+        memo_key = (os.path.abspath(str(audio_input)), stat.st_mtime_ns, stat.st_size)
+        with cls._fingerprints_lock:
+            digest = cls._fingerprints.get(memo_key)
+            if digest is not None:
+                return digest
+
+        hasher = hashlib.sha256()
+        with open(audio_input, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_BLOCK), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+
+        with cls._fingerprints_lock:
+            cls._fingerprints[memo_key] = digest
+            while len(cls._fingerprints) > cls.FINGERPRINT_MEMO_SIZE:
+                cls._fingerprints.popitem(last=False)
+        return digest
+
+    @classmethod
+    def make_key(cls, audio_input, engine: str, model_name: str, language: str, params: dict) -> str:
+        raw = "\x1f".join([
+            cls.VERSION,
+            (engine or "").lower(),
+            str(model_name or ""),
+            language or "auto",
+            json.dumps(params or {}, sort_keys=True, default=str),
+            cls.fingerprint(audio_input)
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _json_default(value):
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        if hasattr(value, "item"):
+            return value.item()
+        return str(value)
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Dict[str, Any]]:
+        data = cls.instance().get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return None
+
+    @classmethod
+    def put(cls, key: str, text: str, segments: Optional[list]):
+        entry = {"text": text, "segments": segments}
+        cls.instance().put(key, json.dumps(entry, ensure_ascii=False, default=cls._json_default).encode("utf-8"))
+
+    @classmethod
+    def set_max_mb(cls, max_mb: int):
+        MemoryManager.set("stt_cache_max_mb", int(max_mb))
+        cls.instance().set_max_bytes(int(max_mb) * 1024 * 1024)
+
+    @classmethod
+    def log_stats(cls, logger, action: str, duration: float, extra: dict = None):
+        data = cls.instance().stats()
+        if extra:
+            data.update(extra)
+        LogsHelperManager.log_performance(logger, action, duration, data)
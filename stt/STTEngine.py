@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Any
 
 
 class STTEngine(ABC):
@@ -16,6 +17,12 @@ class STTEngine(ABC):
     def transcribe(self, audio_path: str, language: str = "auto") -> str:
         pass
 
+    def transcribe_stream(self, audio_input, language: str = "auto", partial_cb=None) -> str:
+        return self.transcribe(audio_input, language)
+
+    def transcribe_with_progress(self, audio_input, language: str = "auto", progress_cb=None) -> str:
+        return self.transcribe(audio_input, language)
+
     @abstractmethod
     def unload(self):
         pass
@@ -31,11 +38,25 @@ class STTEngine(ABC):
     def get_segments(self) -> Optional[list]:
         return None
 
+    def cache_params(self) -> Dict[str, Any]:
+        return {}
+
     def is_loaded(self) -> bool:
         return self._loaded
 
-    def transcribe_batch(self, audio_paths: list, language: str = "auto") -> Dict[str, str]:
-        results = {}
-        for audio_path in audio_paths:
-            results[audio_path] = self.transcribe(audio_path, language)
-        return results
\ No newline at end of file
+    def batch_workers(self) -> int:
+        return 1
+
+    def transcribe_batch(self, audio_paths: list, language: str = "auto", max_workers: Optional[int] = None,
+                         transcribe: Optional[Callable[[str, str], str]] = None) -> Dict[str, str]:
+        run = transcribe or self.transcribe
+        workers = max(1, min(len(audio_paths), max_workers or self.batch_workers()))
+        if workers == 1:
+            return {audio_path: run(audio_path, language) for audio_path in audio_paths}
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt-batch")
+        try:
+            futures = [executor.submit(run, audio_path, language) for audio_path in audio_paths]
+            return {audio_path: future.result() for audio_path, future in zip(audio_paths, futures)}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -1,10 +1,11 @@
 import json
+import time
 from typing import Dict, Any, Optional, List
 
 from PathHelper import PathHelper
+from logs_manager.LogsManager import LogsManager
+from stt.STTCache import STTCache
 from stt.STTEngine import STTEngine
-from stt.stt__models.VoskSTT import VoskSTT
-from stt.stt__models.WhisperSTT import WhisperSTT
 
 
 class STTFactory:
@@ -64,9 +65,11 @@ class STTFactory:
             raise ValueError(f"Model name must be provided for engine '{engine_type}'")
 
         if engine_type.lower() == "whisper":
+            from stt.stt__models.WhisperSTT import WhisperSTT
             return WhisperSTT(model_name, device, config_path)
 
         elif engine_type.lower() == "vosk":
+            from stt.stt__models.VoskSTT import VoskSTT
             return VoskSTT(model_name, device, config_path)
 
         else:
@@ -167,22 +170,89 @@ class STTManager:
         self.factory.load_config(config_path)
         self.current_engine = None
         self.current_engine_type = None
+        self._cached_segments = None
+        self.logger = LogsManager.get_logger("STTManager")
     
     def set_engine(self, engine_type: str, model_name: Optional[str] = None, device: str = "cpu"):
         self.current_engine = self.factory.get_engine(engine_type, model_name, device, self.config_path)
         self.current_engine_type = engine_type
-    
-    def transcribe(self, audio_path: str, language: str = "auto") -> str:
+        self._cached_segments = None
+
+    def _cached_run(self, audio_input, language: str, run, on_hit=None, capture_segments: bool = True) -> tuple:
+        # Returns (text, segments) without touching per-call state, so batch
+        # items can share it across threads.
+        if not STTCache.is_enabled():
+            return run(), None
+
+        start = time.time()
+        engine = self.current_engine
+        try:
+            key = STTCache.make_key(audio_input, self.current_engine_type, engine.model_name,
+                                    language, engine.cache_params())
+        except OSError:
+            return run(), None
+
+        entry = STTCache.get(key)
+        if entry is not None:
+            if on_hit:
+                on_hit(entry["text"])
+            STTCache.log_stats(self.logger, "STT_CACHE_HIT", time.time() - start, {
+                "engine": self.current_engine_type,
+                "model": engine.model_name
+            })
+            return entry["text"], entry.get("segments")
+
+        text = run()
+        segments = engine.get_segments() if capture_segments else None
+        STTCache.put(key, text, segments)
+        return text, segments
+
+    def _transcribe_cached(self, audio_input, language: str, run, on_hit=None) -> str:
         if not self.current_engine:
             raise RuntimeError("No engine set. Use set_engine() first.")
-        
-        return self.current_engine.transcribe(audio_path, language)
+
+        self._cached_segments = None
+        text, self._cached_segments = self._cached_run(audio_input, language, run, on_hit)
+        return text
+    
+    def transcribe(self, audio_path: str, language: str = "auto") -> str:
+        return self._transcribe_cached(
+            audio_path, language,
+            lambda: self.current_engine.transcribe(audio_path, language)
+        )
+
+    def transcribe_with_progress(self, audio_path: str, language: str = "auto", progress_cb=None) -> str:
+        return self._transcribe_cached(
+            audio_path, language,
+            lambda: self.current_engine.transcribe_with_progress(audio_path, language, progress_cb),
+            (lambda text: progress_cb(100, "Loaded from cache")) if progress_cb else None
+        )
+
+    def transcribe_stream(self, audio_input, language: str = "auto", partial_cb=None) -> str:
+        return self._transcribe_cached(
+            audio_input, language,
+            lambda: self.current_engine.transcribe_stream(audio_input, language, partial_cb),
+            (lambda text: partial_cb(text, True)) if partial_cb else None
+        )
     
     def transcribe_batch(self, audio_paths: list, language: str = "auto") -> Dict[str, str]:
         if not self.current_engine:
             raise RuntimeError("No engine set. Use set_engine() first.")
-        
-        return self.current_engine.transcribe_batch(audio_paths, language)
+
+        self._cached_segments = None
+        engine = self.current_engine
+        # Engine segments are per-instance state; they only belong to the item
+        # that just ran when the batch is sequential.
+        sequential = min(len(audio_paths), engine.batch_workers()) <= 1
+
+        def transcribe(audio_path: str, lang: str) -> str:
+            return self._cached_run(
+                audio_path, lang,
+                lambda: engine.transcribe(audio_path, lang),
+                capture_segments=sequential
+            )[0]
+
+        return engine.transcribe_batch(audio_paths, language, transcribe=transcribe)
     
     def get_engine_info(self) -> Dict[str, Any]:
         if not self.current_engine:
@@ -193,7 +263,9 @@ class STTManager:
     def get_segments(self) -> Optional[List[Dict[str, Any]]]:
         if not self.current_engine:
             return None
-        
+
+        if self._cached_segments is not None:
+            return self._cached_segments
         return self.current_engine.get_segments()
     
     def switch_engine(self, engine_type: str, model_name: Optional[str] = None, device: str = "cpu"):
@@ -0,0 +1,93 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+
+class VoskRecognizerPool:
+    # KaldiRecognizer keeps per-utterance decoder state, so one instance must
+    # never be fed by two transcriptions at once. The pool hands out
+    # recognizers built over a single shared vosk.Model (the heavy, read-only
+    # part) and creates at most max_size of them.
+    def __init__(self, factory: Callable, max_size: int):
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, timeout: float = None):
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                if self._idle:
+                    recognizer = self._idle.pop()
+                    self._in_use += 1
+                    self.checkouts += 1
+                    return recognizer
+                if self._created < self.max_size:
+                    self._created += 1
+                    self._in_use += 1
+                    self.checkouts += 1
+                    break
+                self.waits += 1
+                remaining = None if timeout is None else timeout - (time.monotonic() - start)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No Vosk recognizer became available in time.")
+                waited_from = time.monotonic()
+                self._cond.wait(remaining)
+                self.wait_seconds += time.monotonic() - waited_from
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, recognizer, broken: bool = False):
+        with self._cond:
+            self._in_use -= 1
+            if broken:
+                self._created -= 1
+            else:
+                self._idle.append(recognizer)
+            self._cond.notify()
+
+    @contextmanager
+    def recognizer(self, timeout: float = None):
+        recognizer = self.acquire(timeout)
+        broken = False
+        try:
+            yield recognizer
+        except BaseException:
+            try:
+                recognizer.Reset()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(recognizer, broken)
+
+    def close(self):
+        with self._cond:
+            self._created -= len(self._idle)
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3)
+            }
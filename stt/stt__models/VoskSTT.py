@@ -1,13 +1,15 @@
 import os
 import json
-import wave
+import threading
 import warnings
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from PathHelper import PathHelper
+from audio_dsp.FFmpegPipe import FFmpegPipe
 from stt.MediaFormats import AudioFormatHandler
 from stt.STTEngine import STTEngine
+from stt.stt__models.VoskRecognizerPool import VoskRecognizerPool
 
 try:
     import vosk
@@ -18,12 +20,15 @@ except ImportError:
     warnings.warn("Vosk library not installed. Install with: pip install vosk soundfile")
 
 class VoskSTT(STTEngine):
+    CHUNK_FRAMES = 4000
+
     def __init__(self, model_name: Optional[str], device: str = "cpu", config_path="stt/stt-config.json"):
         super().__init__(model_name, device)
         self.config_path = config_path
         self.config = self._load_config()
         self.model = None
-        self.recognizer = None
+        self.pool = None
+        self._load_lock = threading.Lock()
         self.audio_handler = AudioFormatHandler()
         
         if not VOSK_AVAILABLE:
@@ -56,98 +61,99 @@ class VoskSTT(STTEngine):
 
     def load(self):
         try:
-            if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
 
-                model_path = Path(self.model_name)
-                if not model_path.exists():
-                    internal_model_path = PathHelper.resource_path(self.model_name)
+                    model_path = Path(self.model_name)
+                    if not model_path.exists():
+                        internal_model_path = PathHelper.resource_path(self.model_name)
 
-                    if internal_model_path.exists():
-                        model_path = internal_model_path
-                    else:
-                        raise FileNotFoundError(f"Vosk model not found: {self.model_name}")
+                        if internal_model_path.exists():
+                            model_path = internal_model_path
+                        else:
+                            raise FileNotFoundError(f"Vosk model not found: {self.model_name}")
 
-                print(f"Vosk model is loading from: {model_path}")
+                    print(f"Vosk model is loading from: {model_path}")
 
-                self.model = vosk.Model(str(model_path))
-                self.recognizer = vosk.KaldiRecognizer(
-                    self.model,
-                    self.config.get("sample_rate", 16000)
-                )
+                    model = vosk.Model(str(model_path))
+                    sample_rate = self.config.get("sample_rate", 16000)
+                    self.model = model
+                    self.pool = VoskRecognizerPool(
+                        lambda: vosk.KaldiRecognizer(model, sample_rate),
+                        self.config.get("max_recognizers") or os.cpu_count() or 1
+                    )
 
-                self._loaded = True
-                print(f"Vosk model loaded successfully.")
+                    self._loaded = True
+                    print(f"Vosk model loaded successfully.")
 
         except Exception as e:
             raise RuntimeError(f"Vosk model could not be loaded: {str(e)}")
-    
-    def _convert_audio_to_wav(self, audio_path: str) -> str:
-        try:
-            from pydub import AudioSegment
-            
-            audio = AudioSegment.from_file(audio_path)
-
-            audio = audio.set_channels(1)
-            audio = audio.set_frame_rate(self.config.get("sample_rate", 16000))
-
-            temp_wav_path = audio_path.replace('.', '_temp_.')
-            if not temp_wav_path.endswith('.wav'):
-                temp_wav_path += '.wav'
-            
-            audio.export(temp_wav_path, format="wav")
-            return temp_wav_path
-            
-        except Exception as e:
-            raise RuntimeError(f"Audio conversion failed: {str(e)}")
-    
-    def transcribe(self, audio_input, language: str = "auto") -> str:
+
+    def _pcm_source(self, audio_input):
+        if isinstance(audio_input, (str, Path)):
+            if not self.audio_handler.validate_format(str(audio_input)):
+                raise ValueError(f"Unsupported audio format: {audio_input}")
+            return str(audio_input)
+        if isinstance(audio_input, (bytes, bytearray)):
+            return bytes(audio_input)
+        raise ValueError("Audio input must be a file path (str) or bytes")
+
+    def _iter_results(self, recognizer, audio_input, partial_cb=None):
+        # ffmpeg decodes to 16 kHz mono s16le on stdout and the recognizer
+        # consumes it block by block, so recognition starts with the first
+        # block and nothing is written to disk.
+        source = self._pcm_source(audio_input)
+        sample_rate = self.config.get("sample_rate", 16000)
+        chunk_frames = self.config.get("chunk_frames", self.CHUNK_FRAMES)
+        committed = []
+
+        for block in FFmpegPipe.iter_pcm(source, chunk_frames, channels=1, sample_rate=sample_rate):
+            if recognizer.AcceptWaveform(block):
+                result = json.loads(recognizer.Result())
+                if result.get("text"):
+                    committed.append(result["text"])
+                    if partial_cb:
+                        partial_cb(" ".join(committed), True)
+                yield result
+            elif partial_cb:
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial:
+                    partial_cb(" ".join(committed + [partial]), False)
+
+        final_result = json.loads(recognizer.FinalResult())
+        if final_result.get("text") and partial_cb:
+            partial_cb(" ".join(committed + [final_result["text"]]), True)
+        yield final_result
+
+    def transcribe_stream(self, audio_input, language: str = "auto", partial_cb=None) -> str:
         if not self._loaded:
             self.load()
 
-        if isinstance(audio_input, str):
-            if not self.audio_handler.validate_format(audio_input):
-                raise ValueError(f"Unsupported audio format: {audio_input}")
-            wav_path = self._convert_audio_to_wav(audio_input)
-            cleanup_file = wav_path != audio_input
-        elif isinstance(audio_input, bytes):
-            wav_path = self.audio_handler.save_audio_to_temp_file(audio_input)
-            cleanup_file = True
-        else:
-            raise ValueError("Audio input must be a file path (str) or bytes")
-        
         try:
-            with wave.open(wav_path, 'rb') as wf:
-                if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != self.config.get("sample_rate", 16000):
-                    raise ValueError("Audio must be WAV format mono PCM with 16kHz sample rate")
-
-                chunk_size = 4000
-                result_text = ""
-                
-                while True:
-                    data = wf.readframes(chunk_size)
-                    if len(data) == 0:
-                        break
-                    
-                    if self.recognizer.AcceptWaveform(data):
-                        result = json.loads(self.recognizer.Result())
-                        if 'text' in result:
-                            result_text += result['text'] + " "
-
-                final_result = json.loads(self.recognizer.FinalResult())
-                if 'text' in final_result:
-                    result_text += final_result['text']
-            
-            return result_text.strip()
-            
+            with self.pool.recognizer() as recognizer:
+                texts = [r["text"] for r in self._iter_results(recognizer, audio_input, partial_cb) if r.get("text")]
+            return " ".join(texts).strip()
+        except ValueError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {str(e)}")
-        finally:
-            if cleanup_file and os.path.exists(wav_path):
-                os.remove(wav_path)
-    
+
+    def transcribe(self, audio_input, language: str = "auto") -> str:
+        return self.transcribe_stream(audio_input, language)
+
+    def cache_params(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.config.items() if k != "max_recognizers"}
+
+    def batch_workers(self) -> int:
+        if not self._loaded:
+            self.load()
+        return self.pool.max_size
+
     def unload(self):
         if self._loaded:
-            self.recognizer = None
+            if self.pool is not None:
+                self.pool.close()
+            self.pool = None
             self.model = None
             self._loaded = False
     
@@ -171,59 +177,31 @@ class VoskSTT(STTEngine):
     def transcribe_with_alternatives(self, audio_input, language: str = "auto", max_alternatives: int = 3) -> Dict[str, Any]:
         if not self._loaded:
             self.load()
-        if isinstance(audio_input, str):
-            if not self.audio_handler.validate_format(audio_input):
-                raise ValueError(f"Unsupported audio format: {audio_input}")
-            wav_path = self._convert_audio_to_wav(audio_input)
-            cleanup_file = wav_path != audio_input
-        elif isinstance(audio_input, bytes):
-            wav_path = self.audio_handler.save_audio_to_temp_file(audio_input)
-            cleanup_file = True
-        else:
-            raise ValueError("Audio input must be a file path (str) or bytes")
-        
+
         try:
-            
-            try:
-                with wave.open(wav_path, 'rb') as wf:
-                    if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != self.config.get("sample_rate", 16000):
-                        raise ValueError("Audio must be WAV format mono PCM with 16kHz sample rate")
-
-                    self.recognizer.SetMaxAlternatives(max_alternatives)
-
-                    chunk_size = 4000
-                    results = []
-                    
-                    while True:
-                        data = wf.readframes(chunk_size)
-                        if len(data) == 0:
-                            break
-                        
-                        if self.recognizer.AcceptWaveform(data):
-                            result = json.loads(self.recognizer.Result())
-                            results.append(result)
-
-                    final_result = json.loads(self.recognizer.FinalResult())
-                    results.append(final_result)
-
-                combined_text = ""
-                alternatives = []
-                
-                for result in results:
-                    if 'text' in result:
-                        combined_text += result['text'] + " "
-                    if 'alternatives' in result:
-                        alternatives.extend(result['alternatives'])
-                
-                return {
-                    "text": combined_text.strip(),
-                    "alternatives": alternatives[:max_alternatives],
-                    "language": "unknown"
-                }
-                
-            finally:
-                if cleanup_file and os.path.exists(wav_path):
-                    os.remove(wav_path)
-                    
+            with self.pool.recognizer() as recognizer:
+                recognizer.SetMaxAlternatives(max_alternatives)
+                try:
+                    results = list(self._iter_results(recognizer, audio_input))
+                finally:
+                    recognizer.SetMaxAlternatives(0)
+
+            combined_text = ""
+            alternatives = []
+
+            for result in results:
+                if 'text' in result:
+                    combined_text += result['text'] + " "
+                if 'alternatives' in result:
+                    alternatives.extend(result['alternatives'])
+
+            return {
+                "text": combined_text.strip(),
+                "alternatives": alternatives[:max_alternatives],
+                "language": "unknown"
+            }
+
+        except ValueError:
+            raise
         except Exception as e:
-            raise RuntimeError(f"Alternative transcription failed: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Alternative transcription failed: {str(e)}")
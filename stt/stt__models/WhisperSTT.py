@@ -1,14 +1,24 @@
 import json
+import os
+import threading
+import time
 import torch
 import whisper
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List
 
 from PathHelper import PathHelper
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+from stt.AudioWindowPlanner import AudioWindowPlanner, AudioWindow
 from stt.MediaFormats import AudioFormatHandler
 from stt.STTEngine import STTEngine
 
 
 class WhisperSTT(STTEngine):
+    LONG_AUDIO_MIN_SECONDS = 600
+
     def __init__(self, model_name: Optional[str], device: str = "cpu", config_path="stt/stt-config.json"):
         super().__init__(model_name, device)
         self.config_path = config_path
@@ -16,6 +26,12 @@ class WhisperSTT(STTEngine):
         self.model = None
         self.audio_handler = AudioFormatHandler()
         self._last_segments = None
+        self.logger = LogsManager.get_logger("WhisperSTT")
+        self._replicas = []
+        self._idle_replicas = []
+        self._replicas_loading = 0
+        self._replica_generation = 0
+        self._replicas_cond = threading.Condition()
 
     @staticmethod
     def is_cuda_available() -> bool:
@@ -67,46 +83,213 @@ class WhisperSTT(STTEngine):
             if not self._loaded:
                 print(f"Whisper model is loading: {self.model_name}")
                 self.model = whisper.load_model(self.model_name, device=self.device)
+                with self._replicas_cond:
+                    self._replica_generation += 1
+                    self._replicas = [self.model]
+                    self._idle_replicas = [self.model]
+                    self._replicas_cond.notify_all()
                 self._loaded = True
                 print(f"Whisper model {self.model_name} loaded successfully.")
         except Exception as e:
             raise RuntimeError(f"Whisper model could not be loaded: {str(e)}")
     
-    def transcribe(self, audio_path: str, language: str = "auto") -> str:
-        if not self._loaded:
-            self.load()
-        
+    def _param(self, key: str, default):
+        params = self.config.get("engines", {}).get("whisper", {}).get("parameters", {})
+        return params.get(key, default)
+
+    def _validate(self, audio_path: str) -> dict:
         if not self.audio_handler.validate_format(audio_path):
             raise ValueError(f"Unsupported audio format: {audio_path}")
 
         props = self.audio_handler.get_audio_properties(audio_path)
         if props["duration_seconds"] <= 0.1:
             raise ValueError(f"Audio file is too short: {audio_path}\nRequired: >0.1s duration")
-        
-        try:
- 
-            lang = None if language == "auto" else language
-            
+        return props
 
-            result = self.model.transcribe(
-                audio_path,
+    def _is_long(self, props: dict) -> bool:
+        return props["duration_seconds"] >= float(self._param("long_audio_min_seconds", self.LONG_AUDIO_MIN_SECONDS))
+
+    def _run(self, audio_path: str, language: str, word_timestamps: bool, progress_cb=None) -> Dict[str, Any]:
+        if not self._loaded:
+            self.load()
+
+        props = self._validate(audio_path)
+        lang = None if language == "auto" else language
+        # Decode once here and hand the samples to Whisper, which would
+        # otherwise run its own ffmpeg decode on the path.
+        audio = whisper.load_audio(audio_path)
+
+        if self._is_long(props):
+            return self.transcribe_long(audio_path, language, progress_cb, word_timestamps, audio=audio)
+
+        with self._replica() as model:
+            result = model.transcribe(
+                audio,
                 language=lang,
                 temperature=self.config.get("temperature", 0.0),
-                word_timestamps=self.config.get("word_timestamps", False),
+                word_timestamps=word_timestamps,
                 beam_size=self.config.get("beam_size", 5)
             )
+        self._last_segments = result.get("segments", [])
+        return result
 
-            self._last_segments = result.get("segments", [])
-            
+    def transcribe(self, audio_path: str, language: str = "auto") -> str:
+        return self.transcribe_with_progress(audio_path, language)
+
+    def transcribe_with_progress(self, audio_path: str, language: str = "auto", progress_cb=None) -> str:
+        try:
+            result = self._run(audio_path, language, self.config.get("word_timestamps", False), progress_cb)
             return result["text"].strip()
-            
+        except ValueError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {str(e)}")
-    
+
+    def long_audio_workers(self) -> int:
+        configured = self._param("long_audio_workers", None)
+        if configured:
+            return max(1, int(configured))
+        if str(self.device).startswith("cuda"):
+            return 1
+        return max(1, min(4, (os.cpu_count() or 1) // 2))
+
+    @staticmethod
+    def _model_mb(model) -> float:
+        return sum(p.numel() * p.element_size() for p in model.parameters()) / (1024 * 1024)
+
+    def _checkout_replica(self):
+        # Each window worker transcribes on its own model instance. Replicas
+        # are created on first use, capped at long_audio_workers() (each one is
+        # a full copy of the weights), and kept until unload().
+        with self._replicas_cond:
+            max_replicas = self.long_audio_workers()
+            while not self._idle_replicas and len(self._replicas) + self._replicas_loading >= max_replicas:
+                self._replicas_cond.wait()
+            generation = self._replica_generation
+            if self._idle_replicas:
+                return self._idle_replicas.pop(), generation
+            self._replicas_loading += 1
+
+        try:
+            replica = whisper.load_model(self.model_name, device=self.device)
+        except Exception:
+            with self._replicas_cond:
+                self._replicas_loading -= 1
+                self._replicas_cond.notify()
+            raise
+
+        with self._replicas_cond:
+            self._replicas_loading -= 1
+            if generation == self._replica_generation:
+                self._replicas.append(replica)
+            count = len(self._replicas)
+
+        replica_mb = self._model_mb(replica)
+        LogsHelperManager.log_event(self.logger, "WHISPER_REPLICA_CREATED", {
+            "model": self.model_name,
+            "device": str(self.device),
+            "replicas": count,
+            "max_replicas": max_replicas,
+            "replica_mb": round(replica_mb, 1),
+            "total_mb": round(replica_mb * count, 1)
+        })
+        return replica, generation
+
+    def _return_replica(self, model, generation: int):
+        # Replicas checked out before unload() are dropped instead of being
+        # put back into the new generation's pool.
+        with self._replicas_cond:
+            if generation == self._replica_generation:
+                self._idle_replicas.append(model)
+            self._replicas_cond.notify()
+
+    @contextmanager
+    def _replica(self):
+        model, generation = self._checkout_replica()
+        try:
+            yield model
+        finally:
+            self._return_replica(model, generation)
+
+    def _detect_language(self, audio) -> str:
+        with self._replica() as model:
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(audio[:whisper.audio.N_SAMPLES]), model.dims.n_mels
+            ).to(model.device)
+            _, probs = model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def _transcribe_window(self, audio, window: AudioWindow, lang: str, word_timestamps: bool) -> Dict[str, Any]:
+        with self._replica() as model:
+            return model.transcribe(
+                audio[window.start:window.end],
+                language=lang,
+                temperature=self.config.get("temperature", 0.0),
+                word_timestamps=word_timestamps,
+                beam_size=self.config.get("beam_size", 5),
+                condition_on_previous_text=False
+            )
+
+    def transcribe_long(self, audio_path: str, language: str = "auto", progress_cb=None,
+                        word_timestamps: bool = False, audio=None) -> Dict[str, Any]:
+        if not self._loaded:
+            self.load()
+
+        start_time = time.time()
+        if audio is None:
+            audio = whisper.load_audio(audio_path)
+        sample_rate = whisper.audio.SAMPLE_RATE
+        windows = AudioWindowPlanner.plan(
+            audio, sample_rate,
+            target_seconds=float(self._param("long_audio_window_seconds", 60.0)),
+            max_seconds=float(self._param("long_audio_max_window_seconds", 90.0)),
+            overlap_seconds=float(self._param("long_audio_overlap_seconds", 1.5))
+        )
+        lang = None if language == "auto" else language
+        if lang is None:
+            lang = self._detect_language(audio)
+
+        workers = min(len(windows), self.long_audio_workers())
+        results = [None] * len(windows)
+        done = 0
+        if progress_cb:
+            progress_cb(0, f"Transcribing 0/{len(windows)} windows")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-window")
+        try:
+            futures = {
+                executor.submit(self._transcribe_window, audio, window, lang, word_timestamps): window
+                for window in windows
+            }
+            for future in as_completed(futures):
+                results[futures[future].index] = future.result()
+                done += 1
+                if progress_cb:
+                    progress_cb(int(done / len(windows) * 100), f"Transcribing {done}/{len(windows)} windows")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        stitched = AudioWindowPlanner.stitch(windows, results, sample_rate)
+        stitched["language"] = lang
+        self._last_segments = stitched["segments"]
+
+        LogsHelperManager.log_performance(self.logger, "WHISPER_LONG_AUDIO", time.time() - start_time, {
+            "audio_seconds": round(len(audio) / sample_rate, 2),
+            "windows": len(windows),
+            "workers": workers,
+            "segments": len(stitched["segments"])
+        })
+        return stitched
+
     def unload(self):
         if self._loaded and self.model:
             del self.model
             self.model = None
+            with self._replicas_cond:
+                self._replica_generation += 1
+                self._replicas.clear()
+                self._idle_replicas.clear()
+                self._replicas_cond.notify_all()
             self._loaded = False
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
@@ -130,36 +313,21 @@ class WhisperSTT(STTEngine):
     
     def get_segments(self) -> Optional[List[Dict[str, Any]]]:
         return self._last_segments
-    
-    def transcribe_with_timestamps(self, audio_path: str, language: str = "auto") -> Dict[str, Any]:
-        if not self._loaded:
-            self.load()
-        
-        if not self.audio_handler.validate_format(audio_path):
-            raise ValueError(f"Unsupported audio format: {audio_path}")
 
-        props = self.audio_handler.get_audio_properties(audio_path)
-        if props["duration_seconds"] <= 0.1:
-            raise ValueError(f"Audio file is too short: {audio_path}\nRequired: >0.1s duration")
+    def cache_params(self) -> Dict[str, Any]:
+        params = self.config.get("engines", {}).get("whisper", {}).get("parameters", {})
+        return {k: v for k, v in params.items() if k != "long_audio_workers"}
+    
+    def transcribe_with_timestamps(self, audio_path: str, language: str = "auto", progress_cb=None) -> Dict[str, Any]:
         try:
-            lang = None if language == "auto" else language
-            
-
-            result = self.model.transcribe(
-                audio_path,
-                language=lang,
-                temperature=self.config.get("temperature", 0.0),
-                word_timestamps=True,
-                beam_size=self.config.get("beam_size", 5)
-            )
-            
-            self._last_segments = result.get("segments", [])
-            
+            result = self._run(audio_path, language, True, progress_cb)
             return {
                 "text": result["text"].strip(),
                 "segments": result.get("segments", []),
                 "language": result.get("language", "unknown")
             }
-            
+
+        except ValueError:
+            raise
         except Exception as e:
-            raise RuntimeError(f"Timestamp transcription failed: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Timestamp transcription failed: {str(e)}")
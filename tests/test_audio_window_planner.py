@@ -0,0 +1,81 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from stt.AudioWindowPlanner import AudioWindow, AudioWindowPlanner
+
+SR = 16000
+
+
+def speech_with_pauses(seconds, pause_every=7.0, pause_seconds=0.6, seed=11):
+    rng = np.random.default_rng(seed)
+    audio = (0.3 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+    pauses = []
+    t = pause_every
+    while t + pause_seconds < seconds:
+        start, end = int(t * SR), int((t + pause_seconds) * SR)
+        audio[start:end] *= 0.001
+        pauses.append((start, end))
+        t += pause_every
+    return audio, pauses
+
+
+def test_short_audio_is_one_window():
+    audio, _ = speech_with_pauses(30)
+    assert AudioWindowPlanner.plan(audio, SR) == [AudioWindow(0, 0, len(audio), 0, len(audio))]
+
+
+def test_windows_tile_the_audio_and_cut_in_pauses():
+    audio, pauses = speech_with_pauses(600)
+    windows = AudioWindowPlanner.plan(audio, SR, target_seconds=60, max_seconds=90, overlap_seconds=1.5)
+
+    assert windows[0].core_start == 0 and windows[-1].core_end == len(audio)
+    for prev, nxt in zip(windows, windows[1:]):
+        assert prev.core_end == nxt.core_start
+        assert any(start <= prev.core_end < end for start, end in pauses)
+    assert [w.index for w in windows] == list(range(len(windows)))
+    for window in windows:
+        assert window.core_end - window.core_start <= 90 * SR
+        assert window.start == max(0, window.core_start - int(1.5 * SR))
+        assert window.end == min(len(audio), window.core_end + int(1.5 * SR))
+    assert all(w.core_end - w.core_start >= 30 * SR for w in windows[:-1])
+
+
+def test_falls_back_to_hard_cuts_without_pauses():
+    audio = (0.3 * np.random.default_rng(1).standard_normal(200 * SR)).astype(np.float32)
+    windows = AudioWindowPlanner.plan(audio, SR, target_seconds=60, max_seconds=90)
+    assert [w.core_end for w in windows] == [90 * SR, 180 * SR, 200 * SR]
+
+
+def test_silence_cuts_sit_inside_pauses():
+    audio, pauses = speech_with_pauses(60)
+    cuts = AudioWindowPlanner.silence_cuts(audio, SR)
+    assert len(cuts) == len(pauses)
+    for cut, (start, end) in zip(cuts, pauses):
+        assert start <= cut < end
+
+
+def test_stitch_shifts_times_and_drops_overlap_duplicates():
+    windows = [AudioWindow(0, 0, 11 * SR, 0, 10 * SR), AudioWindow(1, 9 * SR, 20 * SR, 10 * SR, 20 * SR)]
+    results = [
+        {"segments": [
+            {"start": 0.0, "end": 4.0, "text": " one"},
+            {"start": 9.2, "end": 10.6, "text": " two"},
+        ]},
+        {"segments": [
+            {"start": 0.2, "end": 1.6, "text": " two"},
+            {"start": 2.0, "end": 5.0, "text": " three", "words": [{"word": "three", "start": 2.0, "end": 5.0}]},
+        ]},
+    ]
+    stitched = AudioWindowPlanner.stitch(windows, results, SR)
+
+    assert stitched["text"] == "one two three"
+    assert [s["id"] for s in stitched["segments"]] == [0, 1, 2]
+    assert [(s["start"], s["end"]) for s in stitched["segments"]] == [(0.0, 4.0), (9.2, 10.6), (11.0, 14.0)]
+    assert stitched["segments"][2]["words"][0]["start"] == 11.0
+
+
+def test_stitch_keeps_segments_past_the_last_core():
+    windows = [AudioWindow(0, 0, 5 * SR, 0, 5 * SR)]
+    stitched = AudioWindowPlanner.stitch(windows, [{"segments": [{"start": 4.5, "end": 5.5, "text": "end"}]}], SR)
+    assert stitched["text"] == "end"
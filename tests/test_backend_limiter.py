@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+import pytest
+
+from tts.utility.BackendLimiter import BackendLimiter, CircuitOpenError
+
+
+def make_limiter(**kwargs):
+    params = {"rate": 1000.0, "burst": 1000, "max_concurrency": 2}
+    params.update(kwargs)
+    return BackendLimiter("test", **params)
+
+
+def test_acquire_release_tracks_in_flight():
+    limiter = make_limiter()
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.in_flight == 2
+    assert limiter._try_acquire() > 0
+    limiter.release(success=True)
+    limiter.release(success=True)
+    assert limiter.in_flight == 0
+    assert limiter.successes == 2
+
+
+def test_failures_halve_limit_and_open_circuit():
+    limiter = make_limiter(max_concurrency=8, failure_threshold=3, reset_timeout=60.0)
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(success=False, throttled=True)
+    assert limiter.limit == 1.0
+    assert limiter.throttles == 3
+    assert limiter.state == BackendLimiter.OPEN
+    with pytest.raises(CircuitOpenError):
+        limiter.acquire()
+
+
+def test_half_open_probe_closes_circuit():
+    limiter = make_limiter(failure_threshold=1, reset_timeout=0.0)
+    limiter.acquire()
+    limiter.release(success=False)
+    assert limiter.state == BackendLimiter.OPEN
+
+    limiter.acquire()
+    assert limiter.state == BackendLimiter.HALF_OPEN
+    assert limiter._try_acquire() > 0
+    limiter.release(success=True)
+    assert limiter.state == BackendLimiter.CLOSED
+
+
+def test_abandon_frees_slot_without_recording_outcome():
+    limiter = make_limiter(failure_threshold=1, reset_timeout=0.0)
+    limiter.acquire()
+    limiter.release(success=False)
+    limiter.acquire()
+    assert limiter.state == BackendLimiter.HALF_OPEN
+
+    limiter.abandon()
+    assert limiter.in_flight == 0
+    assert limiter.state == BackendLimiter.HALF_OPEN
+    assert (limiter.successes, limiter.failures) == (0, 1)
+    assert limiter._try_acquire() == 0.0
+
+
+def test_cancelled_request_releases_limiter_slot():
+    pytest.importorskip("pydub")
+    from tts.utility.TTSHelper import TTSHelper
+
+    limiter = make_limiter(max_concurrency=1)
+
+    class Helper(TTSHelper):
+        def __init__(self):
+            self.retries = 3
+            self.retry_delay = 0.0
+
+        def _limiter(self):
+            return limiter
+
+        def _with_retry_chunk(self, chunk):
+            return b""
+
+        async def synthesize_stream(self, text, progress_cb=None):
+            yield b""
+
+    helper = Helper()
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return b"ok"
+
+    async def scenario():
+        task = asyncio.create_task(helper._with_retry_async(slow))
+        await asyncio.sleep(0.01)
+        assert limiter.in_flight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.in_flight == 0
+
+        started = time.monotonic()
+        assert await asyncio.wait_for(helper._with_retry_async(fast), 1.0) == b"ok"
+        assert time.monotonic() - started < 0.5
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 0
+    assert (limiter.successes, limiter.failures) == (1, 0)
+
+
+class StatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+@pytest.mark.parametrize("error", [
+    TimeoutError("read timed out"),
+    asyncio.TimeoutError(),
+    ConnectionResetError("reset by peer"),
+    RuntimeError("429 (Too Many Requests) from TTS API"),
+    RuntimeError("Failed to connect. Probable cause: timeout"),
+    RuntimeError("502 Bad Gateway"),
+    StatusError(503),
+])
+def test_transient_errors(error):
+    assert BackendLimiter.is_transient_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("No text to synthesize."),
+    RuntimeError("Invalid voice 'xx-XX-Nobody'"),
+    RuntimeError("text longer than 5000 characters"),
+    StatusError(403),
+])
+def test_non_transient_errors(error):
+    assert not BackendLimiter.is_transient_error(error)
+
+
+def test_non_transient_failures_leave_limit_and_breaker_alone():
+    limiter = make_limiter(max_concurrency=8, failure_threshold=3, reset_timeout=60.0)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(success=False, transient=False)
+    assert limiter.state == BackendLimiter.CLOSED
+    assert limiter.limit == 8.0
+    assert limiter.in_flight == 0
+    assert (limiter.client_errors, limiter.failures, limiter.consecutive_failures) == (10, 0, 0)
+    limiter.acquire()
+
+
+def test_user_errors_do_not_open_the_circuit_through_retries():
+    pytest.importorskip("pydub")
+    from tts.utility.TTSHelper import TTSHelper
+
+    limiter = make_limiter(failure_threshold=2, reset_timeout=60.0)
+
+    class Helper(TTSHelper):
+        def __init__(self):
+            self.retries = 3
+            self.retry_delay = 0.0
+
+        def _limiter(self):
+            return limiter
+
+        def _with_retry_chunk(self, chunk):
+            return b""
+
+        async def synthesize_stream(self, text, progress_cb=None):
+            yield b""
+
+    def bad_voice():
+        raise ValueError("Invalid voice")
+
+    with pytest.raises(RuntimeError):
+        Helper()._with_retry(bad_voice)
+    assert limiter.state == BackendLimiter.CLOSED
+    assert limiter.client_errors == 3
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydub")
+
+import batch.BatchQueue as batch_queue
+from batch.BatchJob import BatchJob
+from batch.BatchQueue import BatchQueue
+from batch.BatchState import BatchState
+
+
+class FakeService:
+    def __init__(self, calls, fail_on=()):
+        self.calls = calls
+        self.fail_on = set(fail_on)
+
+    def synthesize_to_bytes(self, text):
+        self.calls.append(text)
+        if text in self.fail_on:
+            raise RuntimeError("connection lost")
+        return text.encode("utf-8")
+
+
+class FakeFormat:
+    def __init__(self, audio, filename):
+        self.audio = audio
+        self.filename = filename
+
+    def export(self, out_dir):
+        path = out_dir / f"{self.filename}.txt"
+        path.write_bytes(self.audio)
+        return path
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    monkeypatch.setattr(batch_queue.VoiceProcessor, "process_from_memory",
+                        staticmethod(lambda raw, fmt, settings, return_audio=False: raw))
+    monkeypatch.setattr(batch_queue, "get_format_class", lambda fmt: FakeFormat)
+
+
+def make_queue(jobs, tmp_path, calls, fail_on=()):
+    queue = BatchQueue(jobs, tmp_path / "out", max_workers=2)
+    service = FakeService(calls, fail_on)
+    queue._get_service = lambda job: service
+    return queue
+
+
+def make_jobs():
+    return [BatchJob(id=f"job{i}", text=f"text {i}") for i in range(5)]
+
+
+def test_resume_runs_only_unfinished_jobs(tmp_path):
+    calls = []
+    summary = make_queue(make_jobs(), tmp_path, calls, fail_on={"text 2", "text 4"}).run()
+    assert (summary["done"], summary["failed"]) == (3, 2)
+
+    state_path = tmp_path / "out" / BatchQueue.STATE_FILE
+    persisted = json.loads(state_path.read_text(encoding="utf-8"))["jobs"]
+    assert {k: v["status"] for k, v in persisted.items()} == {
+        "job0": "done", "job1": "done", "job2": "failed", "job3": "done", "job4": "failed"
+    }
+
+    # A crash mid-run leaves the job marked "running"; it must run again too.
+    state = BatchState(state_path)
+    state.mark("job3", "running", make_jobs()[3].fingerprint)
+
+    calls.clear()
+    summary = make_queue(make_jobs(), tmp_path, calls).run()
+    assert sorted(calls) == ["text 2", "text 3", "text 4"]
+    assert (summary["done"], summary["failed"], summary["skipped"]) == (3, 0, 2)
+    assert BatchState(state_path).counts() == {"done": 5}
+
+
+def test_resume_reruns_changed_jobs_and_missing_outputs(tmp_path):
+    calls = []
+    make_queue(make_jobs(), tmp_path, calls).run()
+
+    jobs = make_jobs()
+    jobs[1].settings = dict(jobs[1].settings, speed=1.2)
+    (tmp_path / "out" / "job4.txt").unlink()
+
+    calls.clear()
+    summary = make_queue(jobs, tmp_path, calls).run()
+    assert sorted(calls) == ["text 1", "text 4"]
+    assert summary["skipped"] == 3
+
+
+def test_corrupt_state_file_starts_over(tmp_path):
+    state_path = tmp_path / "out" / BatchQueue.STATE_FILE
+    state_path.parent.mkdir(parents=True)
+    state_path.write_text("{not json", encoding="utf-8")
+
+    calls = []
+    summary = make_queue(make_jobs(), tmp_path, calls).run()
+    assert len(calls) == 5 and summary["skipped"] == 0
@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+AudioSegment = pytest.importorskip("pydub").AudioSegment
+
+from audio_dsp.EffectsEngine import EffectsEngine
+from VoiceProcessor import VoiceProcessor
+
+FRAME_RATE = 22050
+
+
+def make_audio(seconds=1.5, channels=1, amplitude=0.5, seed=5):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * FRAME_RATE)) / FRAME_RATE
+    tone = amplitude * np.sin(2 * np.pi * 330 * t) + 0.05 * rng.standard_normal(len(t))
+    samples = np.repeat(tone[:, None], channels, axis=1)
+    pcm = np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2")
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=channels)
+
+
+def pcm(audio):
+    return np.frombuffer(audio.raw_data, dtype="<i2").astype(np.int32)
+
+
+def test_array_round_trip_is_lossless():
+    audio = make_audio(channels=2)
+    samples = EffectsEngine.to_array(audio)
+    assert samples.shape == (len(audio.get_array_of_samples()) // 2, 2)
+    assert np.max(np.abs(pcm(EffectsEngine.to_segment(samples, FRAME_RATE)) - pcm(audio))) <= 1
+
+
+def test_normalize_leaves_headroom():
+    samples = EffectsEngine.to_array(make_audio(amplitude=0.2))
+    EffectsEngine.normalize(samples)
+    assert EffectsEngine.peak(samples) == pytest.approx(EffectsEngine.db_to_gain(-0.1), rel=1e-5)
+
+
+@pytest.mark.parametrize("settings", [
+    {"volume": 1.4},
+    {"volume": 0.6},
+    {"echo": True},
+    {"reverb": True},
+    {"volume": 1.2, "echo": True, "reverb": True},
+])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_matches_pydub_chain(settings, channels):
+    audio = make_audio(channels=channels)
+    settings = dict({"volume": 1.0, "speed": 1.0, "pitch": 0}, **settings)
+    expected = VoiceProcessor._apply_pydub(audio, settings)
+    actual = VoiceProcessor._apply_numpy(audio, settings)
+
+    assert actual.frame_rate == expected.frame_rate
+    assert actual.channels == expected.channels
+    expected, actual = pcm(expected), pcm(actual)
+    assert len(actual) == len(expected)
+    # pydub rounds to int16 after every overlay and normalize; the engine
+    # stays in float32 until the end.
+    diff = (actual - expected).astype(np.float64)
+    assert np.max(np.abs(diff)) <= 64
+    assert np.sqrt(np.mean(diff ** 2)) <= 0.005 * np.sqrt(np.mean(expected.astype(np.float64) ** 2))
+
+
+def test_robot_keeps_rate_and_length():
+    audio = make_audio()
+    settings = {"volume": 1.0, "speed": 1.0, "pitch": 0, "robot": True}
+    expected = VoiceProcessor._apply_pydub(audio, settings)
+    actual = VoiceProcessor._apply_numpy(audio, settings)
+    assert actual.frame_rate == expected.frame_rate == FRAME_RATE
+    # pydub builds the 10 ms delay from an 11025 Hz silence, so its output
+    # runs a few frames longer than the engine's exact delay.
+    assert abs(len(actual.raw_data) - len(expected.raw_data)) <= 10 * 2
+    assert EffectsEngine.peak(EffectsEngine.to_array(actual)) == pytest.approx(
+        EffectsEngine.peak(EffectsEngine.to_array(expected)), abs=2e-3)
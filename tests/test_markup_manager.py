@@ -0,0 +1,116 @@
+import threading
+import time
+import zlib
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("pydub")
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from markup.MarkupManager import MarkupManager
+
+
+class FakeTTS:
+    def __init__(self, delay=0.05, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def render(text):
+        freq = 200 + zlib.crc32(text.encode("utf-8")) % 800
+        return Sine(freq).to_audio_segment(duration=40 + (10 * len(text)) % 120).set_frame_rate(16000)
+
+    def synthesize_to_bytes(self, text):
+        with self._lock:
+            self.calls.append(text)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            # Later segments finish first, so completion order != text order.
+            time.sleep(self.delay / (1 + len(self.calls)))
+            if text == self.fail_on:
+                raise RuntimeError("backend failed")
+            buf = BytesIO()
+            self.render(text).export(buf, format="wav")
+            return buf.getvalue()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def decode(data):
+    return AudioSegment.from_file(BytesIO(data), format="wav")
+
+
+def test_segments_are_assembled_in_text_order():
+    tts = FakeTTS()
+    manager = MarkupManager(tts, default_format="wav")
+    words = [f"segment number {i}" for i in range(8)]
+    text = '<break time="100ms"/>'.join(words)
+
+    out = decode(manager.synthesize_with_markup(text))
+
+    expected = AudioSegment.empty()
+    for i, word in enumerate(words):
+        if i:
+            expected += AudioSegment.silent(duration=100, frame_rate=16000)
+        expected += FakeTTS.render(word)
+    assert out.raw_data == expected.raw_data
+    assert tts.peak > 1
+
+
+def test_backend_error_is_raised():
+    manager = MarkupManager(FakeTTS(fail_on="broken"), default_format="wav")
+    with pytest.raises(RuntimeError, match="backend failed"):
+        manager.synthesize_with_markup('fine <break time="50ms"/> broken <break time="50ms"/> also fine')
+
+
+def test_transforms_apply_to_nested_text_only():
+    manager = MarkupManager(FakeTTS(delay=0), default_format="wav")
+    segments = manager._collect_segments(manager.parser.parse(
+        'a <emphasis level="strong">b <prosody rate="1.2">c</prosody></emphasis> d'))
+    assert [(s.text, [name for name, _ in s.transforms]) for s in segments] == [
+        ("a", []),
+        ("b", ["emphasis"]),
+        ("c", ["emphasis", "prosody"]),
+        ("d", []),
+    ]
+
+
+def test_progress_reaches_100():
+    seen = []
+    manager = MarkupManager(FakeTTS(delay=0), default_format="wav")
+    manager.synthesize_with_markup("one. <break/> two. <break/> three.", lambda pct, msg: seen.append(pct))
+    assert seen[-1] == 100
+    assert seen == sorted(seen)
+
+
+def test_identical_segments_are_synthesized_once():
+    tts = FakeTTS(delay=0)
+    manager = MarkupManager(tts, default_format="wav")
+    text = ('hello there <break time="100ms"/> something else <break time="100ms"/> hello there'
+            ' <emphasis level="strong">hello there</emphasis>')
+
+    out = decode(manager.synthesize_with_markup(text))
+
+    assert sorted(tts.calls) == ["hello there", "hello there", "something else"]
+    silence = AudioSegment.silent(duration=100, frame_rate=16000)
+    hello = FakeTTS.render("hello there")
+    expected = hello + silence + FakeTTS.render("something else") + silence + hello + (hello + 6)
+    assert out.raw_data == expected.raw_data
+
+
+def test_dedup_key_includes_voice():
+    tts = FakeTTS(delay=0)
+    tts.voice_key = lambda: "edge:voice-a"
+    manager = MarkupManager(tts, default_format="wav")
+    segments = manager._collect_segments(manager.parser.parse('same <break time="10ms"/> same'))
+    groups = manager._group_segments(segments)
+    assert len(groups) == 1 and [s.index for s in next(iter(groups.values()))] == [0, 2]
+    assert '"edge:voice-a"' in next(iter(groups))
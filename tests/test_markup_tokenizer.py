@@ -0,0 +1,87 @@
+import time
+
+from markup.MarkupManagerUtility import MarkupManagerUtility
+
+
+def tokenize(text):
+    return MarkupManagerUtility().tokenize(text)
+
+
+def test_plain_text_is_single_node():
+    root = tokenize("Hello world")
+    assert [(t.type, t.value) for t in root.children] == [("text", "Hello world")]
+
+
+def test_nested_tags_and_attributes():
+    root = tokenize('A <prosody rate="1.2" pitch="+2st">fast <emphasis level="Strong">now</emphasis></prosody>'
+                    '<break time="250ms"/> end')
+    text, prosody, pause, tail = root.children
+    assert text.value == "A "
+    assert prosody.type == "prosody"
+    assert prosody.attrs["rate"] == 1.2 and prosody.attrs["pitch"] == 2.0
+    assert prosody.children[1].type == "emphasis"
+    assert prosody.children[1].attrs["level"] == "strong"
+    assert prosody.inner_text() == "fast now"
+    assert pause.type == "break" and pause.attrs["time"] == 250
+    assert tail.value == " end"
+
+
+def test_unknown_tags_stay_literal():
+    for text in ("if x <y and z> then", "<b>bold</b> text", "a <foo/> b"):
+        root = tokenize(text)
+        assert [t.type for t in root.children] == ["text"]
+        assert root.inner_text() == text
+
+
+def test_unknown_tag_inside_known_tag():
+    root = tokenize("<emphasis>a <b>b</b></emphasis>")
+    emphasis, = root.children
+    assert emphasis.type == "emphasis"
+    assert emphasis.inner_text() == "a <b>b</b>"
+
+
+def test_stray_angle_brackets_stay_literal():
+    for text in ("1 < 2 and 3 > 2", "a <", "<<<", "x <> y", "< emphasis>", "5 <3 >"):
+        root = tokenize(text)
+        assert root.inner_text() == text
+
+
+def test_unclosed_and_unmatched_tags():
+    root = tokenize("<emphasis>open")
+    assert root.children[0].type == "emphasis"
+    assert root.children[0].inner_text() == "open"
+
+    root = tokenize("text</prosody> more")
+    assert root.inner_text() == "text more"
+
+
+def test_stray_brackets_scale_linearly():
+    text = "<" * 20000 + ">"
+    started = time.monotonic()
+    root = tokenize(text)
+    assert time.monotonic() - started < 1.0
+    assert root.inner_text() == text
+
+
+def test_parse_duration():
+    assert MarkupManagerUtility.parse_duration("500ms") == 500
+    assert MarkupManagerUtility.parse_duration("1.5s") == 1500
+    assert MarkupManagerUtility.parse_duration("2") == 2000
+    assert MarkupManagerUtility.parse_duration("soon") == 1000
+    assert MarkupManagerUtility.parse_duration(None) == 1000
+
+
+def test_closing_tag_closes_innermost_same_name():
+    root = tokenize('<emphasis level="strong">a <emphasis level="reduced">b</emphasis> c</emphasis> d')
+    outer, tail = root.children
+    assert outer.attrs["level"] == "strong"
+    assert [t.type for t in outer.children] == ["text", "emphasis", "text"]
+    assert outer.children[1].attrs["level"] == "reduced"
+    assert outer.children[1].inner_text() == "b"
+    assert outer.children[2].value == " c"
+    assert tail.value == " d"
+
+    root = tokenize('<prosody rate="1.2">x <prosody rate="0.8">y</prosody> z</prosody>')
+    outer, = root.children
+    assert outer.inner_text() == "x y z"
+    assert outer.children[-1].value == " z"
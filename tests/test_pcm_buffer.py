@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("pydub")
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from audio_dsp.PCMBuffer import PCMBuffer
+
+
+def tone(freq, ms, frame_rate=16000, channels=1):
+    return Sine(freq).to_audio_segment(duration=ms).set_frame_rate(frame_rate).set_channels(channels)
+
+
+def test_matches_repeated_addition():
+    pieces = [tone(200 + 30 * i, 50 + 7 * i) for i in range(40)]
+    expected = AudioSegment.empty()
+    buffer = PCMBuffer()
+    for piece in pieces:
+        expected += piece
+        buffer.append(piece)
+    assert buffer.to_bytes() == expected.raw_data
+    assert buffer.to_segment().raw_data == expected.raw_data
+    assert buffer.duration_ms == pytest.approx(len(expected), abs=1)
+
+
+def test_silence_matches_pydub_silence():
+    buffer = PCMBuffer.like(tone(300, 10))
+    buffer.append(tone(300, 100))
+    buffer.append_silence(250)
+    buffer.append(tone(500, 100))
+    expected = tone(300, 100) + AudioSegment.silent(duration=250, frame_rate=16000) + tone(500, 100)
+    assert buffer.to_bytes() == expected.raw_data
+
+
+def test_appended_audio_is_converted_to_buffer_format():
+    buffer = PCMBuffer(22050, 2, 2)
+    buffer.append(tone(440, 100, frame_rate=16000, channels=1))
+    segment = buffer.to_segment()
+    assert (segment.frame_rate, segment.channels, segment.sample_width) == (22050, 2, 2)
+    assert len(buffer) % buffer.frame_width == 0
+
+
+def test_reserve_does_not_change_content():
+    buffer = PCMBuffer(16000, 1, 2)
+    buffer.reserve_ms(5000)
+    assert len(buffer) == 0
+    buffer.append(tone(440, 100))
+    assert buffer.to_bytes() == tone(440, 100).raw_data
+
+
+def test_empty_buffer():
+    assert len(PCMBuffer().to_segment()) == 0
+    with pytest.raises(ValueError):
+        PCMBuffer().append_silence(100)
+
+
+def test_exact_capacity_append_does_not_grow():
+    audio = tone(440, 300)
+    pause_bytes = int(audio.frame_rate * 250 / 1000.0) * audio.frame_width
+    buffer = PCMBuffer.like(audio, capacity_bytes=len(audio.raw_data) + pause_bytes)
+    storage = buffer._buf
+    capacity = len(storage)
+    buffer.append(audio)
+    buffer.append_silence(250)
+    assert buffer._buf is storage and len(buffer._buf) == capacity
+    assert buffer.to_bytes() == (audio + AudioSegment.silent(duration=250, frame_rate=16000)).raw_data
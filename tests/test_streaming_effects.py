@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("pydub")
+
+from audio_dsp.EffectsEngine import EffectsEngine
+from audio_dsp.StreamingEffects import StreamingEffects
+
+FRAME_RATE = 22050
+
+
+def make_signal(seconds=2.0, channels=1, seed=3):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * FRAME_RATE)) / FRAME_RATE
+    tone = 0.4 * np.sin(2 * np.pi * 220 * t) + 0.1 * rng.standard_normal(len(t))
+    return np.repeat(tone[:, None], channels, axis=1).astype(np.float32)
+
+
+def run_streaming(samples, settings, block_frames):
+    out = []
+    blocks = (samples[i:i + block_frames] for i in range(0, len(samples), block_frames))
+    rate = StreamingEffects(settings, block_frames=block_frames).process_blocks(
+        blocks, FRAME_RATE, samples.shape[1], out.append)
+    return np.concatenate(out), rate
+
+
+@pytest.mark.parametrize("settings", [
+    {"volume": 1.3},
+    {"echo": True},
+    {"reverb": True},
+    {"robot": True},
+    {"speed": 1.2},
+    {"pitch": 3},
+    {"volume": 0.8, "speed": 0.9, "pitch": -2, "echo": True},
+    {"volume": 0.8, "echo": True, "reverb": True, "robot": True},
+])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_streaming_matches_batch(settings, channels):
+    samples = make_signal(channels=channels)
+    expected, expected_rate = EffectsEngine.apply(samples.copy(), FRAME_RATE, settings)
+    actual, actual_rate = run_streaming(samples, settings, block_frames=3001)
+
+    assert actual_rate == expected_rate
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected)) < 1e-4
+
+
+def test_block_size_does_not_change_output():
+    samples = make_signal()
+    settings = {"echo": True, "reverb": True}
+    small, _ = run_streaming(samples, settings, block_frames=512)
+    large, _ = run_streaming(samples, settings, block_frames=1 << 15)
+    assert np.max(np.abs(small - large)) < 1e-5
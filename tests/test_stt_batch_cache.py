@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from data_manager.DiskCache import DiskCache
+from stt.STTCache import STTCache
+from stt.STTEngine import STTEngine
+from stt.factory.STTFactory import STTManager
+
+
+class FakeEngine(STTEngine):
+    def __init__(self, workers=1):
+        super().__init__("fake-model")
+        self.workers = workers
+        self.calls = []
+        self._lock = threading.Lock()
+        self._segments = None
+
+    def load(self):
+        self._loaded = True
+
+    def batch_workers(self):
+        return self.workers
+
+    def transcribe(self, audio_path, language="auto"):
+        with self._lock:
+            self.calls.append(audio_path)
+        with open(audio_path, "rb") as f:
+            text = f.read().decode("utf-8")
+        self._segments = [{"start": 0.0, "end": 1.0, "text": text}]
+        return text
+
+    def get_segments(self):
+        return self._segments
+
+    def unload(self):
+        self._loaded = False
+
+    def get_supported_languages(self):
+        return ["auto"]
+
+    def get_model_info(self):
+        return {"engine": "fake"}
+
+
+@pytest.fixture
+def stt_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(STTCache, "_instance", DiskCache(tmp_path / "cache", max_bytes=1 << 20, suffix=".json"))
+    monkeypatch.setattr(STTCache, "is_enabled", staticmethod(lambda: True))
+    return STTCache
+
+
+def make_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"clip{i}.wav"
+        path.write_bytes(f"text {i}".encode("utf-8"))
+        paths.append(str(path))
+    return paths
+
+
+def make_manager(engine):
+    manager = STTManager()
+    manager.current_engine = engine
+    manager.current_engine_type = "fake"
+    return manager
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batch_reads_and_fills_the_cache(stt_cache, tmp_path, workers):
+    paths = make_files(tmp_path, 6)
+    engine = FakeEngine(workers)
+    manager = make_manager(engine)
+
+    assert manager.transcribe(paths[0]) == "text 0"
+    engine.calls.clear()
+
+    results = manager.transcribe_batch(paths)
+    assert results == {p: f"text {i}" for i, p in enumerate(paths)}
+    assert sorted(engine.calls) == sorted(paths[1:])
+
+    engine.calls.clear()
+    assert manager.transcribe_batch(paths) == results
+    assert engine.calls == []
+
+
+def test_batch_does_not_leak_segments_from_previous_call(stt_cache, tmp_path):
+    paths = make_files(tmp_path, 3)
+    manager = make_manager(FakeEngine())
+    manager.transcribe(paths[0])
+    manager.transcribe(paths[0])
+    assert manager._cached_segments[0]["text"] == "text 0"
+
+    manager.transcribe_batch(paths[1:])
+    assert manager._cached_segments is None
+
+
+def test_parallel_batch_does_not_cache_shared_segments(stt_cache, tmp_path):
+    paths = make_files(tmp_path, 4)
+    manager = make_manager(FakeEngine(workers=4))
+    manager.transcribe_batch(paths)
+
+    key = STTCache.make_key(paths[2], "fake", "fake-model", "auto", manager.current_engine.cache_params())
+    assert STTCache.get(key) == {"text": "text 2", "segments": None}
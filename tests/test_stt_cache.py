@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from data_manager.DiskCache import DiskCache
+from stt.STTCache import STTCache
+
+PARAMS = {"beam_size": 5, "temperature": 0.0}
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"RIFF" + bytes(range(256)) * 64)
+    return path
+
+
+def key(audio, engine="whisper", model="base", language="en", params=PARAMS):
+    return STTCache.make_key(audio, engine, model, language, params)
+
+
+def test_key_is_stable_and_follows_content(audio_file, tmp_path):
+    copy = tmp_path / "renamed.wav"
+    copy.write_bytes(audio_file.read_bytes())
+    assert key(str(audio_file)) == key(str(audio_file))
+    assert key(str(audio_file)) == key(str(copy))
+    assert key(str(audio_file)) == key(audio_file.read_bytes())
+
+
+def test_key_changes_with_settings(audio_file):
+    base = key(str(audio_file))
+    assert key(str(audio_file), engine="vosk") != base
+    assert key(str(audio_file), model="small") != base
+    assert key(str(audio_file), language="tr") != base
+    assert key(str(audio_file), params=dict(PARAMS, beam_size=1)) != base
+    assert key(str(audio_file), engine="WHISPER") == base
+    assert key(str(audio_file), params={"temperature": 0.0, "beam_size": 5}) == base
+    assert key(str(audio_file), language=None) == key(str(audio_file), language="auto")
+
+
+def test_key_changes_when_file_is_rewritten(audio_file):
+    before = key(str(audio_file))
+    audio_file.write_bytes(audio_file.read_bytes() + b"\x00")
+    assert key(str(audio_file)) != before
+
+
+def test_fingerprint_is_memoized_per_mtime_and_size(audio_file, monkeypatch):
+    STTCache.fingerprint(str(audio_file))
+    stat = audio_file.stat()
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("file was hashed again")
+
+    monkeypatch.setattr("builtins.open", no_read)
+    STTCache.fingerprint(str(audio_file))
+    monkeypatch.undo()
+
+    os.utime(audio_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    monkeypatch.setattr("builtins.open", no_read)
+    with pytest.raises(AssertionError):
+        STTCache.fingerprint(str(audio_file))
+
+
+def test_put_get_round_trip(tmp_path, monkeypatch, audio_file):
+    monkeypatch.setattr(STTCache, "_instance", DiskCache(tmp_path / "cache", max_bytes=1 << 20, suffix=".json"))
+    k = key(str(audio_file))
+    assert STTCache.get(k) is None
+    STTCache.put(k, "merhaba dünya", [{"start": 0.0, "end": 1.5, "text": "merhaba dünya"}])
+    assert STTCache.get(k) == {"text": "merhaba dünya", "segments": [{"start": 0.0, "end": 1.5, "text": "merhaba dünya"}]}
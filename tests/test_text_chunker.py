@@ -0,0 +1,64 @@
+import random
+
+from tts.utility.TextChunker import TextChunker
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def make_sentences(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 20))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def test_chunks_respect_max_chars_and_keep_text():
+    text = " ".join(make_sentences(200))
+    chunks = TextChunker(300).chunks(text)
+    assert all(len(c) <= 300 for c in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_chunks_are_mostly_full():
+    chunks = TextChunker(300).chunks(" ".join(make_sentences(400)))
+    assert sum(map(len, chunks)) / len(chunks) >= 0.65 * 300
+
+
+def test_edit_only_changes_nearby_chunks():
+    sentences = make_sentences(400)
+    chunker = TextChunker(300)
+    original = {c.id for c in chunker.iter_chunks(" ".join(sentences))}
+
+    changed = []
+    for k in range(0, len(sentences), 20):
+        edited = list(sentences)
+        edited[k] = "An edited sentence."
+        chunks = list(chunker.iter_chunks(" ".join(edited)))
+        changed.append(sum(c.id not in original for c in chunks))
+    assert sum(changed) / len(changed) <= 3
+
+
+def test_paragraphs_never_share_a_chunk():
+    chunks = list(TextChunker(300).iter_chunks("First one. Second one.\n\nThird one."))
+    assert [(c.paragraph, c.text) for c in chunks] == [(0, "First one. Second one."), (1, "Third one.")]
+    assert [c.index for c in chunks] == [0, 1]
+
+
+def test_long_sentence_is_split_on_words():
+    sentence = " ".join(["word"] * 200) + "."
+    chunks = TextChunker(100).chunks(sentence)
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks) == sentence
+
+    chunks = TextChunker(10).chunks("x" * 25)
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_without_anchors_packing_is_greedy():
+    sentences = make_sentences(100)
+    chunks = TextChunker(300, anchor_every=None).chunks(" ".join(sentences))
+    for chunk, following in zip(chunks, chunks[1:]):
+        first = following.split(". ")[0]
+        first = first if first.endswith(".") else first + "."
+        assert len(chunk) + 1 + len(first) > 300
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("pydub")
+
+from audio_dsp.TimeStretch import PhaseVocoder, TimeStretch
+
+FRAME_RATE = 22050
+
+
+def tone(freq=440.0, seconds=2.0, channels=1):
+    t = np.arange(int(seconds * FRAME_RATE)) / FRAME_RATE
+    return np.repeat((0.5 * np.sin(2 * np.pi * freq * t))[:, None], channels, axis=1).astype(np.float32)
+
+
+def dominant_freq(samples):
+    mono = samples[:, 0] * np.hanning(len(samples))
+    spectrum = np.abs(np.fft.rfft(mono))
+    return np.argmax(spectrum) * FRAME_RATE / len(mono)
+
+
+def test_identity_settings_return_input():
+    samples = tone()
+    assert TimeStretch.apply(samples, FRAME_RATE) is samples
+
+
+@pytest.mark.parametrize("speed", [0.75, 1.25, 1.5])
+def test_speed_changes_duration_but_not_pitch(speed):
+    samples = tone()
+    out = TimeStretch.apply(samples, FRAME_RATE, speed=speed)
+    assert len(out) == pytest.approx(len(samples) / speed, abs=2)
+    assert dominant_freq(out) == pytest.approx(440.0, abs=5.0)
+
+
+@pytest.mark.parametrize("semitones", [-4, 3, 7])
+def test_pitch_shifts_frequency_but_not_duration(semitones):
+    samples = tone()
+    out = TimeStretch.apply(samples, FRAME_RATE, semitones=semitones)
+    assert len(out) == pytest.approx(len(samples), abs=2)
+    assert dominant_freq(out) == pytest.approx(440.0 * TimeStretch.pitch_ratio(semitones), rel=0.02)
+
+
+def test_vocoder_output_does_not_depend_on_block_size():
+    samples = tone(channels=2, seconds=1.0)
+    whole = PhaseVocoder(1.3, 2, FRAME_RATE)
+    expected = np.concatenate((whole.process(samples), whole.flush()))
+
+    blocked = PhaseVocoder(1.3, 2, FRAME_RATE)
+    parts = [blocked.process(samples[i:i + 777]) for i in range(0, len(samples), 777)]
+    actual = np.concatenate(parts + [blocked.flush()])
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected)) < 1e-5
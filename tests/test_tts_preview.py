@@ -0,0 +1,76 @@
+import asyncio
+import shutil
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("pydub")
+
+from tts.utility.TTSHelper import TTSHelper
+
+
+class SlowHelper(TTSHelper):
+    def __init__(self):
+        self.lang = {}
+        self._stop_preview = False
+        self._preview_play_obj = None
+        self._preview_futures = []
+        self.retries = 1
+        self.retry_delay = 0.0
+        self.started = threading.Event()
+        self.cancelled = threading.Event()
+
+    def _chunk_text(self, text):
+        return [f"chunk {i}" for i in range(4)]
+
+    def _with_retry_chunk(self, chunk):
+        raise AssertionError("preview must use the async chunk path")
+
+    async def _synthesize_chunk_cached_async(self, chunk):
+        self.started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return b""
+
+    async def synthesize_stream(self, text, progress_cb=None):
+        yield b""
+
+
+def test_cancelled_chunk_is_a_clean_stop():
+    future = Future()
+    future.cancel()
+    assert SlowHelper()._wait_for_chunk(future) is None
+
+
+def test_stop_preview_cancels_in_flight_requests():
+    pytest.importorskip("simpleaudio")
+    if not shutil.which("ffmpeg"):
+        pytest.skip("ffmpeg is required to export the preview")
+
+    helper = SlowHelper()
+    result = {}
+
+    def run():
+        try:
+            result["data"] = helper.do_streaming_preview("text", play_audio=False)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert helper.started.wait(2)
+
+    started = time.monotonic()
+    helper.stop_preview()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 1.0
+    assert "error" not in result
+    assert helper.cancelled.wait(1)
+    assert helper._preview_futures == []
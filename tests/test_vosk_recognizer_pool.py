@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from stt.stt__models.VoskRecognizerPool import VoskRecognizerPool
+
+
+class FakeRecognizer:
+    def __init__(self, fail_reset=False):
+        self.resets = 0
+        self.fail_reset = fail_reset
+
+    def Reset(self):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.resets += 1
+
+
+def test_never_creates_more_than_max_size():
+    created = []
+    pool = VoskRecognizerPool(lambda: created.append(FakeRecognizer()) or created[-1], max_size=3)
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def work():
+        with pool.recognizer():
+            with lock:
+                active.append(1)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = pool.stats()
+    assert len(created) == 3 and peak[0] == 3
+    assert stats["created"] == 3 and stats["idle"] == 3 and stats["in_use"] == 0
+    assert stats["checkouts"] == 12 and stats["waits"] > 0
+
+
+def test_recognizer_is_reset_after_error():
+    pool = VoskRecognizerPool(FakeRecognizer, max_size=1)
+    with pytest.raises(ValueError):
+        with pool.recognizer() as recognizer:
+            raise ValueError("decode failed")
+    assert recognizer.resets == 1
+    assert pool.acquire() is recognizer
+
+
+def test_broken_recognizer_is_replaced():
+    pool = VoskRecognizerPool(lambda: FakeRecognizer(fail_reset=True), max_size=1)
+    with pytest.raises(ValueError):
+        with pool.recognizer() as broken:
+            raise ValueError("decode failed")
+    assert pool.stats()["created"] == 0
+    assert pool.acquire() is not broken
+
+
+def test_acquire_times_out_when_exhausted():
+    pool = VoskRecognizerPool(FakeRecognizer, max_size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+
+def test_factory_error_frees_the_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("model missing")
+        return FakeRecognizer()
+
+    pool = VoskRecognizerPool(factory, max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert isinstance(pool.acquire(timeout=0.05), FakeRecognizer)
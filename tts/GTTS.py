@@ -1,42 +1,40 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from gtts import gTTS
 from io import BytesIO
-from data_manager.DataManager import DataManager
-import time
+from data_manager.MemoryManager import MemoryManager
 
 from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
 from tts.utility.TTSHelper import TTSHelper
+from tts.utility.TextChunker import TextChunker
 
 
 class GTTSService(TTSHelper):
-    def __init__(self, gtts_lang: str, ui_lang, max_chunk_chars=300, retries=1, retry_delay=0.6):
+    MAX_WORKERS_CAP = 8
+    cache_service = "google"
+
+    def __init__(self, gtts_lang: str, ui_lang, max_chunk_chars=300, retries=3, retry_delay=0.6, max_workers=4):
         super().__init__(lang=ui_lang, retries=retries, retry_delay=retry_delay)
         self.gtts_lang_code = gtts_lang
 
         self.max_chunk_chars = max_chunk_chars
+        self.chunker = TextChunker(max_chunk_chars)
+        self.max_workers = max(1, min(int(max_workers), self.MAX_WORKERS_CAP))
         self.logger = LogsManager.get_logger("GTTSService")
 
 
     def _chunk_text(self, text: str):
-        if len(text) <= self.max_chunk_chars:
-            return [text]
-        words, buf, count, parts = text.split(), [], 0, []
-        for w in words:
-            if count + len(w) + 1 > self.max_chunk_chars:
-                parts.append(" ".join(buf))
-                buf, count = [w], len(w) + 1
-            else:
-                buf.append(w)
-                count += len(w) + 1
-        if buf:
-            parts.append(" ".join(buf))
+        parts = self.chunker.chunks(text)
         LogsHelperManager.log_debug(self.logger, "CHUNK_SPLIT", {
             "chunks": len(parts),
             "max_chunk_chars": self.max_chunk_chars
         })
         return parts
 
+    def _cache_voice(self) -> str:
+        return self.gtts_lang_code
+
     def _synthesize_chunk(self, chunk: str) -> bytes:
         LogsHelperManager.log_debug(self.logger, "CHUNK_SYNTH", {
             "chars": len(chunk),
@@ -48,36 +46,24 @@ class GTTSService(TTSHelper):
         buf.seek(0)
         return buf.read()
 
-    def synthesize_to_bytes(self, text: str, progress_cb=None) -> bytes:
-        chunks = self._chunk_text(text)
-        total = len(chunks)
-        raw_all = BytesIO()
-        start = time.time()
-
-        for i, chunk in enumerate(chunks, 1):
+    def _with_retry_chunk(self, chunk: str) -> bytes:
+        return self._with_retry(self._synthesize_chunk, chunk)
 
-            raw_all.write(self._with_retry(self._synthesize_chunk, chunk))
+    async def synthesize_stream(self, text: str, progress_cb=None):
+        chunks = self._chunk_text(text)
+        if not chunks:
+            raise ValueError("No text to synthesize.")
 
-            if progress_cb:
-                frac = i / total
-                pct = int(frac * 60)
-                elapsed = time.time() - start
-                eta = elapsed * (1 - frac) / frac if frac > 0 else 0
-                LogsHelperManager.log_debug(self.logger, "SYNTH_PROGRESS", {
-                    "chunk": i,
-                    "total": total,
-                    "pct": pct,
-                    "eta": eta
-                })
-                progress_cb(pct, f"TTS {int(frac * 100)}%  ~{int(eta)}s left")
+        async def synthesize_async(chunk: str) -> bytes:
+            return await asyncio.to_thread(self._synthesize_chunk_cached, chunk)
 
-        raw_all.seek(0)
-        mem_buf = DataManager.write_to_memory(raw_all.read())
-        LogsHelperManager.log_debug(self.logger, "SYNTH_DONE", {
-            "total_chunks": total,
-            "duration": time.time() - start
-        })
-        return DataManager.read_from_memory(mem_buf)
+        async for audio_bytes in self._stream_ordered(chunks, synthesize_async, self.max_workers, progress_cb):
+            yield audio_bytes
 
-    def synthesize_preview(self, text: str, seconds=20, play_audio=True, progress_cb=None, voice_settings: dict = None) -> bytes:
+    def synthesize_preview(self, text: str, seconds=20, play_audio=True, progress_cb=None, voice_settings: dict = None,
+                           stream: bool = None) -> bytes:
+        if stream is None:
+            stream = MemoryManager.get("preview_streaming", True)
+        if stream:
+            return self.do_streaming_preview(text, seconds, play_audio, progress_cb, voice_settings)
         return self.do_preview(self.synthesize_to_bytes, text, seconds, play_audio, progress_cb, voice_settings)
@@ -1,48 +1,46 @@
 # -*- coding: utf-8 -*-
-import asyncio, time
+import time
 from io import BytesIO
-import edge_tts
 from data_manager.DataManager import DataManager
+from data_manager.MemoryManager import MemoryManager
 from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
+from tts.utility.EdgeSessionPool import EdgeSessionPool
+from tts.utility.TTSEventLoop import TTSEventLoop
 from tts.utility.TTSHelper import TTSHelper
+from tts.utility.TextChunker import TextChunker
 
 
 class MicrosoftEdgeTTS(TTSHelper):
-    def __init__(self, voice: str, ui_lang, retries=1, retry_delay=0.6, max_chunk_chars=300):
+    cache_service = "edge"
+
+    def __init__(self, voice: str, ui_lang, retries=3, retry_delay=0.6, max_chunk_chars=300, max_concurrency=4):
         super().__init__(lang=ui_lang, retries=retries, retry_delay=retry_delay)
         self.voice = voice
         self.max_chunk_chars = max_chunk_chars
+        self.chunker = TextChunker(max_chunk_chars)
+        self.max_concurrency = max(1, int(max_concurrency))
         self.logger = LogsManager.get_logger("MicrosoftEdgeTTSService")
 
     def _chunk_text(self, text: str):
-        if len(text) <= self.max_chunk_chars:
-            return [text]
-        words, buf, count, parts = text.split(), [], 0, []
-        for w in words:
-            if count + len(w) + 1 > self.max_chunk_chars:
-                parts.append(" ".join(buf))
-                buf, count = [w], len(w) + 1
-            else:
-                buf.append(w)
-                count += len(w) + 1
-        if buf:
-            parts.append(" ".join(buf))
-
+        parts = self.chunker.chunks(text)
         LogsHelperManager.log_debug(self.logger, "CHUNK_SPLIT", {
             "chunks": len(parts),
             "max_chunk_chars": self.max_chunk_chars
         })
         return parts
 
+    def _cache_voice(self) -> str:
+        return self.voice
+
     async def _synthesize_async_once(self, text: str, progress_cb=None) -> bytes:
         raw_buf = BytesIO()
-        communicate = edge_tts.Communicate(text, self.voice)
+        pool = EdgeSessionPool.instance()
         total_chars = len(text)
         processed_chars = 0
         start = time.time()
 
-        async for chunk in communicate.stream():
+        async for chunk in pool.stream(text, self.voice):
             if chunk["type"] == "audio":
                 raw_buf.write(chunk["data"])
             elif chunk["type"] == "WordBoundary":
@@ -68,39 +66,52 @@ class MicrosoftEdgeTTS(TTSHelper):
             "chars": len(chunk),
             "voice": self.voice
         })
-        return asyncio.run(self._synthesize_async_once(chunk, progress_cb))
+        return TTSEventLoop.instance().run(self._synthesize_async_once(chunk, progress_cb))
+
+    async def _with_retry_chunk_async(self, chunk: str) -> bytes:
+        return await self._with_retry_async(self._synthesize_async_once, chunk, None)
+
+    async def _synthesize_chunk_cached_async(self, chunk: str) -> bytes:
+        return await self._cached_synthesis_async(chunk, self._with_retry_chunk_async)
 
-    def synthesize_to_bytes(self, text: str, progress_cb=None) -> bytes:
+    async def synthesize_stream(self, text: str, progress_cb=None):
         chunks = self._chunk_text(text)
-        total = len(chunks)
-        raw_all = BytesIO()
+        if not chunks:
+            raise ValueError("No text to synthesize.")
         start = time.time()
+        pool = EdgeSessionPool.instance()
+        network_chunks = 0
 
-        for i, chunk in enumerate(chunks, 1):
-            audio_bytes = self._with_retry(self._synthesize_chunk, chunk, None)
-            raw_all.write(audio_bytes)
-
-            if progress_cb:
-                frac = i / total
-                pct = int(frac * 60)
-                elapsed = time.time() - start
-                eta = elapsed * (1 - frac) / frac if frac > 0 else 0
-                LogsHelperManager.log_debug(self.logger, "SYNTH_PROGRESS", {
-                    "chunk": i,
-                    "total": total,
-                    "pct": pct,
-                    "eta": eta
-                })
-                progress_cb(pct, f"TTS {int(frac*100)}%  ~{int(eta)}s left")
-
-        LogsHelperManager.log_debug(self.logger, "SYNTH_DONE", {
-            "total_chunks": total,
-            "duration": time.time() - start
+        async def fetch(chunk: str) -> bytes:
+            nonlocal network_chunks
+            network_chunks += 1
+            return await self._with_retry_chunk_async(chunk)
+
+        async def synthesize_async(chunk: str) -> bytes:
+            LogsHelperManager.log_debug(self.logger, "CHUNK_SYNTH", {
+                "chars": len(chunk),
+                "voice": self.voice
+            })
+            return await self._cached_synthesis_async(chunk, fetch)
+
+        async for audio_bytes in self._stream_ordered(chunks, synthesize_async, self.max_concurrency, progress_cb):
+            yield audio_bytes
+
+        # Cache hits are the only chunks that skip a handshake.
+        pool.log_stats("EDGE_SESSION_POOL", time.time() - start, {
+            "chunks": len(chunks),
+            "network_chunks": network_chunks,
+            "cache_hits": len(chunks) - network_chunks,
+            "handshakes_avoided": len(chunks) - network_chunks
         })
 
-        raw_all.seek(0)
-        mem_buf = DataManager.write_to_memory(raw_all.read())
-        return DataManager.read_from_memory(mem_buf)
+    def _with_retry_chunk(self, chunk: str) -> bytes:
+        return self._with_retry(self._synthesize_chunk, chunk)
 
-    def synthesize_preview(self, text: str, seconds=20, play_audio=True, progress_cb=None, voice_settings: dict = None) -> bytes:
+    def synthesize_preview(self, text: str, seconds=20, play_audio=True, progress_cb=None, voice_settings: dict = None,
+                           stream: bool = None) -> bytes:
+        if stream is None:
+            stream = MemoryManager.get("preview_streaming", True)
+        if stream:
+            return self.do_streaming_preview(text, seconds, play_audio, progress_cb, voice_settings)
         return self.do_preview(self.synthesize_to_bytes, text, seconds, play_audio, progress_cb, voice_settings)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Dict, Any, List, Optional
+
+from PathHelper import PathHelper
+from tts.utility.TTSHelper import TTSHelper
+
+
+class TTSFactory:
+    _languages: Dict[str, Any] = {}
+
+    @classmethod
+    def load_languages(cls, languages_path: str = "utils/Languages.json") -> Dict[str, Any]:
+        if not cls._languages:
+            path = PathHelper.resource_path(languages_path)
+            if not path.exists():
+                path = PathHelper.internal_dir() / languages_path
+            if not path.exists():
+                raise FileNotFoundError(f"Languages file not found: {path}")
+            with open(path, "r", encoding="utf-8") as f:
+                cls._languages = json.load(f)
+        return cls._languages
+
+    @classmethod
+    def list_services(cls) -> List[str]:
+        return ["google", "edge"]
+
+    @classmethod
+    def list_languages(cls) -> List[str]:
+        return list(cls.load_languages().keys())
+
+    @classmethod
+    def resolve_voice(cls, service: str, lang_code: str, voice: str = "female") -> str:
+        langs = cls.load_languages()
+        if lang_code not in langs:
+            raise ValueError(f"Unsupported language: {lang_code}")
+
+        service = (service or "").lower()
+        if service == "google":
+            return langs[lang_code]["gtts"]["lang"]
+        if service == "edge":
+            voices = langs[lang_code]["edge"]["voices"]
+            return voices.get(voice, voice)
+        raise ValueError(f"Unknown TTS service: {service}")
+
+    @classmethod
+    def create(cls, service: str, lang_code: str = "en", voice: str = "female",
+               ui_lang: Optional[Any] = None, **kwargs) -> TTSHelper:
+        service = (service or "").lower()
+        resolved = cls.resolve_voice(service, lang_code, voice)
+        ui_lang = ui_lang if ui_lang is not None else lang_code
+
+        if service == "google":
+            from tts.GTTS import GTTSService
+            return GTTSService(gtts_lang=resolved, ui_lang=ui_lang, **kwargs)
+        from tts.MicrosoftEdgeTTS import MicrosoftEdgeTTS
+        return MicrosoftEdgeTTS(voice=resolved, ui_lang=ui_lang, **kwargs)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import random
+import re
+import threading
+import time
+
+from data_manager.MemoryManager import MemoryManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class BackendLimiter:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    DEFAULTS = {
+        "google": {"rate": 4.0, "burst": 8, "max_concurrency": 8},
+        "edge": {"rate": 8.0, "burst": 16, "max_concurrency": 8},
+    }
+    THROTTLE_MARKERS = ("429", "too many", "throttl", "rate limit", "503", "service unavailable")
+    TRANSIENT_MARKERS = ("timed out", "timeout", "connection", "failed to connect", "reset by peer",
+                         "internal server error", "bad gateway", "gateway")
+    TRANSIENT_STATUS = re.compile(r"\b(?:429|5\d\d)\b")
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, name: str, rate: float, burst: int, max_concurrency: int,
+                 min_concurrency: int = 1, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, max_backoff: float = 20.0):
+        self.logger = LogsManager.get_logger("BackendLimiter")
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.max_backoff = float(max_backoff)
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.throttles = 0
+        self.client_errors = 0
+        self.rejected = 0
+
+    @classmethod
+    def for_backend(cls, name: str) -> "BackendLimiter":
+        with cls._instances_lock:
+            if name not in cls._instances:
+                defaults = cls.DEFAULTS.get(name, {"rate": 4.0, "burst": 8, "max_concurrency": 4})
+                cls._instances[name] = cls(
+                    name,
+                    rate=MemoryManager.get(f"{name}_rate_limit", defaults["rate"]),
+                    burst=MemoryManager.get(f"{name}_rate_burst", defaults["burst"]),
+                    max_concurrency=MemoryManager.get(f"{name}_max_concurrency", defaults["max_concurrency"]),
+                )
+            return cls._instances[name]
+
+    @classmethod
+    def is_throttle_error(cls, error: Exception) -> bool:
+        message = str(error).lower()
+        return any(marker in message for marker in cls.THROTTLE_MARKERS)
+
+    @classmethod
+    def is_transient_error(cls, error: Exception) -> bool:
+        # Only failures that say something about the backend's health count
+        # toward AIMD and the breaker; a bad voice or empty text does not.
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        names = [klass.__name__ for klass in type(error).__mro__]
+        if any("Timeout" in name or "Connection" in name for name in names):
+            return True
+        status = getattr(error, "status", None)
+        if isinstance(status, int):
+            return status == 429 or status >= 500
+        message = str(error).lower()
+        return (cls.is_throttle_error(error)
+                or bool(cls.TRANSIENT_STATUS.search(message))
+                or any(marker in message for marker in cls.TRANSIENT_MARKERS))
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": self.name,
+            "state": self.state,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "tokens": round(self._tokens, 2),
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "throttles": self.throttles,
+            "client_errors": self.client_errors,
+            "rejected": self.rejected
+        }
+
+    def _log_state(self, event: str):
+        LogsHelperManager.log_event(self.logger, event, self.snapshot())
+
+    def _refill_locked(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _try_acquire(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == self.OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"{self.name} backend is unavailable; retrying in "
+                        f"{self.reset_timeout - (now - self._opened_at):.1f}s"
+                    )
+                self.state = self.HALF_OPEN
+                self._log_state("BACKEND_CIRCUIT_HALF_OPEN")
+
+            if self.state == self.HALF_OPEN and (self._probe_in_flight or self.in_flight > 0):
+                return 0.05
+            if self.in_flight >= int(self.limit):
+                return 0.05
+
+            self._refill_locked(now)
+            if self._tokens < 1.0:
+                return (1.0 - self._tokens) / self.rate
+
+            self._tokens -= 1.0
+            self.in_flight += 1
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = True
+            return 0.0
+
+    def acquire(self):
+        while True:
+            wait = self._try_acquire()
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while True:
+            wait = self._try_acquire()
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, success: bool, throttled: bool = False, transient: bool = True):
+        event = None
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+
+            if not success and not transient and not throttled:
+                # The request was rejected for its own content; leave the
+                # limit and the breaker as they are.
+                self.client_errors += 1
+            elif success:
+                self.successes += 1
+                self.consecutive_failures = 0
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / max(self.limit, 1.0))
+                if self.state == self.HALF_OPEN and was_probe:
+                    self.state = self.CLOSED
+                    event = "BACKEND_CIRCUIT_CLOSED"
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+                if throttled:
+                    self.throttles += 1
+                old_limit = self.limit
+                self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+                if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                    self.state = self.OPEN
+                    self._opened_at = time.monotonic()
+                    event = "BACKEND_CIRCUIT_OPEN"
+                elif int(old_limit) != int(self.limit):
+                    event = "BACKEND_LIMIT_DECREASED"
+
+        if event:
+            self._log_state(event)
+
+    def abandon(self):
+        # The request was cancelled before it finished: free its slot (and a
+        # half-open probe) without counting it as a success or a failure.
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._probe_in_flight = False
+
+    def backoff_delay(self, attempt: int, base_delay: float) -> float:
+        delay = min(self.max_backoff, base_delay * (2 ** (attempt - 1)))
+        return random.uniform(delay / 2.0, delay)
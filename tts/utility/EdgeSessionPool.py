@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import aiohttp
+import edge_tts
+
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+from tts.utility.TTSEventLoop import TTSEventLoop
+
+
+async def _noop():
+    return None
+
+
+class _SharedConnector(aiohttp.TCPConnector):
+    # edge_tts closes the ClientSession it builds around our connector after
+    # every stream; keep the connector (DNS cache, connection limits) alive
+    # until the pool itself is closed.
+    _release = False
+
+    def close(self, *args, **kwargs):
+        if self._release:
+            return super().close(*args, **kwargs)
+        return _noop()
+
+
+class EdgeSessionPool:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, event_loop: TTSEventLoop, max_connections: int = 8):
+        self.logger = LogsManager.get_logger("EdgeSessionPool")
+        self.event_loop = event_loop
+        self.max_connections = max_connections
+        self._connector = None
+        self.started_at = time.time()
+        self.streams = 0
+        self.connectors_created = 0
+        self.failures = 0
+        event_loop.add_shutdown_hook(self.close)
+
+    @classmethod
+    def instance(cls) -> "EdgeSessionPool":
+        with cls._lock:
+            loop = TTSEventLoop.instance()
+            if cls._instance is None or cls._instance.event_loop is not loop:
+                cls._instance = cls(loop)
+            return cls._instance
+
+    def _get_connector(self) -> aiohttp.BaseConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = _SharedConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=600,
+                keepalive_timeout=60
+            )
+            self.connectors_created += 1
+        return self._connector
+
+    async def stream(self, text: str, voice: str):
+        self.streams += 1
+        communicate = edge_tts.Communicate(text, voice, connector=self._get_connector())
+        try:
+            async for chunk in communicate.stream():
+                yield chunk
+        except Exception:
+            self.failures += 1
+            raise
+
+    def stats(self) -> dict:
+        # Every stream is its own TLS + websocket handshake; the shared
+        # connector only carries the DNS cache and connection limit.
+        return {
+            "network_streams": self.streams,
+            "connectors_created": self.connectors_created,
+            "failures": self.failures,
+            "uptime": round(time.time() - self.started_at, 2)
+        }
+
+    def log_stats(self, action: str, duration: float, extra: dict = None):
+        data = self.stats()
+        if extra:
+            data.update(extra)
+        LogsHelperManager.log_performance(self.logger, action, duration, data)
+
+    async def close(self):
+        self.log_stats("EDGE_SESSION_POOL_CLOSED", time.time() - self.started_at)
+        if self._connector is not None:
+            self._connector._release = True
+            await self._connector.close()
+            self._connector = None
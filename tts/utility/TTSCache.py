@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import threading
+
+from PathHelper import PathHelper
+from data_manager.DiskCache import DiskCache
+from data_manager.MemoryManager import MemoryManager
+from logs_manager.LogsHelperManager import LogsHelperManager
+
+
+class TTSCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    DEFAULT_MAX_MB = 256
+    CACHE_DIR = "cache/tts"
+
+    @classmethod
+    def instance(cls) -> DiskCache:
+        with cls._lock:
+            if cls._instance is None:
+                max_mb = MemoryManager.get("tts_cache_max_mb", cls.DEFAULT_MAX_MB)
+                cls._instance = DiskCache(
+                    PathHelper.base_dir() / cls.CACHE_DIR,
+                    max_bytes=int(max_mb) * 1024 * 1024,
+                    suffix=".mp3"
+                )
+            return cls._instance
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(MemoryManager.get("tts_cache_enabled", True))
+
+    @staticmethod
+    def make_key(service: str, voice: str, text: str) -> str:
+        raw = "\x1f".join([service or "", voice or "", text])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def set_max_mb(cls, max_mb: int):
+        MemoryManager.set("tts_cache_max_mb", int(max_mb))
+        cls.instance().set_max_bytes(int(max_mb) * 1024 * 1024)
+
+    @classmethod
+    def log_stats(cls, logger, action: str, duration: float, extra: dict = None):
+        data = cls.instance().stats()
+        if extra:
+            data.update(extra)
+        LogsHelperManager.log_performance(logger, action, duration, data)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import atexit
+import threading
+
+from logs_manager.LogsHelperManager import LogsHelperManager
+from logs_manager.LogsManager import LogsManager
+
+
+class TTSEventLoop:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = LogsManager.get_logger("TTSEventLoop")
+        self.loop = asyncio.new_event_loop()
+        self._shutdown_hooks = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tts-event-loop", daemon=True)
+        self._thread.start()
+        LogsHelperManager.log_debug(self.logger, "TTS_LOOP_STARTED", {})
+
+    @classmethod
+    def instance(cls) -> "TTSEventLoop":
+        with cls._lock:
+            if cls._instance is None or cls._instance._closed:
+                cls._instance = cls()
+                atexit.register(cls.shutdown_instance)
+            return cls._instance
+
+    @classmethod
+    def shutdown_instance(cls, timeout: float = 5.0):
+        with cls._lock:
+            instance, cls._instance = cls._instance, None
+        if instance:
+            instance.shutdown(timeout)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        if self._closed:
+            coro.close()
+            raise RuntimeError("TTS event loop is shut down.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float = None):
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("TTSEventLoop.run() cannot block inside the loop thread.")
+        return self.submit(coro).result(timeout)
+
+    def add_shutdown_hook(self, hook):
+        self._shutdown_hooks.append(hook)
+
+    async def _drain(self, timeout: float):
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                LogsHelperManager.log_error(self.logger, "TTS_LOOP_HOOK_FAIL", str(e))
+
+        current = asyncio.current_task()
+        pending = [t for t in asyncio.all_tasks() if t is not current]
+        if pending:
+            _, still_pending = await asyncio.wait(pending, timeout=timeout)
+            for task in still_pending:
+                task.cancel()
+            await asyncio.gather(*still_pending, return_exceptions=True)
+
+    def shutdown(self, timeout: float = 5.0):
+        if self._closed:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(timeout), self.loop).result(timeout * 2)
+        except Exception as e:
+            LogsHelperManager.log_error(self.logger, "TTS_LOOP_DRAIN_FAIL", str(e))
+        finally:
+            self._closed = True
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self.loop.close()
+            LogsHelperManager.log_debug(self.logger, "TTS_LOOP_STOPPED", {})
@@ -1,21 +1,30 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import time
+from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError as FutureCancelledError, TimeoutError as FutureTimeoutError
 from io import BytesIO
 from pydub import AudioSegment
-import simpleaudio as sa
 from PathHelper import PathHelper
+from audio_dsp.PCMBuffer import PCMBuffer
 from VoiceProcessor import VoiceProcessor
 from data_manager.DataManager import DataManager
 from data_manager.MemoryManager import MemoryManager
 from logs_manager.LogsHelperManager import LogsHelperManager
 from logs_manager.LogsManager import LogsManager
+from tts.utility.BackendLimiter import BackendLimiter
+from tts.utility.TTSCache import TTSCache
+from tts.utility.TTSEventLoop import TTSEventLoop
 
 
-class TTSHelper:
-    def __init__(self, lang, retries=1, retry_delay=0.6):
+class TTSHelper(ABC):
+    cache_service = "tts"
+
+    def __init__(self, lang, retries=3, retry_delay=0.6):
         self.lang = lang
         self._stop_preview = False
         self._preview_play_obj = None
+        self._preview_futures = []
         self.retries = retries
         self.retry_delay = retry_delay
 
@@ -25,19 +34,171 @@ class TTSHelper:
             logger = LogsManager.get_logger("TTSHelper")
             LogsHelperManager.log_error(logger, "FFMPEG_INIT_FAILED", str(e))
 
+    def _limiter(self) -> BackendLimiter:
+        return BackendLimiter.for_backend(self.cache_service)
+
     def _with_retry(self, func, *args, **kwargs):
+        limiter = self._limiter()
+        last_err = None
+        for attempt in range(1, self.retries + 1):
+            limiter.acquire()
+            released = False
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                limiter.release(success=False, throttled=BackendLimiter.is_throttle_error(e),
+                                transient=BackendLimiter.is_transient_error(e))
+                released = True
+                last_err = e
+                if attempt < self.retries:
+                    time.sleep(limiter.backoff_delay(attempt, self.retry_delay))
+                else:
+                    raise RuntimeError(f"TTS failed after {self.retries} attempts: {e}")
+            else:
+                limiter.release(success=True)
+                released = True
+                return result
+            finally:
+                if not released:
+                    limiter.abandon()
+        raise last_err
+
+    async def _with_retry_async(self, func, *args, **kwargs):
+        limiter = self._limiter()
         last_err = None
         for attempt in range(1, self.retries + 1):
+            await limiter.acquire_async()
+            released = False
             try:
-                return func(*args, **kwargs)
+                result = await func(*args, **kwargs)
             except Exception as e:
+                limiter.release(success=False, throttled=BackendLimiter.is_throttle_error(e),
+                                transient=BackendLimiter.is_transient_error(e))
+                released = True
                 last_err = e
                 if attempt < self.retries:
-                    time.sleep(self.retry_delay)
+                    await asyncio.sleep(limiter.backoff_delay(attempt, self.retry_delay))
                 else:
                     raise RuntimeError(f"TTS failed after {self.retries} attempts: {e}")
+            else:
+                limiter.release(success=True)
+                released = True
+                return result
+            finally:
+                # CancelledError (BaseException) skips both branches above.
+                if not released:
+                    limiter.abandon()
         raise last_err
 
+    def _cache_voice(self) -> str:
+        return ""
+
+    def voice_key(self) -> str:
+        return f"{self.cache_service}:{self._cache_voice()}"
+
+    def _cache_key(self, chunk: str) -> str:
+        return TTSCache.make_key(self.cache_service, self._cache_voice(), chunk)
+
+    def _cached_synthesis(self, chunk: str, func, *args, **kwargs) -> bytes:
+        if not TTSCache.is_enabled():
+            return func(chunk, *args, **kwargs)
+
+        cache = TTSCache.instance()
+        key = self._cache_key(chunk)
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        data = func(chunk, *args, **kwargs)
+        if data:
+            cache.put(key, data)
+        return data
+
+    async def _cached_synthesis_async(self, chunk: str, func, *args, **kwargs) -> bytes:
+        if not TTSCache.is_enabled():
+            return await func(chunk, *args, **kwargs)
+
+        # DiskCache does blocking file I/O; keep it off the shared event loop.
+        cache = TTSCache.instance()
+        key = self._cache_key(chunk)
+        data = await asyncio.to_thread(cache.get, key)
+        if data is not None:
+            return data
+
+        data = await func(chunk, *args, **kwargs)
+        if data:
+            await asyncio.to_thread(cache.put, key, data)
+        return data
+
+    @abstractmethod
+    def _with_retry_chunk(self, chunk: str) -> bytes:
+        pass
+
+    def _synthesize_chunk_cached(self, chunk: str) -> bytes:
+        return self._cached_synthesis(chunk, self._with_retry_chunk)
+
+    async def _synthesize_chunk_cached_async(self, chunk: str) -> bytes:
+        # Backends with a native async client override this so a cancelled
+        # task also aborts its network request.
+        return await asyncio.to_thread(self._synthesize_chunk_cached, chunk)
+
+    @abstractmethod
+    async def synthesize_stream(self, text: str, progress_cb=None):
+        yield b""
+
+    async def _stream_ordered(self, chunks: list, synthesize_async, concurrency: int, progress_cb=None):
+        total = len(chunks)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        start = time.time()
+        done = 0
+
+        async def run_chunk(index: int, chunk: str) -> bytes:
+            nonlocal done
+            async with semaphore:
+                data = await synthesize_async(chunk)
+
+            done += 1
+            if progress_cb:
+                frac = done / total
+                pct = int(frac * 60)
+                elapsed = time.time() - start
+                eta = elapsed * (1 - frac) / frac if frac > 0 else 0
+                LogsHelperManager.log_debug(self.logger, "SYNTH_PROGRESS", {
+                    "chunk": index + 1,
+                    "done": done,
+                    "total": total,
+                    "pct": pct,
+                    "eta": eta
+                })
+                progress_cb(pct, f"TTS {int(frac * 100)}%  ~{int(eta)}s left")
+            return data
+
+        tasks = [asyncio.ensure_future(run_chunk(i, c)) for i, c in enumerate(chunks)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _collect_stream(self, text: str, progress_cb=None) -> bytes:
+        raw_all = BytesIO()
+        async for audio_bytes in self.synthesize_stream(text, progress_cb):
+            raw_all.write(audio_bytes)
+        return DataManager.read_from_memory(raw_all)
+
+    def synthesize_to_bytes(self, text: str, progress_cb=None) -> bytes:
+        start = time.time()
+        data = TTSEventLoop.instance().run(self._collect_stream(text, progress_cb))
+        LogsHelperManager.log_debug(self.logger, "SYNTH_DONE", {
+            "bytes": len(data),
+            "duration": time.time() - start,
+            "limiter": self._limiter().snapshot()
+        })
+        TTSCache.log_stats(self.logger, "TTS_CACHE", time.time() - start, {"service": self.cache_service})
+        return data
+
     def stop_preview(self):
         self._stop_preview = True
         if getattr(self, "_preview_play_obj", None):
@@ -46,12 +207,17 @@ class TTSHelper:
                     self._preview_play_obj.stop()
             except Exception:
                 pass
+        # Cancelling the loop futures cancels the tasks behind them, which
+        # aborts chunk requests already in flight, not just queued ones.
+        for future in list(self._preview_futures):
+            future.cancel()
 
     def do_preview(self, synthesize_func, text: str,
                    seconds: int = 20,
                    play_audio: bool = True,
                    progress_cb=None,
                    voice_settings: dict = None) -> bytes:
+        import simpleaudio as sa
         paragraphs = text.split("\n\n")
         snippet = paragraphs[0] if paragraphs else text[:300]
 
@@ -93,7 +259,12 @@ class TTSHelper:
                 time.sleep(0.05)
 
         if progress_cb: progress_cb(100, self.lang.get("preview_done"))
+        self._play_ding()
 
+        return out_buf.read()
+
+    def _play_ding(self):
+        import simpleaudio as sa
         ding_path = PathHelper.resource_path("tts/utility/sounds/ding.wav")
         if not ding_path.exists():
             raise FileNotFoundError(f"ding.wav not found at {ding_path}")
@@ -105,4 +276,116 @@ class TTSHelper:
         except Exception as e:
             raise RuntimeError(f"Ding sound failed: {e}")
 
-        return out_buf.read()
\ No newline at end of file
+    def _wait_for_chunk(self, future):
+        while True:
+            if self._stop_preview:
+                return None
+            try:
+                return future.result(timeout=0.05)
+            except FutureTimeoutError:
+                continue
+            except FutureCancelledError:
+                return None
+
+    def _wait_for_playback(self):
+        play_obj = self._preview_play_obj
+        while play_obj is not None and play_obj.is_playing():
+            if self._stop_preview:
+                play_obj.stop()
+                break
+            time.sleep(0.02)
+
+    def do_streaming_preview(self, text: str,
+                             seconds: int = 20,
+                             play_audio: bool = True,
+                             progress_cb=None,
+                             voice_settings: dict = None,
+                             max_workers: int = 2) -> bytes:
+        import simpleaudio as sa
+        paragraphs = text.split("\n\n")
+        snippet = paragraphs[0] if paragraphs else text[:300]
+        chunks = self._chunk_text(snippet)
+        if not chunks:
+            raise ValueError("No text to synthesize.")
+
+        if voice_settings is None:
+            settings = {k: MemoryManager.get(k, v) for k, v in {
+                "pitch": 0, "speed": 1.0, "volume": 1.0,
+                "echo": False, "reverb": False, "robot": False
+            }.items()}
+        else:
+            settings = voice_settings
+        logger = LogsManager.get_logger("TTSHelper")
+        LogsHelperManager.log_debug(logger, "EFFECTS_APPLIED_PREVIEW", settings)
+
+        self._stop_preview = False
+        start = time.time()
+        remaining_ms = seconds * 1000
+        played = PCMBuffer()
+
+        if progress_cb: progress_cb(30, self.lang.get("progress_generating_tts"))
+
+        event_loop = TTSEventLoop.instance()
+        futures = self._preview_futures = []
+
+        def submit_next():
+            if len(futures) < len(chunks) and not self._stop_preview:
+                futures.append(event_loop.submit(self._synthesize_chunk_cached_async(chunks[len(futures)])))
+
+        try:
+            # Keep at most max_workers chunk requests in flight ahead of playback.
+            for _ in range(max(1, max_workers)):
+                submit_next()
+
+            for i in range(len(chunks)):
+                if i >= len(futures):
+                    break
+                raw_bytes = self._wait_for_chunk(futures[i])
+                submit_next()
+                if raw_bytes is None:
+                    break
+
+                audio = DataManager.from_bytes(raw_bytes, "mp3")
+                audio = VoiceProcessor.apply(audio, settings)[:remaining_ms]
+                remaining_ms -= len(audio)
+
+                self._wait_for_playback()
+                if self._stop_preview:
+                    break
+
+                if play_audio:
+                    if i == 0:
+                        LogsHelperManager.log_performance(
+                            logger, "PREVIEW_TIME_TO_FIRST_AUDIO", time.time() - start,
+                            {"chunks": len(chunks)}
+                        )
+                        if progress_cb: progress_cb(90, self.lang.get("preview_playing"))
+                    self._preview_play_obj = sa.play_buffer(
+                        audio.raw_data,
+                        num_channels=audio.channels,
+                        bytes_per_sample=audio.sample_width,
+                        sample_rate=audio.frame_rate
+                    )
+                played.append(audio)
+
+                if remaining_ms <= 0:
+                    break
+
+            self._wait_for_playback()
+        finally:
+            for future in futures:
+                future.cancel()
+            self._preview_futures = []
+
+        out_bytes = played.export("mp3")
+
+        LogsHelperManager.log_performance(logger, "PREVIEW_STREAMED", time.time() - start, {
+            "chunks": len(chunks),
+            "stopped": self._stop_preview
+        })
+
+        if progress_cb: progress_cb(100, self.lang.get("preview_done"))
+        if not self._stop_preview:
+            self._play_ding()
+
+        return out_bytes
\ No newline at end of file
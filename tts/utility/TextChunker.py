@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    id: str
+    index: int
+    paragraph: int
+    text: str
+
+
+class TextChunker:
+    PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+    SENTENCE_END = re.compile(r"(?<=[.!?…。])[\"'”’)\]]*\s+")
+    CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+    ANCHOR_MIN_FILL = 0.7
+
+    def __init__(self, max_chars: int = 300, anchor_every: Optional[int] = 3):
+        self.max_chars = max(1, int(max_chars))
+        self.anchor_every = max(1, int(anchor_every)) if anchor_every else None
+        self.anchor_min_chars = int(self.max_chars * self.ANCHOR_MIN_FILL)
+
+    @staticmethod
+    def chunk_id(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    def iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        index = 0
+        for p_idx, paragraph in enumerate(self._iter_paragraphs(text)):
+            for chunk_text in self._pack(self._iter_sentences(paragraph)):
+                yield TextChunk(self.chunk_id(chunk_text), index, p_idx, chunk_text)
+                index += 1
+
+    def chunks(self, text: str) -> list[str]:
+        return [c.text for c in self.iter_chunks(text)]
+
+    def _iter_paragraphs(self, text: str) -> Iterator[str]:
+        pos = 0
+        for match in self.PARAGRAPH_BREAK.finditer(text):
+            if text[pos:match.start()].strip():
+                yield text[pos:match.start()]
+            pos = match.end()
+        if text[pos:].strip():
+            yield text[pos:]
+
+    def _iter_sentences(self, paragraph: str) -> Iterator[str]:
+        pos = 0
+        for match in self.SENTENCE_END.finditer(paragraph):
+            sentence = " ".join(paragraph[pos:match.end()].split())
+            if sentence:
+                yield sentence
+            pos = match.end()
+        sentence = " ".join(paragraph[pos:].split())
+        if sentence:
+            yield sentence
+
+    def _is_anchor(self, sentence: str) -> bool:
+        # Boundaries depend on a sentence's own content, so they resynchronise
+        # shortly after an edited sentence and the rest of the paragraph keeps
+        # its chunk ids.
+        if self.anchor_every is None:
+            return False
+        digest = hashlib.sha1(sentence.encode("utf-8")).digest()
+        return digest[0] % self.anchor_every == 0
+
+    def _pack(self, sentences: Iterator[str]) -> Iterator[str]:
+        # Anchors only cut chunks that are already mostly full; cutting on
+        # every anchor left many short chunks and one request per sentence.
+        # A chunk that would overflow is cut after its last anchor rather than
+        # where it happens to fill up, so boundaries stay content-defined.
+        buf = []
+        size = 0
+        for sentence in sentences:
+            if len(sentence) > self.max_chars:
+                if buf:
+                    yield " ".join(buf)
+                    buf, size = [], 0
+                yield from self._split_long(sentence)
+                continue
+
+            while buf and size + 1 + len(sentence) > self.max_chars:
+                cut = len(buf)
+                for i in range(len(buf) - 1, 0, -1):
+                    if self._is_anchor(buf[i - 1]):
+                        cut = i
+                        break
+                yield " ".join(buf[:cut])
+                buf = buf[cut:]
+                size = sum(len(s) for s in buf) + len(buf) - 1 if buf else 0
+
+            size = size + 1 + len(sentence) if buf else len(sentence)
+            buf.append(sentence)
+            if size >= self.anchor_min_chars and self._is_anchor(sentence):
+                yield " ".join(buf)
+                buf, size = [], 0
+
+        if buf:
+            yield " ".join(buf)
+
+    def _split_long(self, sentence: str) -> Iterator[str]:
+        buf = ""
+        for clause in self.CLAUSE_END.split(sentence):
+            for word in clause.split():
+                while len(word) > self.max_chars:
+                    if buf:
+                        yield buf
+                        buf = ""
+                    yield word[:self.max_chars]
+                    word = word[self.max_chars:]
+                if not word:
+                    continue
+                if buf and len(buf) + 1 + len(word) > self.max_chars:
+                    yield buf
+                    buf = ""
+                buf = f"{buf} {word}" if buf else word
+
+            if buf and len(buf) >= self.max_chars // 2:
+                yield buf
+                buf = ""
+        if buf:
+            yield buf
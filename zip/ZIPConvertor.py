@@ -10,8 +10,8 @@ from logs_manager.LogsManager import LogsManager
 from zip.ZIPUtility import ZIPUtility
 from zip.ZIPHelper import ZIPHelper
 from data_manager.MemoryManager import MemoryManager
-from tts.GTTS import GTTSService
-from tts.MicrosoftEdgeTTS import MicrosoftEdgeTTS
+from tts.factory.TTSFactory import TTSFactory
+from tts.utility.TextChunker import TextChunker
 from data_manager.DataManager import DataManager
 from VoiceProcessor import VoiceProcessor
 from docx import Document
@@ -28,28 +28,16 @@ class ZIPConvertor:
         self.logger.info("ZIPConvertor initialized at %s", self.base_dir)
 
     def split_text(self, text: str, max_chars: int = 500) -> list[str]:
-        words, segs, cur = text.split(), [], ""
-        for w in words:
-            if len(cur) + len(w) + 1 > max_chars:
-                segs.append(cur.strip()); cur = w
-            else:
-                cur += " " + w
-        if cur:
-            segs.append(cur.strip())
-        return segs
+        return TextChunker(max_chars, anchor_every=None).chunks(text)
 
     def _get_tts_service(self):
-        from GUI import LANGS
         svc = (MemoryManager.get("tts_service", "google") or "").lower()
         lang = MemoryManager.get("tts_lang", "en")
         voice = MemoryManager.get("tts_voice", "female")
 
-        if svc == "google":
-            return GTTSService(gtts_lang=LANGS[lang]["gtts"]["lang"],ui_lang=lang)
-        elif svc == "edge":
-            return MicrosoftEdgeTTS(voice=LANGS[lang]["edge"]["voices"][voice],ui_lang=lang)
-        else:
+        if svc not in TTSFactory.list_services():
             raise RuntimeError(f"Unknown TTS service: {svc}")
+        return TTSFactory.create(svc, lang, voice)
 
     def export(self, text: str, fmt: str, zip_name: str = "tts_package.zip") -> Path:
         start_time = time.time()